@@ -889,6 +889,50 @@ with Conf('global.cylc', desc='''
 
                Moved into the ``[scheduler]`` section from the top level.
         ''')
+        Conf('persistent database connection', VDR.V_BOOLEAN, False,
+             desc='''
+            Keep the connection to the workflow database open for the
+            lifetime of the scheduler.
+
+            By default, the scheduler reconnects to its (private) workflow
+            database every time it writes to it. With this setting enabled,
+            the connection is kept open and the database uses SQLite
+            write-ahead logging, which reduces write latency and allows
+            other processes to read the database whilst it is being written
+            to.
+
+            The scheduler will shut down if the database file is removed.
+
+            .. versionadded:: 8.7.0
+        ''')
+        Conf('delta publish interval', VDR.V_INTERVAL, DurationFloat(0),
+             desc='''
+            Minimum interval between data store updates published to
+            subscribers (e.g. the UI Server and ``cylc tui``).
+
+            By default, changes to the workflow data store are published
+            every time the scheduler updates it. With this setting, changes
+            made within the interval are coalesced into a single update, in
+            which multiple changes to the same element are merged, and
+            elements added and removed within the interval are not sent at
+            all. This reduces the number and size of messages sent during
+            bursts of activity, at the expense of latency.
+
+            .. versionadded:: 8.7.0
+        ''')
+        Conf('columnar job data store', VDR.V_BOOLEAN, False, desc='''
+            Hold job elements of the workflow data store in a compact
+            (columnar) layout.
+
+            By default, each job in the data store (which is used to serve
+            the GUI, Tui, etc) is held as a separate Protobuf object. With
+            this setting enabled, job fields are held in typed arrays and
+            tables of strings instead, which reduces the memory usage of
+            workflows with very large numbers of jobs, at the expense of
+            some CPU when jobs are accessed.
+
+            .. versionadded:: 8.7.0
+        ''')
         Conf('auto restart delay', VDR.V_INTERVAL, desc=f'''
             Maximum number of seconds the auto-restart mechanism will delay
             before restarting workflows.
@@ -1251,6 +1295,40 @@ with Conf('global.cylc', desc='''
 
                     .. versionadded:: 8.0.0
             ''')
+            Conf('event driven', VDR.V_BOOLEAN, False, desc='''
+                Wake the main loop up when there is something to do rather
+                than on a fixed interval.
+
+                By default the scheduler main loop runs once a second
+                (or every half second while subprocesses are pending).
+
+                With this setting enabled, the main loop sleeps until it
+                is woken by an incoming task message, command or external
+                trigger, a subprocess exit or an xtrigger result. This
+                reduces the latency between a task message arriving and
+                the scheduler acting upon it.
+
+                The main loop will still run at least once every
+                :cylc:conf:`global.cylc[scheduler][main loop]idle interval`
+                in order to check timers (e.g. retry delays, clock
+                triggers and workflow timeouts).
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('idle interval', VDR.V_INTERVAL, DurationFloat(1), desc='''
+                The maximum time an event driven main loop will sleep for
+                when there are no events to wake it up.
+
+                Only used if
+                :cylc:conf:`global.cylc[scheduler][main loop]event driven`
+                is enabled.
+
+                Timed events such as retry delays, clock triggers and
+                workflow timeouts will be actioned up to this long after
+                they fall due.
+
+                .. versionadded:: 8.7.0
+            ''')
 
             with Conf('<plugin name>', desc=(
                 default_for(
@@ -1529,6 +1607,32 @@ with Conf('global.cylc', desc='''
                    {REPLACES}``global.rc[hosts][<host>]task communication
                    method``.
             ''')
+            Conf('message batch interval', VDR.V_INTERVAL, desc='''
+                Send task messages to the workflow in batches.
+
+                By default, each ``cylc message`` call in a job makes its own
+                connection to the scheduler. Jobs which send many messages
+                (e.g. custom outputs or progress messages) can result in a
+                large number of connections at scale.
+
+                If set, task messages are spooled to a file in the job log
+                directory instead. Spooled messages are sent to the scheduler
+                together, in the order they were issued, when either:
+
+                * This interval has elapsed since the oldest spooled message.
+                * 100 messages have been spooled.
+                * The job sends a "started" or job exit message.
+
+                A short-lived background process is started with each batch
+                to send it once the interval has elapsed, if it has not been
+                sent already. Messages are still written to the job status
+                file, so they can be recovered by polling.
+
+                This setting has no effect if the
+                :cylc:conf:`[..]communication method` is ``poll``.
+
+                .. versionadded:: 8.7.0
+            ''')
             Conf(
                 'submission polling intervals', VDR.V_INTERVAL_LIST,
                 [DurationFloat(900)], desc=default_for(
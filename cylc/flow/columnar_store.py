@@ -0,0 +1,238 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Compact (columnar) storage of data-store elements.
+
+Large numbers of protobuf message objects carry a large memory overhead.
+The ColumnarStore holds the elements of a type in columns instead:
+
+* Scalar fields are held in typed arrays (one item per element).
+* String fields are held as indices into a table of interned strings.
+* The remaining (repeated and message) fields of each element are held as
+  serialised bytes.
+
+Elements are rebuilt as protobuf messages on access.
+"""
+
+from array import array
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Type,
+)
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+
+
+# Array type codes for scalar protobuf field types.
+ARRAY_TYPECODES = {
+    FieldDescriptor.CPPTYPE_BOOL: 'b',
+    FieldDescriptor.CPPTYPE_DOUBLE: 'd',
+    FieldDescriptor.CPPTYPE_ENUM: 'q',
+    FieldDescriptor.CPPTYPE_FLOAT: 'd',
+    FieldDescriptor.CPPTYPE_INT32: 'q',
+    FieldDescriptor.CPPTYPE_INT64: 'q',
+    FieldDescriptor.CPPTYPE_UINT32: 'Q',
+    FieldDescriptor.CPPTYPE_UINT64: 'Q',
+}
+
+
+class StringTable:
+    """Reference counted table of interned strings.
+
+    Examples:
+        >>> table = StringTable()
+        >>> index = table.add('foo')
+        >>> table.add('foo') == index
+        True
+        >>> table.strings[index]
+        'foo'
+        >>> table.remove(index); table.strings[index]
+        'foo'
+        >>> table.remove(index); table.strings[index]
+
+    """
+
+    def __init__(self) -> None:
+        # index 0 is reserved for "no string"
+        self.strings: List[Optional[str]] = [None]
+        self.refs = array('I', [0])
+        self.index: Dict[str, int] = {}
+        self.free: List[int] = []
+
+    def add(self, string: str) -> int:
+        """Add a reference to a string, return its index."""
+        try:
+            index = self.index[string]
+        except KeyError:
+            if self.free:
+                index = self.free.pop()
+                self.strings[index] = string
+            else:
+                index = len(self.strings)
+                self.strings.append(string)
+                self.refs.append(0)
+            self.index[string] = index
+        self.refs[index] += 1
+        return index
+
+    def remove(self, index: int) -> None:
+        """Remove a reference to the string at an index."""
+        if not index:
+            return
+        self.refs[index] -= 1
+        if not self.refs[index]:
+            del self.index[self.strings[index]]  # type: ignore[arg-type]
+            self.strings[index] = None
+            self.free.append(index)
+
+
+class ColumnarStore(MutableMapping):
+    """A mapping of ID to protobuf message, held in columns.
+
+    Elements are rebuilt on access, so changes to an element must be
+    written back to the store (i.e. ``store[id] = element``).
+
+    Args:
+        msg_class: The protobuf message class of the elements.
+
+    Examples:
+        >>> from cylc.flow.data_messages_pb2 import PbJob
+        >>> store = ColumnarStore(PbJob)
+        >>> store['1/a/01'] = PbJob(id='1/a/01', submit_num=1, state='')
+        >>> store['1/a/01'].messages.append('hello')
+        >>> job = store['1/a/01']
+        >>> job.submit_num, job.HasField('state'), list(job.messages)
+        (1, True, [])
+        >>> job.messages.append('hello')
+        >>> store['1/a/01'] = job
+        >>> list(store['1/a/01'].messages)
+        ['hello']
+        >>> del store['1/a/01']
+        >>> len(store), '1/a/01' in store
+        (0, False)
+
+    """
+
+    def __init__(self, msg_class: Type[Message]) -> None:
+        self.msg_class = msg_class
+        self.rows: Dict[str, int] = {}
+        self.free_rows: List[int] = []
+        self.strings = StringTable()
+        self.columns: Dict[str, array] = {}
+        # presence of (non-string) scalar fields
+        self.present: Dict[str, bytearray] = {}
+        self.string_fields: List[str] = []
+        self.scalar_fields: List[str] = []
+        default = msg_class()
+        for field in msg_class.DESCRIPTOR.fields:
+            if not isinstance(
+                getattr(default, field.name), (bool, float, int, str)
+            ):
+                # repeated or message field
+                continue
+            if field.cpp_type == FieldDescriptor.CPPTYPE_STRING:
+                self.string_fields.append(field.name)
+                self.columns[field.name] = array('I')
+            elif field.cpp_type in ARRAY_TYPECODES:
+                self.scalar_fields.append(field.name)
+                self.columns[field.name] = array(
+                    ARRAY_TYPECODES[field.cpp_type]
+                )
+                self.present[field.name] = bytearray()
+        self.column_fields = {*self.string_fields, *self.scalar_fields}
+        # serialised non-column fields
+        self.residuals: List[Optional[bytes]] = []
+
+    def _add_row(self) -> int:
+        if self.free_rows:
+            return self.free_rows.pop()
+        for column in self.columns.values():
+            column.append(0)
+        for present in self.present.values():
+            present.append(0)
+        self.residuals.append(None)
+        return len(self.residuals) - 1
+
+    def _clear_row(self, row: int) -> None:
+        for name in self.string_fields:
+            column = self.columns[name]
+            self.strings.remove(column[row])
+            column[row] = 0
+        for name in self.scalar_fields:
+            self.columns[name][row] = 0
+            self.present[name][row] = 0
+        self.residuals[row] = None
+
+    def __getitem__(self, key: str) -> Message:
+        row = self.rows[key]
+        msg = self.msg_class()
+        residual = self.residuals[row]
+        if residual is not None:
+            msg.ParseFromString(residual)
+        strings = self.strings.strings
+        for name in self.string_fields:
+            index = self.columns[name][row]
+            if index:
+                setattr(msg, name, strings[index])
+        for name in self.scalar_fields:
+            if self.present[name][row]:
+                setattr(msg, name, self.columns[name][row])
+        return msg
+
+    def __setitem__(self, key: str, msg: Message) -> None:
+        row = self.rows.get(key)
+        if row is None:
+            row = self._add_row()
+            self.rows[key] = row
+        else:
+            self._clear_row(row)
+        residual = None
+        for field, value in msg.ListFields():
+            name = field.name
+            if name in self.present:
+                self.columns[name][row] = value
+                self.present[name][row] = 1
+            elif name in self.columns:
+                self.columns[name][row] = self.strings.add(value)
+            elif residual is None:
+                residual = self.msg_class()
+                residual.CopyFrom(msg)
+        if residual is not None:
+            for field, _ in msg.ListFields():
+                if field.name in self.column_fields:
+                    residual.ClearField(field.name)
+            self.residuals[row] = residual.SerializeToString()
+
+    def __delitem__(self, key: str) -> None:
+        row = self.rows.pop(key)
+        self._clear_row(row)
+        self.free_rows.append(row)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def clear(self) -> None:
+        self.__init__(self.msg_class)  # type: ignore[misc]
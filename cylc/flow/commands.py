@@ -829,7 +829,7 @@ def _force_trigger_tasks(
         schd.pool.release_held_tasks({*active_to_resume, *inactive})
 
         # Store removal results before moving on.
-        schd.workflow_db_mgr.process_queued_ops()
+        schd.workflow_db_mgr.flush_queued_ops()
 
     # Satisfy any off-group prerequisites in removed tasks.
     tasks_removed = inactive
@@ -64,11 +64,14 @@ from collections import (
 from contextlib import suppress
 from copy import deepcopy
 import json
+from threading import Lock
 from time import time
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     List,
     Literal,
     Optional,
@@ -81,6 +84,8 @@ from cylc.flow import (
     LOG,
     __version__ as CYLC_VERSION,
 )
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
+from cylc.flow.columnar_store import ColumnarStore
 from cylc.flow.cycling.loader import get_point
 from cylc.flow.data_messages_pb2 import (
     AllDeltas,
@@ -163,6 +168,8 @@ TASKS = 'tasks'
 TASK_PROXIES = 'task_proxies'
 WORKFLOW = 'workflow'
 ALL_DELTAS = 'all'
+# Prefix of the topics of (server-side) filtered deltas
+FILTERED_DELTAS = 'filtered'
 DELTA_ADDED = 'added'
 DELTA_UPDATED = 'updated'
 DELTA_PRUNED = 'pruned'
@@ -201,6 +208,13 @@ DELTAS_MAP = {
 
 DELTA_FIELDS = {DELTA_ADDED, DELTA_UPDATED, DELTA_PRUNED}
 
+# Protobuf wire-format tags of the (length-delimited) AllDeltas fields,
+# used to assemble the all-deltas message from serialised per-type deltas.
+ALL_DELTAS_FIELD_TAGS = {
+    field.name: bytes([field.number << 3 | 2])
+    for field in AllDeltas.DESCRIPTOR.fields
+}
+
 JOB_STATUSES_ALL = [
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUBMIT_FAILED,
@@ -243,6 +257,16 @@ RESET_PROTOBUF_TYPES = {
     WORKFLOW,
 }
 
+# Element attribute used for the delta checksum of each element type
+CHECKSUM_ATTRS = {
+    EDGES: 'id',
+    FAMILIES: 'stamp',
+    FAMILY_PROXIES: 'stamp',
+    JOBS: 'stamp',
+    TASKS: 'stamp',
+    TASK_PROXIES: 'stamp',
+}
+
 # internal runtime to protobuf field name mapping
 RUNTIME_CFG_MAP_TO_FIELD = {
     'completion': 'completion',
@@ -316,6 +340,37 @@ def generate_checksum(in_strings):
     return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
 
 
+def element_checksum(in_string):
+    """Generate cross platform & python checksum of a single string."""
+    return zlib.crc32(in_string.encode())
+
+
+def generate_rolling_checksum(in_strings):
+    """Generate cross platform & python rolling checksum from strings.
+
+    The checksum is the sum of the individual string checksums, so it is
+    independent of order and can be maintained incrementally (see
+    DataStoreMgr.apply_delta_batch) by adding and subtracting the checksums
+    of changed strings.
+
+    Published in the "rolling_checksum" field of deltas, the "checksum"
+    field holds the generate_checksum value understood by all Cylc 8 peers.
+
+    Examples:
+        >>> generate_rolling_checksum(['a', 'b']) == (
+        ...     generate_rolling_checksum(['b', 'a'])
+        ... )
+        True
+        >>> generate_rolling_checksum(['a', 'b']) == (
+        ...     generate_rolling_checksum(['a', 'b', 'c'])
+        ...     - element_checksum('c')
+        ... ) & 0xffffffff
+        True
+
+    """
+    return sum(map(element_checksum, in_strings)) & 0xffffffff
+
+
 def task_mean_elapsed_time(tdef: 'TaskDef') -> float | None:
     """Calculate task mean elapsed time."""
     if tdef.elapsed_times:
@@ -413,6 +468,24 @@ def runtime_from_partial(rtconfig, runtimeold: Optional[PbRuntime] = None):
     return runtime
 
 
+def encode_varint(value):
+    """Encode a non-negative integer as a protobuf varint.
+
+    Examples:
+        >>> encode_varint(1)
+        b'\\x01'
+        >>> encode_varint(300)
+        b'\\xac\\x02'
+
+    """
+    buf = bytearray()
+    while value > 0x7f:
+        buf.append(value & 0x7f | 0x80)
+        value >>= 7
+    buf.append(value)
+    return bytes(buf)
+
+
 def reset_protobuf_object(msg_class, msg_orig):
     """Reset upb-protobuf object to clear memory build-up."""
     # See: https://github.com/protocolbuffers/protobuf/issues/19674
@@ -473,6 +546,9 @@ def apply_delta(key, delta, data):
                             MESSAGE_MAP[key],
                             data_element
                         )
+                    elif isinstance(data[key], ColumnarStore):
+                        # elements are copies, so must be written back
+                        data[key][element.id] = data_element
                 except KeyError as exc:
                     # Ensure data-sync doesn't fail with
                     # network issues, sync reconcile/validate will catch.
@@ -529,6 +605,92 @@ def apply_delta(key, delta, data):
             del data[key][del_id]
 
 
+def merge_updated_element(key, element, updated):
+    """Merge an updated (partial) element into an element of a delta.
+
+    Fields are cleared/overwritten the same way as when the update is
+    applied to a data-store (see apply_delta).
+    """
+    field_set = {f.name for f, _ in updated.ListFields()}
+    states_updated = (
+        key == WORKFLOW
+        and (element.states_updated or updated.states_updated)
+    )
+    for field in CLEAR_FIELD_MAP[key]:
+        if field in field_set or (key == WORKFLOW and updated.states_updated):
+            element.ClearField(field)
+    element.MergeFrom(updated)
+    for field_name, max_len in DEQUE_FIELD_MAP.get(key, {}).items():
+        if field_name in field_set:
+            lst = getattr(element, field_name)
+            while len(lst) > max_len:
+                lst.pop(0)
+    if states_updated:
+        element.states_updated = True
+
+
+def coalesce_delta(coalesced, key, delta):
+    """Merge a delta into those accumulated for a later publish.
+
+    Multiple updates to the same element are merged, and elements both added
+    and pruned cancel out.
+
+    Args:
+        coalesced (dict):
+            Accumulated deltas, {key: {delta type: {id: element}}}.
+        key (str):
+            The data-store element type of the delta.
+        delta:
+            The delta (cylc.flow.data_messages_pb2.DELTAS_MAP[key]).
+
+    """
+    if delta.reloaded or key not in coalesced:
+        # A reload supersedes all preceding deltas.
+        coalesced[key] = {
+            DELTA_ADDED: {},
+            DELTA_UPDATED: {},
+            DELTA_PRUNED: {},
+            'reloaded': delta.reloaded,
+        }
+    entry = coalesced[key]
+    entry['time'] = delta.time
+    added = entry[DELTA_ADDED]
+    updated = entry[DELTA_UPDATED]
+    pruned = entry[DELTA_PRUNED]
+    if key == WORKFLOW:
+        # The workflow delta holds a single element, by the empty ID.
+        elements = []
+        if delta.HasField(DELTA_ADDED):
+            elements.append((DELTA_ADDED, '', delta.added))
+        if delta.HasField(DELTA_UPDATED):
+            elements.append((DELTA_UPDATED, '', delta.updated))
+        if delta.HasField(DELTA_PRUNED):
+            pruned[''] = delta.pruned
+    else:
+        elements = [
+            *((DELTA_ADDED, e.id, e) for e in delta.added),
+            *((DELTA_UPDATED, e.id, e) for e in delta.updated),
+        ]
+    for delta_type, e_id, element in elements:
+        if delta_type == DELTA_ADDED:
+            pruned.pop(e_id, None)
+            updated.pop(e_id, None)
+            added[e_id] = MESSAGE_MAP[key]()
+            added[e_id].CopyFrom(element)
+        elif e_id in added:
+            merge_updated_element(key, added[e_id], element)
+        elif e_id in updated:
+            merge_updated_element(key, updated[e_id], element)
+        elif e_id not in pruned:
+            updated[e_id] = MESSAGE_MAP[key]()
+            updated[e_id].CopyFrom(element)
+    if key != WORKFLOW:
+        for e_id in delta.pruned:
+            updated.pop(e_id, None)
+            if added.pop(e_id, None) is None:
+                pruned[e_id] = None
+
+
 def create_delta_store(delta=None, workflow_id=None):
     """Create a mini data-store out of the all deltas message.
 
@@ -601,7 +763,8 @@ class DataStoreMgr:
         .parents (dict):
             Local store of config.get_parent_lists()
         .publish_deltas (list):
-            Collection of the latest applied deltas for publishing.
+            Collection of the latest applied deltas, serialised for
+            publishing.
         .schd (cylc.flow.scheduler.Scheduler):
             Workflow scheduler object.
         .workflow_id (str):
@@ -615,7 +778,15 @@ class DataStoreMgr:
     ERR_PREFIX_JOBID_MATCH = 'No matching jobs found: '
     ERR_PREFIX_JOB_NOT_ON_SEQUENCE = 'Invalid cycle point for job: '
 
-    def __init__(self, schd, n_edge_distance=1):
+    def __init__(
+        self,
+        schd,
+        n_edge_distance=1,
+        publish_interval=0.0,
+        delta_filters=None,
+        delta_filter_topics=frozenset(),
+        lock=None,
+    ):
         self.schd: Scheduler = schd
         self.id_ = Tokens(
             user=self.schd.owner,
@@ -640,8 +811,16 @@ class DataStoreMgr:
         self.data = {
             self.workflow_id: deepcopy(DATA_TEMPLATE)
         }
+        if glbl_cfg().get(['scheduler', 'columnar job data store']):
+            self.data[self.workflow_id][JOBS] = ColumnarStore(PbJob)
         self.added = deepcopy(DATA_TEMPLATE)
         self.updated = deepcopy(DATA_TEMPLATE)
+        # Held whilst changing the data-store (i.e. applying deltas), and by
+        # server threads whilst reading it, for a consistent view.
+        self.lock = Lock() if lock is None else lock
+        # Rolling checksums of the local data-store by element type,
+        # maintained as deltas are applied (see generate_rolling_checksum).
+        self.rolling_checksums = {key: 0 for key in CHECKSUM_ATTRS}
         self.deltas = {
             EDGES: EDeltas(),
             FAMILIES: FDeltas(),
@@ -654,6 +833,17 @@ class DataStoreMgr:
         # internal delta
         self.delta_queues = {self.workflow_id: {}}
         self.publish_deltas = []
+        # Deltas are coalesced over this interval (if set) before publish.
+        self.publish_interval = publish_interval
+        self.coalesced_deltas = {}
+        self.next_publish_time = 0.0
+        # Filters for deltas published on derived topics, by topic, see
+        # WorkflowRuntimeServer.register_delta_filter.
+        self.delta_filters: Dict[bytes, Callable] = (
+            {} if delta_filters is None else delta_filters
+        )
+        # The filtered delta topics with subscribers.
+        self.delta_filter_topics: FrozenSet[bytes] = delta_filter_topics
 
         # internal n-window
         self.all_task_pool = set()
@@ -664,12 +854,26 @@ class DataStoreMgr:
         # pre-populating new walks (if possible) and node depth calculations.
         self.n_window_node_walks = {}
         self.n_window_completed_walks = set()
+        # Memoised graph children and parents of window nodes, by node ID,
+        # as nodes are revisited by the walks of all nearby active tasks.
+        self.n_window_adjacency: Dict[
+            str, Tuple[List[Tuple[Tokens, 'PointBase']], ...]
+        ] = {}
         self.n_window_depths = {}
         self.update_window_depths = False
         self.db_load_task_proxies: Dict[str, Tuple[TaskProxy, bool]] = {}
         # Family node IDs that have been pruned. Sent with deltas and used for
         # exclusion from state total and other calculations.
         self.family_pruned_ids = set()
+        # The summary of each child task of a family (see
+        # get_family_task_totals), and the totals of these summaries, so that
+        # only the child tasks that have changed need to be re-counted.
+        self.family_task_summaries: Dict[str, Dict[str, Tuple]] = {}
+        self.family_task_totals: Dict[str, Counter] = {}
+        # Child tasks to re-count, by family ID.
+        self.family_changed_tasks: Dict[str, Set[str]] = {}
+        # Task IDs whose window or pool membership has changed.
+        self.membership_changed_tasks: Set[str] = set()
         # Boundary nodes are those nodes at the boundary of the window, and
         # these are used to trigger pruning for associated nodes.
         # self.prune_trigger_nodes collects walk node IDs associated with a
@@ -697,7 +901,17 @@ class DataStoreMgr:
         """
         # Reset attributes/data-store on reload:
         if reloaded:
-            self.__init__(self.schd, self.n_edge_distance)
+            # (keep registered delta filters, subscribers remain, and the
+            # lock, server threads may be waiting on it)
+            with self.lock:
+                self.__init__(
+                    self.schd,
+                    self.n_edge_distance,
+                    self.publish_interval,
+                    delta_filters=self.delta_filters,
+                    delta_filter_topics=self.delta_filter_topics,
+                    lock=self.lock,
+                )
 
         # Static elements
         self.generate_definition_elements()
@@ -715,7 +929,7 @@ class DataStoreMgr:
         # Gather the store as batch of deltas for publishing
         self.batch_deltas(True)
         self.apply_delta_checksum()
-        self.publish_deltas = self.get_publish_deltas()
+        self.update_publish_deltas(force=True)
 
         self.updates_pending = False
 
@@ -906,7 +1120,6 @@ class DataStoreMgr:
         active_id = source_tokens.id
         all_walks = self.n_window_node_walks
         taskdefs = self.schd.config.taskdefs
-        final_point = self.schd.config.final_point
 
         # walk keys/tags
         # Children location tag
@@ -1095,47 +1308,27 @@ class DataStoreMgr:
                     # Reference set for workflow relations
                     nc_ids = set()
                     if not c_done:
-                        if itask is not None and n_depth == 1:
-                            graph_children = itask.graph_children
-                        else:
-                            graph_children = generate_graph_children(
-                                tdef,
-                                get_point(node_tokens['cycle'])
+                        children, _ = self.get_graph_adjacency(
+                            node_tokens, tdef
+                        )
+                        for child_tokens, child_point in children:
+                            self.generate_ghost_task(
+                                child_tokens,
+                                child_point,
+                                False,
+                                None,
+                                n_depth
                             )
-                        for items in graph_children.values():
-                            for child_name, child_point, _ in items:
-                                if final_point and child_point > final_point:
-                                    continue
-                                child_tokens = self.id_.duplicate(
-                                    cycle=str(child_point),
-                                    task=child_name,
-                                )
-                                self.generate_ghost_task(
-                                    child_tokens,
-                                    child_point,
-                                    False,
-                                    None,
-                                    n_depth
-                                )
-                                self.generate_edge(node_tokens, child_tokens)
-                                nc_ids.add(child_tokens.id)
+                            self.generate_edge(node_tokens, child_tokens)
+                            nc_ids.add(child_tokens.id)
 
                     # Parents/upstream nodes
                     np_ids = set()
                     if not p_done:
-                        for (
-                            parent_name,
-                            parent_point,
-                            _,
-                        ) in generate_graph_parents(
-                            tdef, get_point(node_tokens['cycle']), taskdefs
-                        ):
-                            if final_point and parent_point > final_point:
-                                continue
-                            parent_tokens = self.id_.duplicate(
-                                cycle=str(parent_point),
-                                task=parent_name,
-                            )
+                        _, parents = self.get_graph_adjacency(
+                            node_tokens, tdef
+                        )
+                        for parent_tokens, parent_point in parents:
                             self.generate_ghost_task(
                                 parent_tokens,
                                 parent_point,
@@ -1192,18 +1385,10 @@ class DataStoreMgr:
         for outer_id in outer_nodes:
             outer_tokens = Tokens(outer_id)
             tdef = taskdefs[outer_tokens['task']]
-            graph_children = generate_graph_children(
-                tdef,
-                get_point(outer_tokens['cycle'])
-            )
-            for items in graph_children.values():
-                for child_name, child_point, _ in items:
-                    child_tokens = self.id_.duplicate(
-                        cycle=str(child_point),
-                        task=child_name,
-                    )
-                    if child_tokens.id in outer_nodes:
-                        self.generate_edge(outer_tokens, child_tokens)
+            children, _ = self.get_graph_adjacency(outer_tokens, tdef)
+            for child_tokens, _ in children:
+                if child_tokens.id in outer_nodes:
+                    self.generate_edge(outer_tokens, child_tokens)
 
         # This part is vital to constructing a set of boundary nodes
         # associated with the n=0 window of current active node.
@@ -1247,6 +1432,57 @@ class DataStoreMgr:
                 self.prune_trigger_nodes[active_id])
             del self.prune_trigger_nodes[active_id]
 
+    def get_graph_adjacency(
+        self,
+        node_tokens: Tokens,
+        tdef: 'TaskDef',
+    ) -> Tuple[List[Tuple[Tokens, 'PointBase']], ...]:
+        """Return the graph children and parents of a window node.
+
+        Nodes beyond the final cycle point are excluded. The result is
+        memoised until the node is pruned from the window.
+
+        Args:
+            node_tokens: Tokens of the window node.
+            tdef: Task definition of the window node.
+
+        Returns:
+            (children, parents) as lists of (tokens, point) tuples.
+
+        """
+        with suppress(KeyError):
+            return self.n_window_adjacency[node_tokens.id]
+        point = get_point(node_tokens['cycle'])
+        final_point = self.schd.config.final_point
+        children: Dict[str, Tuple[Tokens, 'PointBase']] = {}
+        for items in generate_graph_children(tdef, point).values():
+            for child_name, child_point, _ in items:
+                if final_point and child_point > final_point:
+                    continue
+                child_tokens = self.id_.duplicate(
+                    cycle=str(child_point),
+                    task=child_name,
+                )
+                children.setdefault(
+                    child_tokens.id, (child_tokens, child_point)
+                )
+        parents: Dict[str, Tuple[Tokens, 'PointBase']] = {}
+        for parent_name, parent_point, _ in generate_graph_parents(
+            tdef, point, self.schd.config.taskdefs
+        ):
+            if final_point and parent_point > final_point:
+                continue
+            parent_tokens = self.id_.duplicate(
+                cycle=str(parent_point),
+                task=parent_name,
+            )
+            parents.setdefault(
+                parent_tokens.id, (parent_tokens, parent_point)
+            )
+        adjacency = (list(children.values()), list(parents.values()))
+        self.n_window_adjacency[node_tokens.id] = adjacency
+        return adjacency
+
     def generate_edge(
         self,
         parent_tokens: Tokens,
@@ -1284,6 +1520,7 @@ class DataStoreMgr:
         ).id
         if tp_id in self.all_task_pool:
             self.all_task_pool.remove(tp_id)
+            self.membership_changed_tasks.add(tp_id)
             self.updates_pending = True
         # flagged isolates/end-of-branch nodes for pruning on removal
         if (
@@ -1314,6 +1551,7 @@ class DataStoreMgr:
             task=name,
         ).id
         self.all_task_pool.add(tp_id)
+        self.membership_changed_tasks.add(tp_id)
         self.update_window_depths = True
 
     def generate_ghost_task(
@@ -1897,7 +2135,7 @@ class DataStoreMgr:
         if self.updates_pending:
             self.apply_delta_checksum()
             # Gather this batch of deltas for publish
-            self.publish_deltas = self.get_publish_deltas()
+            self.update_publish_deltas()
 
         self.updates_pending = self.updates_pending_follow_on
 
@@ -1915,17 +2153,17 @@ class DataStoreMgr:
         self.batch_deltas()
         self.apply_delta_batch()
         self.apply_delta_checksum()
-        self.publish_deltas = self.get_publish_deltas()
+        self.update_publish_deltas()
 
     def window_resize_rewalk(self) -> None:
         """Re-create data-store n-window on resize."""
         # Gather pre-resize window nodes
         if not self.all_n_window_nodes:
-            self.all_n_window_nodes = set().union(*(
+            self.set_window_nodes(set().union(*(
                 v
                 for k, v in self.n_window_nodes.items()
                 if k in self.all_task_pool
-            ))
+            )))
 
         # Clear window walks, and walk from scratch.
         self.prune_flagged_nodes.clear()
@@ -1994,6 +2232,19 @@ class DataStoreMgr:
         self.n_window_depths = n_window_depths
         self.update_window_depths = False
 
+    def set_window_nodes(self, node_ids: Set[str]) -> None:
+        """Set the nodes of the n-window, flagging changes in membership."""
+        if bool(node_ids) != bool(self.all_n_window_nodes):
+            # An empty window includes all tasks in family totals.
+            self.family_task_summaries.clear()
+            self.family_task_totals.clear()
+            self.family_changed_tasks.clear()
+        else:
+            self.membership_changed_tasks.update(
+                node_ids.symmetric_difference(self.all_n_window_nodes)
+            )
+        self.all_n_window_nodes = node_ids
+
     def prune_data_store(self):
         """Remove flagged nodes and edges not in the set of active paths."""
 
@@ -2003,11 +2254,11 @@ class DataStoreMgr:
             return
 
         # Keep all nodes in the path of active tasks.
-        self.all_n_window_nodes = set().union(*(
+        self.set_window_nodes(set().union(*(
             v
             for k, v in self.n_window_nodes.items()
             if k in self.all_task_pool
-        ))
+        )))
         # Gather all nodes in the paths of tasks flagged for pruning.
         out_paths_nodes = self.prune_flagged_nodes.union(*(
             v
@@ -2039,6 +2290,7 @@ class DataStoreMgr:
         for tp_id in list(node_ids):
             if tp_id in self.n_window_nodes:
                 del self.n_window_nodes[tp_id]
+            self.n_window_adjacency.pop(tp_id, None)
             if tp_id in tp_data:
                 node = tp_data[tp_id]
             elif tp_id in tp_added:
@@ -2070,6 +2322,10 @@ class DataStoreMgr:
                 node_ids, parent_ids, checked_ids, self.family_pruned_ids)
         if self.family_pruned_ids:
             self.deltas[FAMILY_PROXIES].pruned.extend(self.family_pruned_ids)
+            for fp_id in self.family_pruned_ids:
+                self.family_task_summaries.pop(fp_id, None)
+                self.family_task_totals.pop(fp_id, None)
+                self.family_changed_tasks.pop(fp_id, None)
         if node_ids:
             self.pruned_task_proxies.update(node_ids)
             self.updates_pending = True
@@ -2170,12 +2426,110 @@ class DataStoreMgr:
 
         """
         self.updated_state_families.clear()
+        self._flag_changed_family_tasks()
         while self.state_update_families:
             self._family_ascent_point_update(
                 next(iter(self.state_update_families)))
         if self.updated_state_families:
             self.state_update_follow_on = True
 
+    def _flag_changed_family_tasks(self):
+        """Flag changed child tasks for re-counting by their family."""
+        tp_data = self.data[self.workflow_id][TASK_PROXIES]
+        tp_added = self.added[TASK_PROXIES]
+        for tp_id in self.membership_changed_tasks.union(
+            tp_added, self.updated[TASK_PROXIES], self.pruned_task_proxies
+        ):
+            tp_node = tp_added.get(tp_id, tp_data.get(tp_id))
+            if (
+                tp_node is not None
+                and tp_node.first_parent in self.family_task_summaries
+            ):
+                self.family_changed_tasks.setdefault(
+                    tp_node.first_parent, set()
+                ).add(tp_id)
+        self.membership_changed_tasks.clear()
+
+    def _summarise_family_task(self, tp_id: str) -> Optional[Tuple]:
+        """Return the contribution of a task to its family totals.
+
+        Returns:
+            None if the task doesn't count towards family totals, otherwise
+            a tuple of the keys to increment.
+
+        """
+        all_nodes = self.all_n_window_nodes
+        if (
+            (all_nodes and tp_id not in all_nodes)
+            or tp_id in self.pruned_task_proxies
+        ):
+            return None
+        tp_delta = self.updated[TASK_PROXIES].get(tp_id)
+        tp_node = self.added[TASK_PROXIES].get(
+            tp_id, self.data[self.workflow_id][TASK_PROXIES].get(tp_id)
+        )
+        if tp_node is None:
+            return None
+
+        tp_depth = tp_delta
+        if tp_depth is None or not tp_depth.HasField('graph_depth'):
+            tp_depth = tp_node
+        tp_state = self.from_delta_or_node(tp_delta, tp_node, 'state')
+
+        summary: List[Any] = [
+            ('state', tp_state),
+            ('graph_depth', tp_depth.graph_depth),
+        ]
+        # if child task is active add states/held/queued/runahead to totals
+        if tp_id in self.all_task_pool:
+            summary.append(('active', tp_state))
+            summary.extend(
+                label
+                for label in ('is_held', 'is_queued', 'is_runahead')
+                if self.from_delta_or_node(tp_delta, tp_node, label)
+            )
+        summary.extend(
+            label
+            for label in ('is_retry', 'is_wallclock', 'is_xtriggered')
+            if self.from_delta_or_node(tp_delta, tp_node, label)
+        )
+        return tuple(summary)
+
+    def get_family_task_totals(self, fp_id, fam_node, fam_updated_node):
+        """Return the totals of the child task summaries of a family.
+
+        The totals are maintained incrementally, only the child tasks that
+        have been added, updated, pruned or have changed window/pool
+        membership since the last call are re-counted.
+
+        Returns:
+            Counter of summary keys, i.e. ('state', state),
+            ('active', state), ('graph_depth', depth), and the labels of
+            boolean fields ('is_held', 'is_retry', etc).
+
+        """
+        summaries = self.family_task_summaries.get(fp_id)
+        if summaries is None:
+            summaries = self.family_task_summaries[fp_id] = {}
+            totals = self.family_task_totals[fp_id] = Counter()
+            changed_tasks = set(fam_node.child_tasks)
+            if fam_updated_node:
+                changed_tasks.update(fam_updated_node.child_tasks)
+            self.family_changed_tasks.pop(fp_id, None)
+        else:
+            totals = self.family_task_totals[fp_id]
+            changed_tasks = self.family_changed_tasks.pop(fp_id, set())
+        for tp_id in changed_tasks:
+            for key in summaries.pop(tp_id, ()):
+                totals[key] -= 1
+                if not totals[key]:
+                    del totals[key]
+            summary = self._summarise_family_task(tp_id)
+            if summary is not None:
+                summaries[tp_id] = summary
+                totals.update(summary)
+        return totals
+
     @staticmethod
     def from_delta_or_node(tp_delta, tp_node, label):
         """Get an item from task proxy delta if available, falling back to
@@ -2197,7 +2551,6 @@ class DataStoreMgr:
         Family group state, however, is determined from all (n>=0) child
         task and family states.
         """
-        all_nodes = self.all_n_window_nodes
         fp_added = self.added[FAMILY_PROXIES]
         fp_data = self.data[self.workflow_id][FAMILY_PROXIES]
         fp_updated = self.updated[FAMILY_PROXIES]
@@ -2225,10 +2578,6 @@ class DataStoreMgr:
                 continue
             self._family_ascent_point_update(child_fam_id)
         if fp_id in self.state_update_families:
-            tp_data = self.data[self.workflow_id][TASK_PROXIES]
-            tp_updated = self.updated[TASK_PROXIES]
-            tp_added = self.added[TASK_PROXIES]
-
             # Count child family states, set is_held, is_queued, is_runahead
             state_set = set()  # n>=0 child states
             active_counter = Counter({})  # n=0 child state totals
@@ -2258,57 +2607,26 @@ class DataStoreMgr:
                     state_set.add(child_node.state)
                     if child_node.graph_depth < graph_depth:
                         graph_depth = child_node.graph_depth
-            # Gather all child task states.
-            # Use all new and existing child tasks that are not destined
-            # to be pruned.
-            child_tasks = set(fam_node.child_tasks)
-            if fam_updated_node:
-                child_tasks.update(fam_updated_node.child_tasks)
-            child_tasks.difference_update(self.pruned_task_proxies)
-            for tp_id in child_tasks:
-                is_active = False
-                if all_nodes and tp_id not in all_nodes:
+            # Gather all child task states and totals.
+            task_totals = self.get_family_task_totals(
+                fp_id, fam_node, fam_updated_node
+            )
+            for key, count in task_totals.items():
+                if isinstance(key, str):
                     continue
-
-                tp_delta = tp_updated.get(tp_id)
-                tp_node = tp_added.get(tp_id, tp_data.get(tp_id))
-
-                tp_depth = tp_delta
-                if tp_depth is None or not tp_depth.HasField('graph_depth'):
-                    tp_depth = tp_node
-                if tp_depth.graph_depth < graph_depth:
-                    graph_depth = tp_depth.graph_depth
-
-                if tp_id in self.all_task_pool:
-                    is_active = True
-
-                tp_state = self.from_delta_or_node(tp_delta, tp_node, 'state')
-
-                state_set.add(tp_state)
-                # if child task is active add states/held/queued/runahead
-                # to totals
-                if is_active:
-                    active_counter[tp_state] += 1
-
-                    if self.from_delta_or_node(tp_delta, tp_node, 'is_held'):
-                        is_held_total += 1
-
-                    if self.from_delta_or_node(tp_delta, tp_node, 'is_queued'):
-                        is_queued_total += 1
-
-                    if self.from_delta_or_node(
-                        tp_delta, tp_node, 'is_runahead'
-                    ):
-                        is_runahead_total += 1
-
-                if self.from_delta_or_node(tp_delta, tp_node, 'is_retry'):
-                    is_retry = True
-
-                if self.from_delta_or_node(tp_delta, tp_node, 'is_wallclock'):
-                    is_wallclock = True
-
-                if self.from_delta_or_node(tp_delta, tp_node, 'is_xtriggered'):
-                    is_xtriggered = True
+                label, value = key
+                if label == 'state':
+                    state_set.add(value)
+                elif label == 'active':
+                    active_counter[value] += count
+                elif value < graph_depth:
+                    graph_depth = value
+            is_held_total += task_totals['is_held']
+            is_queued_total += task_totals['is_queued']
+            is_runahead_total += task_totals['is_runahead']
+            is_retry |= task_totals['is_retry'] > 0
+            is_wallclock |= task_totals['is_wallclock'] > 0
+            is_xtriggered |= task_totals['is_xtriggered'] > 0
 
             # created delta data element
             fp_delta = PbFamilyProxy(
@@ -3025,28 +3343,66 @@ class DataStoreMgr:
                 getattr(self.deltas[key], delta_type).extend(elements.values())
 
     def apply_delta_batch(self):
-        """Apply delta batch to local data-store."""
+        """Apply delta batch to local data-store.
+
+        The rolling checksum of each element type is updated for the
+        elements changed by the delta only.
+        """
+        with self.lock:
+            self._apply_delta_batch()
+
+    def _apply_delta_batch(self):
         data = self.data[self.workflow_id]
         for key, delta in self.deltas.items():
-            if delta.ListFields():
+            if not delta.ListFields():
+                continue
+            if key not in CHECKSUM_ATTRS:
                 apply_delta(key, delta, data)
+                continue
+            s_att = CHECKSUM_ATTRS[key]
+            elements = data[key]
+            changed_ids = {
+                *(e.id for e in delta.added),
+                *(e.id for e in delta.updated),
+                *delta.pruned,
+            }
+            checksum = self.rolling_checksums[key]
+            for e_id in changed_ids:
+                if e_id in elements:
+                    checksum -= element_checksum(
+                        getattr(elements[e_id], s_att))
+            apply_delta(key, delta, data)
+            for e_id in changed_ids:
+                if e_id in elements:
+                    checksum += element_checksum(
+                        getattr(elements[e_id], s_att))
+            self.rolling_checksums[key] = checksum & 0xffffffff
 
     def apply_delta_checksum(self):
         """Construct checksum on deltas for export."""
-        data = self.data[self.workflow_id]
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
-                if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                self.set_delta_checksums(key, delta)
+
+    def set_delta_checksums(self, key, delta):
+        """Set the checksums of the local data-store on a delta for export.
+
+        The "checksum" (understood by UI Servers of any Cylc 8 version) is
+        generated from the whole data-store, the "rolling_checksum" is
+        maintained as deltas are applied.
+        """
+        if key not in CHECKSUM_ATTRS:
+            return
+        s_att = CHECKSUM_ATTRS[key]
+        delta.checksum = generate_checksum(
+            [
+                getattr(e, s_att)
+                for e in self.data[self.workflow_id][key].values()
+            ]
+        )
+        delta.rolling_checksum = self.rolling_checksums[key]
 
     def clear_delta_batch(self):
         """Clear current deltas."""
@@ -3076,33 +3432,118 @@ class DataStoreMgr:
 
         """
 
-        data = self.data[self.workflow_id]
-
         workflow_msg = PbEntireWorkflow()
-        workflow_msg.workflow.CopyFrom(data[WORKFLOW])
-        workflow_msg.tasks.extend(data[TASKS].values())
-        workflow_msg.task_proxies.extend(data[TASK_PROXIES].values())
-        workflow_msg.jobs.extend(data[JOBS].values())
-        workflow_msg.families.extend(data[FAMILIES].values())
-        workflow_msg.family_proxies.extend(data[FAMILY_PROXIES].values())
-        workflow_msg.edges.extend(data[EDGES].values())
+        with self.lock:
+            data = self.data[self.workflow_id]
+            workflow_msg.workflow.CopyFrom(data[WORKFLOW])
+            workflow_msg.tasks.extend(data[TASKS].values())
+            workflow_msg.task_proxies.extend(data[TASK_PROXIES].values())
+            workflow_msg.jobs.extend(data[JOBS].values())
+            workflow_msg.families.extend(data[FAMILIES].values())
+            workflow_msg.family_proxies.extend(
+                data[FAMILY_PROXIES].values()
+            )
+            workflow_msg.edges.extend(data[EDGES].values())
 
         return workflow_msg
 
-    def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
-        result = []
+    def update_publish_deltas(self, force=False):
+        """Gather the current deltas for publishing.
+
+        If a publish interval is set, the deltas are coalesced with those
+        gathered since the last publish, and only published once the
+        interval has passed.
+
+        Args:
+            force:
+                Publish coalesced deltas regardless of the interval.
+
+        """
+        if not self.publish_interval:
+            self.publish_deltas = self.get_publish_deltas()
+            return
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
-        result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
-        )
+                coalesce_delta(self.coalesced_deltas, key, delta)
+        self.flush_coalesced_deltas(force)
+
+    def flush_coalesced_deltas(self, force=False):
+        """Gather coalesced deltas for publishing, if due.
+
+        Args:
+            force:
+                Publish coalesced deltas regardless of the interval.
+
+        """
+        if not self.coalesced_deltas or (
+            not force and time() < self.next_publish_time
+        ):
+            return
+        deltas = {}
+        for key, entry in self.coalesced_deltas.items():
+            delta = DELTAS_MAP[key]()
+            if key == WORKFLOW:
+                for e_type in (DELTA_ADDED, DELTA_UPDATED):
+                    if '' in entry[e_type]:
+                        getattr(delta, e_type).CopyFrom(entry[e_type][''])
+                if '' in entry[DELTA_PRUNED]:
+                    delta.pruned = entry[DELTA_PRUNED]['']
+            else:
+                delta.added.extend(entry[DELTA_ADDED].values())
+                delta.updated.extend(entry[DELTA_UPDATED].values())
+                delta.pruned.extend(entry[DELTA_PRUNED])
+            if not delta.ListFields():
+                # everything cancelled out
+                continue
+            delta.time = entry['time']
+            if entry['reloaded']:
+                delta.reloaded = True
+            self.set_delta_checksums(key, delta)
+            deltas[key] = delta
+        self.coalesced_deltas = {}
+        self.next_publish_time = time() + self.publish_interval
+        if deltas:
+            self.publish_deltas = self.get_publish_deltas(deltas)
+
+    def get_publish_deltas(self, deltas=None):
+        """Return serialised deltas for publishing.
+
+        Each delta is serialised once. As an encoded protobuf message is the
+        concatenation of its encoded fields, the all-deltas message is
+        assembled from the same buffers rather than copying the deltas into
+        an AllDeltas message.
+
+        Deltas are also filtered for any subscribed filtered delta topics.
+
+        Args:
+            deltas (dict):
+                Deltas by element type, defaults to the current batch.
+
+        Returns:
+            list: [(topic, serialised delta)]
+
+        """
+        if deltas is None:
+            deltas = self.deltas
+        result = []
+        all_deltas = []
+        for key, delta in deltas.items():
+            if delta.ListFields():
+                buf = delta.SerializeToString()
+                result.append((key.encode('utf-8'), buf))
+                all_deltas.extend(
+                    (ALL_DELTAS_FIELD_TAGS[key], encode_varint(len(buf)), buf)
+                )
+        for topic in self.delta_filter_topics:
+            delta_filter = self.delta_filters.get(topic)
+            if delta_filter is None:
+                continue
+            filtered = delta_filter(deltas)
+            if filtered is not None:
+                result.append((topic, filtered.SerializeToString()))
+        result.append((ALL_DELTAS.encode('utf-8'), b''.join(all_deltas)))
         self.publish_pending = True
-        return deepcopy(result)
+        return result
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
@@ -3118,13 +3559,14 @@ class DataStoreMgr:
         """
         if element_type not in DELTAS_MAP:
             return DELTAS_MAP[WORKFLOW]()
-        data = self.data[self.workflow_id]
         pb_msg = DELTAS_MAP[element_type]()
-        pb_msg.time = data[WORKFLOW].last_updated
-        if element_type == WORKFLOW:
-            pb_msg.added.CopyFrom(data[WORKFLOW])
-        else:
-            pb_msg.added.extend(data[element_type].values())
+        with self.lock:
+            data = self.data[self.workflow_id]
+            pb_msg.time = data[WORKFLOW].last_updated
+            if element_type == WORKFLOW:
+                pb_msg.added.CopyFrom(data[WORKFLOW])
+            else:
+                pb_msg.added.extend(data[element_type].values())
         return pb_msg
 
     def definition_id(self, namespace: str) -> str:
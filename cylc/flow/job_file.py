@@ -216,6 +216,12 @@ class JobFileWriter:
 
         handle.write("\n\n    # CYLC TASK ENVIRONMENT:")
         handle.write(f"\n    export CYLC_TASK_COMMS_METHOD={comm_meth}")
+        batch_interval = job_conf['platform'].get('message batch interval')
+        if batch_interval:
+            handle.write(
+                "\n    export CYLC_TASK_MESSAGE_BATCH_INTERVAL="
+                f"{float(batch_interval)}"
+            )
         handle.write('\n    export CYLC_TASK_JOB="%s"' % job_conf['job_d'])
         handle.write(
             '\n    export CYLC_TASK_NAMESPACE_HIERARCHY="%s"' %
@@ -19,7 +19,9 @@ import asyncio
 import json
 from typing import (
     TYPE_CHECKING,
+    List,
     Optional,
+    Sequence,
     Tuple,
     TypedDict,
     Union,
@@ -48,6 +50,13 @@ from cylc.flow.workflow_files import (
 )
 
 
+try:
+    import msgpack
+    MSGPACK_INSTALLED = True
+except ModuleNotFoundError:
+    # optional dependency, messages are encoded as JSON without it
+    MSGPACK_INSTALLED = False
+
 if TYPE_CHECKING:
     from zmq.asyncio import Context
 
@@ -55,6 +64,12 @@ if TYPE_CHECKING:
 API = 5  # cylc API version
 MSG_TIMEOUT = "TIMEOUT"
 
+# Message encodings
+JSON = 'json'
+MSGPACK = 'msgpack'
+# Encodings supported by this installation, in order of preference
+ENCODINGS: List[str] = [MSGPACK, JSON] if MSGPACK_INSTALLED else [JSON]
+
 if TYPE_CHECKING:
     class ResponseDict(TypedDict, total=False):
         """Structure of server response messages.
@@ -106,6 +121,62 @@ def deserialize(message: str) -> 'ResponseDict':
     return json.loads(message)
 
 
+def encode(data: object, encoding: str = JSON) -> bytes:
+    """Convert the structure holding a message to bytes.
+
+    Args:
+        data: The message structure.
+        encoding: The encoding to use (JSON or MSGPACK).
+
+    Examples:
+        >>> encode({'a': 1})
+        b'{"a": 1}'
+
+    """
+    if encoding == MSGPACK:
+        return msgpack.packb(data)
+    return serialize(data).encode()
+
+
+def decode(message: bytes) -> 'Tuple[ResponseDict, str]':
+    """Convert message bytes to a dict, detecting the encoding.
+
+    Messages are dicts, so JSON messages start with "{" whereas msgpack
+    messages cannot. This allows peers which don't support msgpack (e.g.
+    older Cylc versions) to continue to use JSON.
+
+    Returns:
+        (message, encoding)
+
+    Examples:
+        >>> decode(b'{"a": 1}')
+        ({'a': 1}, 'json')
+
+    """
+    if message[:1] == b'{' or not MSGPACK_INSTALLED:
+        return deserialize(message.decode()), JSON
+    return msgpack.unpackb(message), MSGPACK
+
+
+def negotiate_encoding(accept: Sequence[str]) -> str:
+    """Return the preferred encoding supported by both peers.
+
+    Args:
+        accept: The encodings supported by the other peer.
+
+    Examples:
+        >>> negotiate_encoding([])
+        'json'
+        >>> negotiate_encoding(['foo', JSON])
+        'json'
+
+    """
+    for encoding in ENCODINGS:
+        if encoding in accept:
+            return encoding
+    return JSON
+
+
 def get_location(workflow: str) -> Tuple[str, int, int, str]:
     """Extract host and port from a workflow's contact file.
 
@@ -48,10 +48,12 @@ from cylc.flow.exceptions import (
 )
 from cylc.flow.hostuserutil import get_fqdn_by_host
 from cylc.flow.network import (
+    ENCODINGS,
+    JSON,
     ZMQSocketBase,
-    deserialize,
+    decode,
+    encode,
     get_location,
-    serialize,
 )
 from cylc.flow.network.client_factory import CommsMeth
 from cylc.flow.network.server import PB_METHOD_MAP
@@ -235,6 +237,10 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
             the event of a communication timeout.
         header:
             Request "header" data to attach to each request.
+        encoding:
+            The encoding of requests. Requests are encoded as JSON until
+            the server has responded in another encoding (i.e. msgpack),
+            so that older servers can still be contacted.
 
     Usage:
         Call endpoints using ``ZMQClient.__call__``.
@@ -244,6 +250,7 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         * Accepts error in the format: {"error": {"message": MSG}}
         * Returns requests of the format: {"command": CMD,
           "args": {...}}
+        * Lists the encodings it accepts in the request "meta".
 
     Raises:
         WorkflowStopped: if the workflow is not running.
@@ -288,6 +295,7 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         self.start(self.host, self.port, srv_public_key_loc)
         # gather header info post start
         self.header = self.get_header()
+        self.encoding = JSON
 
     def _socket_options(self):
         """Set socket options after socket instantiation before connect.
@@ -330,8 +338,7 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         if req_meta:
             msg['meta'].update(req_meta)
         LOG.debug('zmq:send %s', msg)
-        message = serialize(msg)
-        self.socket.send_string(message)
+        self.socket.send(encode(msg, self.encoding))
 
         # receive response
         if self.poller.poll(timeout):
@@ -350,7 +357,9 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         if command in PB_METHOD_MAP:
             return res
 
-        response: ResponseDict = deserialize(res.decode())
+        response: ResponseDict
+        # use the encoding of the response for subsequent requests
+        response, self.encoding = decode(res)
 
         try:
             return response['data']
@@ -398,7 +407,8 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
                     os.getenv(
                         "CLIENT_COMMS_METH",
                         default=CommsMeth.ZMQ.value
-                    )
+                    ),
+                'accept': ENCODINGS,
             }
         }
 
@@ -19,21 +19,30 @@ GraphQL Middleware defined here also.
 
 """
 
+from functools import lru_cache
 from inspect import isclass
 import logging
 from typing import (
-    Any, Awaitable, Callable, TypeVar, Tuple, Dict, Union, cast
+    Any, Awaitable, Callable, TypeVar, Tuple, Dict, List, Optional, Union,
+    cast
 )
 
 from graphene.utils.str_converters import to_snake_case
 from graphql import (
+    DocumentNode,
     ExecutionContext,
+    ExecutionResult,
+    GraphQLError,
+    GraphQLSchema,
     TypeInfo,
     TypeInfoVisitor,
     Visitor,
     visit,
     get_named_type,
     is_introspection_type,
+    execute,
+    parse,
+    validate,
     value_from_ast_untyped
 )
 from graphql.pyutils import AwaitableOrValue, is_awaitable
@@ -47,10 +56,23 @@ STRIP_ARG = 'strip_null'
 NULL_VALUE = None
 EMPTY_VALUES: Tuple[list, dict] = ([], {})
 STRIP_OPS = {'query', 'subscription'}
+# Number of parsed and validated request documents to cache.
+DOCUMENT_CACHE_SIZE = 256
 
 U = TypeVar("U")
 
 
+class PersistedQueryNotFound(ValueError):
+    """A request was sent by hash, but has not been persisted.
+
+    This is expected (e.g. the first time a client sends a request), the
+    client should resend the request with the request string.
+    """
+
+    def __init__(self):
+        ValueError.__init__(self, 'PersistedQueryNotFound')
+
+
 def grow_tree(tree, path, leaves=None):
     """Additively grows tree with leaves at terminal of new branch.
 
@@ -91,6 +113,52 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse_and_validate(
+    schema: GraphQLSchema, request_string: str
+) -> Tuple[Optional[DocumentNode], List[GraphQLError]]:
+    """Parse and validate a GraphQL request against a schema.
+
+    Results are cached by request string, clients tend to send the same
+    requests repeatedly (with different variables).
+
+    Returns:
+        (document, errors): The document is None if there are errors.
+
+    """
+    try:
+        document = parse(request_string)
+    except GraphQLError as error:
+        return None, [error]
+    errors = validate(schema, document)
+    if errors:
+        return None, errors
+    return document, []
+
+
+async def execute_async(
+    schema: GraphQLSchema, request_string: str, **kwargs
+) -> ExecutionResult:
+    """Execute a GraphQL request using cached documents.
+
+    Equivalent to ``graphene.Schema.execute_async`` except that parsing
+    and validation are cached (see parse_and_validate).
+
+    Args:
+        schema: The GraphQL schema.
+        request_string: The GraphQL request.
+        kwargs: Passed through to ``graphql.execute``.
+
+    """
+    document, errors = parse_and_validate(schema, request_string)
+    if document is None:
+        return ExecutionResult(data=None, errors=errors)
+    result = execute(schema, document, **kwargs)
+    if is_awaitable(result):
+        result = await cast('Awaitable[ExecutionResult]', result)
+    return cast('ExecutionResult', result)
+
+
 async def async_callback(
     callback: Callable[[U], AwaitableOrValue[U]],
     result: AwaitableOrValue[U],
@@ -16,6 +16,7 @@
 """Publisher for workflow runtime API."""
 
 import asyncio
+from inspect import isawaitable
 from typing import Callable, Optional, Set, TYPE_CHECKING, Union
 
 import zmq
@@ -44,14 +45,19 @@ class WorkflowPublisher(ZMQSocketBase):
 
     This class contains the logic for the ZMQ message Publisher.
 
+    An XPUB socket is used so that the publisher knows which topics have
+    subscribers.
+
     Usage:
         * Call publish to send items to subscribers.
+        * Call update_subscriptions to update the subscribed topics.
 
     """
 
     def __init__(self, workflow: str, context: 'Optional[Context]' = None):
-        super().__init__(zmq.PUB, workflow, bind=True, context=context)
+        super().__init__(zmq.XPUB, workflow, bind=True, context=context)
         self.topics: Set[bytes] = set()
+        self.subscriptions: Set[bytes] = set()
 
     def _socket_options(self):
         """Set socket options after socket instantiation and before bind.
@@ -84,16 +90,42 @@ class WorkflowPublisher(ZMQSocketBase):
         """
         if self.socket:
             self.topics.add(topic)
+            # Large frames are handed to zmq without copying
+            # (smaller ones are still copied, see zmq.COPY_THRESHOLD).
             self.socket.send_multipart(
-                [topic, serialize_data(data, serializer)]
+                [topic, serialize_data(data, serializer)], copy=False
             )
         # else we are in the process of shutting down - don't send anything
 
+    async def update_subscriptions(self) -> Set[bytes]:
+        """Update the subscribed topics from received subscription messages.
+
+        The XPUB socket only passes on the first subscription to, and the
+        last unsubscription from, a topic.
+
+        Returns:
+            The subscribed topics.
+
+        """
+        while self.socket:
+            try:
+                msg = self.socket.recv(zmq.NOBLOCK)
+                if isawaitable(msg):
+                    msg = await msg
+            except zmq.Again:
+                break
+            if msg[:1] == b'\x01':
+                self.subscriptions.add(msg[1:])
+            elif msg[:1] == b'\x00':
+                self.subscriptions.discard(msg[1:])
+        return self.subscriptions
+
     async def publish(self, *items: tuple) -> None:
         """Publish topics.
 
         Args:
-            items (iterable): [(topic, data, serializer)]
+            items (iterable): [(topic, data, serializer)], where the
+                serializer may be omitted for pre-serialised data.
 
         """
         try:
@@ -15,10 +15,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Server for workflow runtime API."""
 
+from concurrent.futures import (
+    Executor,
+    Future,
+)
 from queue import Queue
 from typing import (
     TYPE_CHECKING,
+    List,
     Optional,
+    Tuple,
 )
 
 import zmq
@@ -28,9 +34,11 @@ from cylc.flow import (
     __version__ as CYLC_VERSION,
 )
 from cylc.flow.network import (
+    JSON,
     ZMQSocketBase,
-    deserialize,
-    serialize,
+    decode,
+    encode,
+    negotiate_encoding,
 )
 
 
@@ -41,37 +49,51 @@ if TYPE_CHECKING:
 
 
 class WorkflowReplier(ZMQSocketBase):
-    """Initiate the REP part of a ZMQ REQ-REP pattern.
+    """Initiate the ROUTER part of a ZMQ REQ-ROUTER pattern.
 
-    This class contains the logic for the ZMQ message replier. The REQ/REP
-    pattern is serial, in that it cannot REQ or REP twice in a row. After
-    receiving you must send a response.
+    This class contains the logic for the ZMQ message replier. Unlike a REP
+    socket, the ROUTER socket can receive many requests before responding,
+    the address envelope of each request is used to route its response.
 
     Usage:
         * Start the replier.
-        * Call the listener to process incoming REQ and send the REP.
+        * Call the listener to process incoming REQ and send the responses.
 
     Message Processing:
         * Calls the server's receiver to process the command and
             obtain a response.
+        * Requests for read-only endpoints (see
+          cylc.flow.network.server.read_only) are passed to the executor
+          (if provided), so that slow requests do not hold up others.
+          Their responses are sent once complete.
 
     Message interface:
         * Expects requests of the format: {"command": CMD, "args": {...}}
         * Sends responses of the format: {"data": {...}}
         * Sends errors in the format: {"error": {"message": MSG}}
+        * Requests may be encoded as JSON or msgpack (if installed).
+          Responses are encoded as msgpack if the client lists it in the
+          "accept" field of the request "meta", otherwise as JSON.
 
     """
 
+    # Poll interval (seconds) whilst read-only requests are in progress.
+    PENDING_POLL_INTERVAL = 0.01
+
     def __init__(
         self,
         server: 'WorkflowRuntimeServer',
-        context: 'Optional[Context]' = None
+        context: 'Optional[Context]' = None,
+        executor: Optional[Executor] = None,
     ):
         super().__init__(
-            zmq.REP, server.schd.workflow, bind=True, context=context
+            zmq.ROUTER, server.schd.workflow, bind=True, context=context
         )
         self.server = server
+        self.executor = executor
         self.queue: 'Queue[str]' = Queue()
+        # Read-only requests in progress: [(envelope, future, encoding), ...]
+        self.pending: 'List[Tuple[List[bytes], Future, str]]' = []
 
     def _bespoke_stop(self) -> None:
         """Stop the listener and Authenticator.
@@ -82,6 +104,19 @@ class WorkflowReplier(ZMQSocketBase):
         LOG.debug('stopping zmq replier...')
         self.queue.put('STOP')
 
+    def wait(self, timeout: float) -> None:
+        """Wait for incoming requests, or for read-only requests to complete.
+
+        Args:
+            timeout: Maximum time to wait (seconds).
+
+        """
+        if self.pending:
+            timeout = min(timeout, self.PENDING_POLL_INTERVAL)
+        self.socket.poll(  # type: ignore[union-attr]
+            int(timeout * 1000), zmq.POLLIN
+        )
+
     def listener(self) -> None:
         """The server main loop, listen for and serve requests.
 
@@ -101,10 +136,16 @@ class WorkflowReplier(ZMQSocketBase):
                     break
                 raise ValueError('Unknown command "%s"' % command)
 
+            # send the responses of completed read-only requests
+            self._send_completed()
+
             try:
                 # Check for messages
-                msg = self.socket.recv_string(  # type: ignore[union-attr]
-                    zmq.NOBLOCK
+                # (the address envelope is followed by the request)
+                *envelope, msg = (
+                    self.socket.recv_multipart(  # type: ignore[union-attr]
+                        zmq.NOBLOCK
+                    )
                 )
             except zmq.error.Again:
                 # No messages, break to parent loop/caller.
@@ -115,26 +156,70 @@ class WorkflowReplier(ZMQSocketBase):
             # attempt to decode the message, authenticating the user in the
             # process
             res: ResponseDict
-            response: bytes
+            encoding = JSON
             try:
-                message = deserialize(msg)
+                message, _ = decode(msg)
+                encoding = negotiate_encoding(
+                    message.get('meta', {}).get(  # type: ignore[attr-defined]
+                        'accept', []
+                    )
+                )
             except Exception as exc:  # purposefully catch generic exception
                 # failed to decode message, possibly resulting from failed
                 # authentication
                 LOG.exception(exc)
-                LOG.error(f'failed to decode message: "{msg}"')
+                LOG.error(f'failed to decode message: "{msg!r}"')
                 res = {
                     'error': {'message': str(exc)},
                     'cylc_version': CYLC_VERSION,
                 }
-                response = serialize(res).encode()
             else:
+                if (
+                    self.executor is not None
+                    and self.server.is_read_only(message)
+                ):
+                    self.pending.append((
+                        envelope,
+                        self.executor.submit(self.server.receiver, message),
+                        encoding,
+                    ))
+                    continue
                 # success case - serve the request
                 res = self.server.receiver(message)
-                data = res.get('data')
-                # send back the string to bytes response
-                if isinstance(data, bytes):
-                    response = data
-                else:
-                    response = serialize(res).encode()
-            self.socket.send(response)  # type: ignore[union-attr]
+            self._send(envelope, res, encoding)
+
+    def _send_completed(self) -> None:
+        """Send the responses of completed read-only requests."""
+        if not self.pending:
+            return
+        pending = []
+        res: ResponseDict
+        for envelope, future, encoding in self.pending:
+            if future.done():
+                try:
+                    res = future.result()
+                except Exception as exc:
+                    # (the receiver handles endpoint errors)
+                    LOG.exception(exc)
+                    res = {
+                        'error': {'message': str(exc)},
+                        'cylc_version': CYLC_VERSION,
+                    }
+                self._send(envelope, res, encoding)
+            else:
+                pending.append((envelope, future, encoding))
+        self.pending = pending
+
+    def _send(
+        self, envelope: List[bytes], res: 'ResponseDict', encoding: str
+    ) -> None:
+        """Send a response to the client with the given address envelope."""
+        data = res.get('data')
+        # send back the string to bytes response
+        if isinstance(data, bytes):
+            response = data
+        else:
+            response = encode(res, encoding)
+        self.socket.send_multipart(  # type: ignore[union-attr]
+            [*envelope, response]
+        )
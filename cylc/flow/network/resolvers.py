@@ -40,9 +40,11 @@ from graphene.utils.str_converters import to_snake_case
 
 from cylc.flow import LOG
 from cylc.flow.commands import COMMANDS
+from cylc.flow.data_messages_pb2 import AllDeltas
 from cylc.flow.data_store_mgr import (
     EDGES, FAMILY_PROXIES, TASK_PROXIES, WORKFLOW,
-    DELTA_ADDED, create_delta_store
+    DELTA_ADDED, DELTA_PRUNED, DELTA_UPDATED,
+    create_delta_store
 )
 import cylc.flow.flags
 from cylc.flow.id import Tokens
@@ -270,6 +272,128 @@ def node_filter(node, node_type, args, state):
     )
 
 
+def delta_node_tokens(node_id, node_type):
+    """Return the tokens to filter a data-store element ID against.
+
+    Edges are represented by the tokens of their source and target nodes.
+
+    Examples:
+        >>> delta_node_tokens('~u/w//1/foo', TASK_PROXIES)
+        [<id: ~u/w//1/foo>]
+        >>> delta_node_tokens('~u/w//$namespace|FOO', 'families')
+        [<id: //*/FOO>]
+        >>> delta_node_tokens('~u/w//$edge|1/foo|2/bar', EDGES)
+        [<id: //1/foo>, <id: //2/bar>]
+
+    """
+    if node_type in DEF_TYPES:
+        return [Tokens(cycle=None, task=node_id.rsplit('|', 1)[1], job=None)]
+    if node_type == EDGES:
+        # (edge IDs contain relative IDs so can't be tokenised)
+        return [
+            Tokens(relative_id, relative=True)
+            for relative_id in node_id.split('|')[1:]
+        ]
+    return [Tokens(node_id)]
+
+
+def delta_element_filter(node_id, node_type, args) -> bool:
+    """Filter data-store elements of a delta by ID arguments."""
+    if not (args.get('ids') or args.get('exids')):
+        return True
+    if node_type == WORKFLOW:
+        return True
+    if node_type in DEF_TYPES:
+        # namespace IDs are matched by name
+        args = {
+            arg: [
+                Tokens(cycle=None, task=tokens['task'], job=None)
+                for tokens in args.get(arg) or []
+            ]
+            for arg in ('ids', 'exids')
+        }
+    return any(
+        (
+            not args.get('ids')
+            or node_ids_filter(tokens, None, args['ids'])
+        )
+        and (
+            not args.get('exids')
+            or not node_ids_filter(tokens, None, args['exids'])
+        )
+        for tokens in delta_node_tokens(node_id, node_type)
+    )
+
+
+def filter_deltas(deltas, args) -> Optional[AllDeltas]:
+    """Filter a batch of deltas by element type, ID and field.
+
+    Deltas hold partial updates, so unlike node_filter, elements are only
+    filtered by their IDs.
+
+    Args:
+        deltas: Deltas by element type.
+        args: The filter arguments:
+            element_types: Element types to include.
+            ids: Tokens of IDs to include.
+            exids: Tokens of IDs to exclude.
+            fields: Element fields to include (id and stamp are always
+                included), if set.
+
+    Returns:
+        The filtered deltas, or None if none match.
+
+    """
+    result = AllDeltas()
+    fields = args.get('fields')
+    if fields:
+        fields = {'id', 'stamp', *fields}
+
+    def _project(element):
+        if not fields:
+            return element
+        projected = type(element)()
+        projected.CopyFrom(element)
+        for field, _ in element.ListFields():
+            if field.name not in fields:
+                projected.ClearField(field.name)
+        return projected
+
+    for key in args['element_types']:
+        delta = deltas.get(key)
+        if delta is None or not delta.ListFields():
+            continue
+        f_delta = getattr(result, key)
+        if key == WORKFLOW:
+            for delta_type in (DELTA_ADDED, DELTA_UPDATED):
+                if delta.HasField(delta_type):
+                    getattr(f_delta, delta_type).CopyFrom(
+                        _project(getattr(delta, delta_type)))
+            if delta.HasField(DELTA_PRUNED):
+                f_delta.pruned = delta.pruned
+        else:
+            for delta_type in (DELTA_ADDED, DELTA_UPDATED):
+                getattr(f_delta, delta_type).extend(
+                    _project(element)
+                    for element in getattr(delta, delta_type)
+                    if delta_element_filter(element.id, key, args)
+                )
+            f_delta.pruned.extend(
+                node_id
+                for node_id in delta.pruned
+                if delta_element_filter(node_id, key, args)
+            )
+        if not f_delta.ListFields():
+            result.ClearField(key)
+            continue
+        f_delta.time = delta.time
+        if delta.reloaded:
+            f_delta.reloaded = True
+    if not result.ListFields():
+        return None
+    return result
+
+
 def get_flow_data_from_ids(data_store, native_ids):
     """Return workflow data by id."""
     w_ids = []
@@ -755,6 +879,7 @@ class Resolvers(BaseResolvers):
                 cmd,
             )
         )
+        self.schd.wake_up()
         return (True, cmd_uuid)
 
     def broadcast(
@@ -813,6 +938,7 @@ class Resolvers(BaseResolvers):
 
         """
         self.schd.ext_trigger_queue.put((message, id))
+        self.schd.wake_up()
         return (True, 'Event queued')
 
     def put_messages(
@@ -847,6 +973,7 @@ class Resolvers(BaseResolvers):
                     message,
                 )
             )
+        self.schd.wake_up()
         return (True, f'Messages queued: {len(messages)}')
 
     def set_graph_window_extent(
@@ -16,6 +16,10 @@
 """Server for workflow runtime API."""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hashlib import sha256
+import json
 from queue import Queue
 from textwrap import dedent
 from time import sleep
@@ -26,6 +30,7 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -39,15 +44,29 @@ from cylc.flow import (
 )
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.data_messages_pb2 import PbEntireWorkflow
-from cylc.flow.data_store_mgr import DELTAS_MAP
+from cylc.flow.data_store_mgr import (
+    DELTAS_MAP,
+    FILTERED_DELTAS,
+    MESSAGE_MAP,
+)
+from cylc.flow.id import (
+    IDTokens,
+    Tokens,
+)
 from cylc.flow.network.graphql import (
+    DOCUMENT_CACHE_SIZE,
     CylcExecutionContext,
     IgnoreFieldMiddleware,
+    PersistedQueryNotFound,
+    execute_async,
     instantiate_middleware,
 )
 from cylc.flow.network.publisher import WorkflowPublisher
 from cylc.flow.network.replier import WorkflowReplier
-from cylc.flow.network.resolvers import Resolvers
+from cylc.flow.network.resolvers import (
+    Resolvers,
+    filter_deltas,
+)
 from cylc.flow.network.schema import schema
 
 
@@ -69,6 +88,17 @@ def expose(func=None):
     return func
 
 
+def read_only(func=None):
+    """Mark an exposed method as read-only.
+
+    Read-only methods are called from a pool of worker threads, concurrently
+    with other requests. They must not change the state of the scheduler and
+    must hold the data store lock whilst reading the data store.
+    """
+    func.read_only = True
+    return func
+
+
 def filter_none(dictionary):
     """Filter out `None` items from a dictionary:
 
@@ -88,6 +118,45 @@ def filter_none(dictionary):
     }
 
 
+def validate_job_messages(job_messages: object) -> Optional[str]:
+    """Return the reason a put_messages payload is invalid (or None).
+
+    Examples:
+        >>> validate_job_messages([['1/a/01', None, [['INFO', 'x']]]])
+        >>> validate_job_messages([['1/a', None, [['INFO', 'x']]]])
+        'Invalid job ID: 1/a'
+        >>> validate_job_messages([['1/a/01', None, [['INFO', 5]]]])
+        "Invalid message for 1/a/01: ['INFO', 5]"
+
+    """
+    if not isinstance(job_messages, list):
+        return 'job_messages must be a list'
+    for item in job_messages:
+        if not isinstance(item, list) or len(item) != 3:
+            return f'Invalid job messages: {item}'
+        task_job, event_time, messages = item
+        try:
+            if (
+                Tokens(task_job, relative=True).lowest_token
+                != IDTokens.Job.value
+            ):
+                raise ValueError()
+        except (TypeError, ValueError):
+            return f'Invalid job ID: {task_job}'
+        if not isinstance(event_time, (str, type(None))):
+            return f'Invalid event time for {task_job}: {event_time}'
+        if not isinstance(messages, list):
+            return f'Invalid messages for {task_job}: {messages}'
+        for message in messages:
+            if not (
+                isinstance(message, list)
+                and len(message) == 2
+                and all(isinstance(field, str) for field in message)
+            ):
+                return f'Invalid message for {task_job}: {message}'
+    return None
+
+
 class WorkflowRuntimeServer:
     """Workflow runtime service API facade exposed via zmq.
 
@@ -143,6 +212,10 @@ class WorkflowRuntimeServer:
 
     OPERATE_SLEEP_INTERVAL = 0.2
     STOP_SLEEP_INTERVAL = 0.2
+    # Number of worker threads for read-only requests.
+    READ_ONLY_WORKERS = 4
+    # Maximum number of registered delta filters.
+    MAX_DELTA_FILTERS = 100
 
     def __init__(self, schd):
 
@@ -153,6 +226,7 @@ class WorkflowRuntimeServer:
         self.publisher = None
         self.loop = None
         self.thread = None
+        self.executor: Optional[ThreadPoolExecutor] = None
 
         self.schd: 'Scheduler' = schd
         self.resolvers = Resolvers(
@@ -162,6 +236,8 @@ class WorkflowRuntimeServer:
         self.middleware = [
             IgnoreFieldMiddleware,
         ]
+        # Persisted GraphQL requests by hash (see graphql endpoint).
+        self.persisted_queries: Dict[str, str] = {}
 
         self.publish_queue: 'Queue[Iterable[tuple]]' = Queue()
         self.waiting_to_stop = False
@@ -202,7 +278,13 @@ class WorkflowRuntimeServer:
         self.configure_curve()
 
         min_, max_ = glbl_cfg().get(['scheduler', 'run hosts', 'ports'])
-        self.replier = WorkflowReplier(self, context=self.zmq_context)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.READ_ONLY_WORKERS,
+            thread_name_prefix='read-only-request',
+        )
+        self.replier = WorkflowReplier(
+            self, context=self.zmq_context, executor=self.executor
+        )
         self.replier.start(min_, max_)
         self.publisher = WorkflowPublisher(
             self.schd.workflow, context=self.zmq_context
@@ -255,6 +337,9 @@ class WorkflowRuntimeServer:
             self.loop.stop()
         if self.thread and self.thread.is_alive():
             self.thread.join()  # Wait for processes to return
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
 
         self.stopped = True
 
@@ -275,14 +360,33 @@ class WorkflowRuntimeServer:
             # Publish all requested/queued.
             self.loop.run_until_complete(self.publish_queued_items())
 
-            # Yield control to other threads
-            sleep(self.OPERATE_SLEEP_INTERVAL)
+            # Yield control to other threads until there are requests.
+            self.replier.wait(self.OPERATE_SLEEP_INTERVAL)
 
     async def publish_queued_items(self) -> None:
         """Publish all queued items."""
         while self.publish_queue.qsize():
             articles = self.publish_queue.get()
             await self.publisher.publish(*articles)
+        # Only filter deltas for filtered delta topics with subscribers.
+        subscriptions = await self.publisher.update_subscriptions()
+        data_store_mgr = self.schd.data_store_mgr
+        for topic in data_store_mgr.delta_filter_topics - subscriptions:
+            # the last subscriber has gone, drop the filter
+            data_store_mgr.delta_filters.pop(topic, None)
+        data_store_mgr.delta_filter_topics = frozenset(
+            topic
+            for topic in list(data_store_mgr.delta_filters)
+            if topic in subscriptions
+        )
+
+    def is_read_only(self, message) -> bool:
+        """Return True if a request is for a read-only endpoint."""
+        try:
+            method = getattr(self, message['command'])
+        except (AttributeError, KeyError, TypeError):
+            return False
+        return getattr(method, 'read_only', False)
 
     def receiver(self, message) -> 'ResponseDict':
         """Process incoming messages and coordinate response.
@@ -327,6 +431,13 @@ class WorkflowRuntimeServer:
         # generate response
         try:
             data = method(**args)
+        except PersistedQueryNotFound as exc:
+            # part of the persisted query handshake, not a server error
+            LOG.debug(f'{message["command"]}: {exc}')
+            return {
+                'error': {'message': str(exc)},
+                'cylc_version': CYLC_VERSION,
+            }
         except Exception as exc:
             # includes incorrect arguments (TypeError)
             LOG.exception(exc)  # log the error server side
@@ -387,7 +498,8 @@ class WorkflowRuntimeServer:
         self,
         request_string: Optional[str] = None,
         variables: Optional[Dict[str, Any]] = None,
-        meta: Optional[Dict[str, Any]] = None
+        meta: Optional[Dict[str, Any]] = None,
+        query_hash: Optional[str] = None,
     ):
         """Return the data field of the GraphQL schema execution result.
 
@@ -395,22 +507,37 @@ class WorkflowRuntimeServer:
             request_string: GraphQL request passed to Graphene.
             variables: Dict of variables passed to Graphene.
             meta: Dict containing auth user etc.
+            query_hash:
+                SHA256 hex digest of the request string, for persisted
+                requests. If provided with the request string, the request
+                is persisted. If provided without it, the request persisted
+                with this hash is executed, if the request has not been
+                persisted (or has been dropped) this fails with
+                "PersistedQueryNotFound" and the client should resend the
+                request string.
 
         Returns:
             object: Execution result, or a list with errors.
         """
-        executed = self.loop.run_until_complete(
-            schema.execute_async(
-                request_string,
-                variable_values=variables,
-                context_value={
-                    'resolvers': self.resolvers,
-                    'meta': meta or {},
-                },
-                middleware=list(instantiate_middleware(self.middleware)),
-                execution_context_class=CylcExecutionContext,
+        if query_hash is not None:
+            request_string = self._persisted_query(query_hash, request_string)
+        elif request_string is None:
+            raise ValueError('No request string or query hash provided')
+        # resolvers read the data store, which the scheduler may be changing
+        with self.schd.data_store_mgr.lock:
+            executed = self.loop.run_until_complete(
+                execute_async(
+                    schema.graphql_schema,
+                    request_string,
+                    variable_values=variables,
+                    context_value={
+                        'resolvers': self.resolvers,
+                        'meta': meta or {},
+                    },
+                    middleware=list(instantiate_middleware(self.middleware)),
+                    execution_context_class=CylcExecutionContext,
+                )
             )
-        )
         if executed.errors:
             for error in executed.errors:
                 LOG.warning(f"GraphQL: {error}")
@@ -419,8 +546,69 @@ class WorkflowRuntimeServer:
             raise Exception(*(error.message for error in executed.errors))
         return executed.data
 
+    def _persisted_query(
+        self, query_hash: str, request_string: Optional[str]
+    ) -> str:
+        """Persist or look up a GraphQL request by hash."""
+        if request_string is None:
+            try:
+                return self.persisted_queries[query_hash]
+            except KeyError:
+                raise PersistedQueryNotFound() from None
+        if sha256(request_string.encode()).hexdigest() != query_hash:
+            raise ValueError('Provided query hash does not match request')
+        if query_hash not in self.persisted_queries:
+            if len(self.persisted_queries) >= DOCUMENT_CACHE_SIZE:
+                # drop the oldest
+                del self.persisted_queries[next(iter(self.persisted_queries))]
+            self.persisted_queries[query_hash] = request_string
+        return request_string
+
+    @expose
+    def put_messages(
+        self,
+        job_messages: List[list],
+        meta: Optional[Dict[str, Any]] = None,
+        **_kwargs
+    ) -> Tuple[bool, str]:
+        """Put task job messages in queue for processing by the scheduler.
+
+        A lightweight alternative to the GraphQL ``message`` mutation for
+        messages sent by jobs.
+
+        Args:
+            job_messages:
+                List in the format
+                ``[[task_job, event_time, [[severity, message], ...]], ...]``
+                where ``task_job`` is the job ID in the format
+                ``CYCLE/TASK_NAME/SUBMIT_NUM``.
+            meta: Dict containing auth user etc.
+
+        Returns:
+            (outcome, message)
+
+        """
+        # validate the whole batch before queueing any of it
+        reason = validate_job_messages(job_messages)
+        if reason:
+            return (False, reason)
+        user = (meta or {}).get('auth_user', self.schd.owner)
+        total = 0
+        for task_job, event_time, messages in job_messages:
+            if user != self.schd.owner:
+                # Logging task messages as commands is overkill.
+                LOG.info(
+                    f'Command "put_messages" received from {user}.\n'
+                    f'put_messages(task_job={task_job},'
+                    f' event_time={event_time}, messages={messages})'
+                )
+            self.resolvers.put_messages(task_job, event_time, messages)
+            total += len(messages)
+        return (True, f'Messages queued: {total}')
+
     # UIServer Data Commands
     @expose
+    @read_only
     def pb_entire_workflow(self, **_kwargs) -> bytes:
         """Send the entire data-store in a single Protobuf message.
 
@@ -431,6 +619,72 @@ class WorkflowRuntimeServer:
         return pb_msg.SerializeToString()
 
     @expose
+    def register_delta_filter(
+        self,
+        element_types: List[str],
+        ids: Optional[List[str]] = None,
+        exids: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        **_kwargs
+    ) -> str:
+        """Register a filter for deltas published on a derived topic.
+
+        Subscribers to the returned topic receive ``AllDeltas`` messages
+        containing only the requested element types, elements and fields.
+        Deltas are only filtered whilst the topic has subscribers. The
+        filter is dropped when the last subscriber unsubscribes (or, if the
+        number of filters exceeds MAX_DELTA_FILTERS, the oldest filters
+        without subscribers are dropped), after which it must be registered
+        again.
+
+        Args:
+            element_types: Data element types to include e.g. task_proxies.
+            ids: Relative IDs (or ID globs) of elements to include.
+            exids: Relative IDs (or ID globs) of elements to exclude.
+            fields: Element fields to include (id and stamp are always
+                included), defaults to all fields.
+
+        Returns:
+            The topic to subscribe to.
+
+        """
+        for element_type in element_types:
+            if element_type not in MESSAGE_MAP:
+                raise ValueError(f'Invalid element type: {element_type}')
+        spec = {
+            'element_types': sorted(set(element_types)),
+            'ids': sorted(set(ids or [])),
+            'exids': sorted(set(exids or [])),
+            'fields': sorted(set(fields or [])),
+        }
+        digest = sha256(
+            json.dumps(spec, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:16]
+        topic = f'{FILTERED_DELTAS}|{digest}'.encode('utf-8')
+        data_store_mgr = self.schd.data_store_mgr
+        if topic not in data_store_mgr.delta_filters:
+            # make room, dropping the oldest filters without subscribers
+            for old_topic in list(data_store_mgr.delta_filters):
+                if len(data_store_mgr.delta_filters) < self.MAX_DELTA_FILTERS:
+                    break
+                if old_topic not in data_store_mgr.delta_filter_topics:
+                    del data_store_mgr.delta_filters[old_topic]
+            if len(data_store_mgr.delta_filters) >= self.MAX_DELTA_FILTERS:
+                raise ValueError('Too many delta filters registered')
+            args = {
+                **spec,
+                'ids': [Tokens(n_id, relative=True) for n_id in spec['ids']],
+                'exids': [
+                    Tokens(n_id, relative=True) for n_id in spec['exids']
+                ],
+            }
+            data_store_mgr.delta_filters[topic] = partial(
+                filter_deltas, args=args
+            )
+        return topic.decode('utf-8')
+
+    @expose
+    @read_only
     def pb_data_elements(self, element_type: str, **_kwargs) -> bytes:
         """Send the specified data elements in delta form.
 
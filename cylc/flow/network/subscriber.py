@@ -23,7 +23,7 @@ from typing import TYPE_CHECKING, Iterable, Optional, Set, Union
 import zmq
 
 from cylc.flow.network import ZMQSocketBase, get_location
-from cylc.flow.data_store_mgr import DELTAS_MAP
+from cylc.flow.data_store_mgr import ALL_DELTAS, DELTAS_MAP, FILTERED_DELTAS
 
 if TYPE_CHECKING:
     import zmq.asyncio
@@ -35,7 +35,11 @@ def process_delta_msg(btopic, delta_msg, func, *args, **kwargs):
     """Utility for processing serialised data-store deltas."""
     topic = btopic.decode('utf-8')
     try:
-        delta = DELTAS_MAP[topic]()
+        if topic.startswith(f'{FILTERED_DELTAS}|'):
+            # filtered deltas are sent as all-deltas messages
+            delta = DELTAS_MAP[ALL_DELTAS]()
+        else:
+            delta = DELTAS_MAP[topic]()
         delta.ParseFromString(delta_msg)
     except KeyError:
         delta = delta_msg
@@ -25,13 +25,18 @@ import traceback
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     DefaultDict,
     Dict,
     Iterable,
+    Iterator,
     List,
+    NamedTuple,
     Optional,
     Set,
     Tuple,
+    Type,
+    TypeVar,
     Union,
     cast,
 )
@@ -59,6 +64,63 @@ DbUpdateTuple = Union[
 ]
 
 
+class TaskPoolRestartRow(NamedTuple):
+    """Row returned by CylcWorkflowDAO.select_task_pool_for_restart."""
+    cycle: str
+    name: str
+    flow_nums: str
+    flow_wait: Optional[int]
+    is_manual_submit: Optional[int]
+    is_late: Optional[int]
+    status: str
+    is_held: int
+    submit_num: Optional[int]
+    try_num: Optional[int]
+    platform_name: Optional[str]
+    time_submit: Optional[str]
+    time_run: Optional[str]
+    timeout: Optional[float]
+    outputs: Optional[str]
+
+
+class TaskJobRow(NamedTuple):
+    """Row returned by CylcWorkflowDAO.select_jobs_for_* methods."""
+    cycle: str
+    name: str
+    submit_num: int
+    time_submit: Optional[str]
+    submit_status: Optional[int]
+    time_run: Optional[str]
+    time_run_exit: Optional[str]
+    run_status: Optional[int]
+    job_runner_name: Optional[str]
+    job_id: Optional[str]
+    platform_name: Optional[str]
+
+
+class TaskStateRow(NamedTuple):
+    """Row returned by CylcWorkflowDAO.select_tasks_for_datastore."""
+    cycle: str
+    name: str
+    flow_nums: str
+    status: str
+    submit_num: int
+    outputs: Optional[str]
+
+
+class TaskPrereqRow(NamedTuple):
+    """Row returned by CylcWorkflowDAO.select_prereqs_for_datastore."""
+    cycle: str
+    name: str
+    prereq_name: str
+    prereq_cycle: str
+    prereq_output: str
+    satisfied: str
+
+
+RowT = TypeVar('RowT', bound=tuple)
+
+
 @dataclass
 class CylcWorkflowDAOTableColumn:
     """Represent a column in a table."""
@@ -209,6 +271,23 @@ class CylcWorkflowDAO:
     CONN_TIMEOUT = 0.2
     DB_FILE_BASE_NAME = "db"
     MAX_TRIES = 100
+    # Max (name, cycle) pairs per batched select statement (keeps the number
+    # of bound parameters within the SQLite default limit of 999).
+    MAX_TASKS_PER_SELECT = 400
+    # Number of rows to fetch at a time when streaming query results.
+    FETCH_SIZE = 1000
+    # Size of the prepared statement cache of each connection. (The sqlite3
+    # module caches prepared statements by their SQL text, so statements
+    # should bind their arguments rather than format them into the SQL).
+    CACHED_STATEMENTS = 256
+    # Pragmas for persistent connections: write-ahead logging allows other
+    # processes to read the database whilst it is being written to, and
+    # with WAL, "NORMAL" sync is safe against application crashes (only an
+    # OS crash or power loss could lose the most recent commits).
+    PERSISTENT_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+    )
     RESTART_INCOMPAT_VERSION = "8.0rc2"  # Can't restart if <= this version
     TABLE_BROADCAST_EVENTS = "broadcast_events"
     TABLE_BROADCAST_STATES = "broadcast_states"
@@ -367,11 +446,31 @@ class CylcWorkflowDAO:
         ],
     }
 
+    # Secondary indexes (in addition to the primary key of each table) for
+    # the columns, or expressions, which queries filter or join on.
+    # {index_name: (table_name, [column_or_expression, ...])}
+    INDEXES: Dict[str, Tuple[str, List[str]]] = {
+        # workflow-state/xtrigger queries by cycle (and status)
+        "task_states_cycle_status": (TABLE_TASK_STATES, ["cycle", "status"]),
+        # "cycle/name IN (...)" data store queries
+        "task_states_id": (TABLE_TASK_STATES, ["cycle || '/' || name"]),
+        # workflow-state/xtrigger queries by task name
+        "task_outputs_name": (TABLE_TASK_OUTPUTS, ["name"]),
+        # run times of succeeded jobs (restart, report-timings)
+        "task_jobs_run_status": (TABLE_TASK_JOBS, ["run_status", "name"]),
+        # "cycle/name/flow_nums IN (...)" data store queries
+        "task_prerequisites_id": (
+            TABLE_TASK_PREREQUISITES,
+            ["cycle || '/' || name || '/' || flow_nums"],
+        ),
+    }
+
     def __init__(
         self,
         db_file_name: Union['Path', str],
         is_public: bool = False,
-        create_tables: bool = False
+        create_tables: bool = False,
+        persistent: bool = False,
     ):
         """Initialise database access object.
 
@@ -383,12 +482,19 @@ class CylcWorkflowDAO:
             is_public: If True, allow retries.
             create_tables: If True, create the tables if they
                 don't already exist.
+            persistent: If True, keep the connection open between writes
+                (rather than reconnecting for each transaction) and use
+                write-ahead logging (see PERSISTENT_PRAGMAS).
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.persistent = persistent
         self.conn: Optional[sqlite3.Connection] = None
         self.n_tries = 0
+        # Statements executed in the current transaction but not yet
+        # committed (see execute_queued_items).
+        self._uncommitted: List[Tuple[str, list]] = []
 
         self.tables = {
             name: CylcWorkflowDAOTable(name, attrs)
@@ -443,6 +549,11 @@ class CylcWorkflowDAO:
     def close(self) -> None:
         """Explicitly close the connection."""
         if self.conn is not None:
+            if self.persistent:
+                # Leave the database file self-contained (no WAL file) for
+                # anything which copies or archives it.
+                with suppress(sqlite3.Error):
+                    self.conn.execute("PRAGMA journal_mode=DELETE")
             try:
                 self.conn.close()
             except sqlite3.Error as exc:
@@ -453,47 +564,185 @@ class CylcWorkflowDAO:
         """Connect to the database."""
         if self.conn is None:
             self.conn = sqlite3.connect(
-                self.db_file_name, timeout=self.CONN_TIMEOUT
+                self.db_file_name,
+                timeout=self.CONN_TIMEOUT,
+                cached_statements=self.CACHED_STATEMENTS,
             )
+            if self.persistent:
+                for pragma in self.PERSISTENT_PRAGMAS:
+                    self.conn.execute(pragma)
         return self.conn
 
+    def select(
+        self,
+        stmt: str,
+        args: Iterable[Any] = (),
+        row_type: Optional[Type[RowT]] = None,
+    ) -> Iterator[RowT]:
+        """Run a query and return an iterator over the result rows.
+
+        Rows are fetched FETCH_SIZE at a time as the iterator is consumed,
+        rather than all being loaded into memory at once.
+
+        Args:
+            stmt: The SQL statement.
+            args: Arguments to bind to the statement.
+            row_type: NamedTuple class to return the rows as.
+
+        """
+        cursor = self.connect().execute(stmt, tuple(args))
+        return self._fetch(cursor, row_type)
+
+    @classmethod
+    def _fetch(
+        cls, cursor: sqlite3.Cursor, row_type: Optional[Type[RowT]]
+    ) -> Iterator[RowT]:
+        """Stream rows from a cursor (see "select")."""
+        try:
+            while True:
+                rows = cursor.fetchmany(cls.FETCH_SIZE)
+                if not rows:
+                    return
+                if row_type is None:
+                    yield from rows
+                else:
+                    yield from map(row_type._make, rows)  # type: ignore
+        finally:
+            cursor.close()
+
+    def checkpoint(self) -> None:
+        """Transfer the content of the write-ahead log into the database file.
+
+        This is required before the database file can be copied, if the
+        connection is persistent.
+        """
+        if self.persistent and self.conn is not None:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def open_snapshot(self) -> sqlite3.Connection:
+        """Return a new connection with a read transaction open on it.
+
+        The connection will see the database as it is now (regardless of
+        subsequent writes) until the transaction is ended. It may be used
+        in another thread, e.g. to back up the database.
+
+        This requires write-ahead logging (i.e. a persistent connection),
+        otherwise the read transaction would block writes to the database.
+        """
+        conn = sqlite3.connect(
+            self.db_file_name,
+            timeout=self.CONN_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            conn.execute("BEGIN")
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def clear_queued_items(self) -> None:
+        """Discard queued (and uncommitted) items for each table."""
+        for table in self.tables.values():
+            table.delete_queues.clear()
+            table.insert_queue.clear()
+            table.update_queues.clear()
+        self._uncommitted = []
+
     def create_tables(self):
-        """Create tables."""
+        """Create tables (and their indexes)."""
         names = []
         for row in self.connect().execute(
                 "SELECT name FROM sqlite_master WHERE type==? ORDER BY name",
                 ["table"]):
             names.append(row[0])
-        cur = None
+        created = []
         for name, table in self.tables.items():
             if name not in names:
-                cur = self.conn.execute(table.get_create_stmt())
-        if cur is not None:
+                self.conn.execute(table.get_create_stmt())
+                created.append(name)
+        if created:
+            self.create_indexes(created)
             self.conn.commit()
 
-    def execute_queued_items(self):
-        """Execute queued items for each table."""
+    def create_indexes(
+        self, table_names: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Create any missing secondary indexes (see INDEXES).
+
+        Note: does not commit.
+
+        Args:
+            table_names: Only create indexes on these tables (default all).
+
+        Returns:
+            The names of the indexes created.
+
+        """
+        conn = self.connect()
+        existing = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type==?", ["index"]
+            )
+        }
+        if table_names is not None:
+            table_names = set(table_names)
+        created = []
+        for index_name, (table_name, columns) in self.INDEXES.items():
+            if index_name in existing or (
+                table_names is not None and table_name not in table_names
+            ):
+                continue
+            conn.execute(
+                f"CREATE INDEX {index_name}"
+                f" ON {table_name}({', '.join(columns)})"
+            )
+            created.append(index_name)
+        return created
+
+    def execute_queued_items(self, commit: bool = True) -> None:
+        """Execute queued items for each table.
+
+        Args:
+            commit:
+                If False, execute the statements but leave the transaction
+                (and connection) open, so the changes are visible to
+                selects on this connection, but are not committed until the
+                next call with commit=True. If the transaction is lost (i.e.
+                rolled back after an error) its statements will be
+                re-executed on the next call.
+
+        """
         # determine the sql statements to execute
-        sql_queue = []  # (sql_statement, values)
+        queued = []  # (sql_statement, values)
         for table in self.tables.values():
             # DELETE statements may have varying number of WHERE args so we
             # can only executemany for each identical template statement.
             for stmt, stmt_args_list in table.delete_queues.items():
-                sql_queue.append((stmt, stmt_args_list))
+                queued.append((stmt, list(stmt_args_list)))
 
             # INSERT statements are uniform for each table, so all INSERT
             # statements can be executed using a single "executemany" call.
             if table.insert_queue:
-                sql_queue.append((
+                queued.append((
                     table.get_insert_stmt(),
-                    table.insert_queue,
+                    list(table.insert_queue),
                 ))
 
             # UPDATE statements can have varying number of SET and WHERE
             # args so we can only executemany for each identical template
             # statement.
             for stmt, stmt_args_list in table.update_queues.items():
-                sql_queue.append((stmt, stmt_args_list))
+                queued.append((stmt, list(stmt_args_list)))
+
+        sql_queue = queued
+        if self._uncommitted and (
+            self.conn is None or not self.conn.in_transaction
+        ):
+            # uncommitted statements were rolled back, redo them
+            sql_queue = self._uncommitted + queued
 
         # execute the statements and commit the transaction
         try:
@@ -502,7 +751,8 @@ class CylcWorkflowDAO:
             # Connection should only be opened if we have executed something.
             if self.conn is None:
                 return
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
 
         # something went wrong
         # (includes DB file not found, transaction processing issue, db locked)
@@ -560,6 +810,10 @@ class CylcWorkflowDAO:
                 table.delete_queues.clear()
                 table.insert_queue.clear()
                 table.update_queues.clear()
+            if commit:
+                self._uncommitted = []
+            else:
+                self._uncommitted = [*self._uncommitted, *queued]
             # Report public database retry recovery if necessary
             if self.n_tries:
                 LOG.info(
@@ -571,7 +825,14 @@ class CylcWorkflowDAO:
             # Note: This is not strictly necessary. But if the workflow run
             # directory is removed, a forced reconnection to the private
             # database will ensure that the workflow dies.
-            self.close()
+            # (The connection must be kept if a transaction is left open.)
+            # Persistent connections are kept open; the scheduler checks the
+            # database file still exists separately, see
+            # WorkflowDatabaseManager.check_pri_db_exists.
+            if not self.persistent and (
+                commit or self.conn is None or not self.conn.in_transaction
+            ):
+                self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
         """Helper for "self.execute_queued_items".
@@ -763,7 +1024,9 @@ class CylcWorkflowDAO:
                 return ret
         return None
 
-    def select_jobs_for_restart(self, callback):
+    def select_jobs_for_restart(
+        self, callback: Callable[[int, TaskJobRow], Any]
+    ) -> None:
         """Select from task_pool+task_states+task_jobs for restart.
 
         Invoke callback(row_idx, row) on each row of the result.
@@ -782,19 +1045,21 @@ class CylcWorkflowDAO:
                 %(task_jobs)s.job_id,
                 %(task_jobs)s.platform_name
             FROM
-                %(task_jobs)s
-            JOIN
                 %(task_pool)s
+            CROSS JOIN
+                %(task_jobs)s
             ON  %(task_jobs)s.cycle == %(task_pool)s.cycle AND
                 %(task_jobs)s.name == %(task_pool)s.name
         """
+        # (CROSS JOIN makes SQLite loop over the task pool and look up its
+        # jobs, rather than scanning the whole task_jobs table)
         form_data = {
             "task_pool": self.TABLE_TASK_POOL,
             "task_jobs": self.TABLE_TASK_JOBS,
         }
         stmt = form_stmt % form_data
-        for row_idx, row in enumerate(self.connect().execute(stmt)):
-            callback(row_idx, list(row))
+        for row_idx, row in enumerate(self.select(stmt, row_type=TaskJobRow)):
+            callback(row_idx, row)
 
     def select_task_job_run_times(self, callback):
         """Select run times of succeeded task jobs grouped by task names.
@@ -862,6 +1127,61 @@ class CylcWorkflowDAO:
             )
         ]
 
+    def select_prev_instances_for_tasks(
+        self, tasks: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], List[Tuple[int, bool, Set[int], str]]]:
+        """Select task_states table info about previous instances of tasks.
+
+        Batched version of select_prev_instances for many tasks.
+
+        Args:
+            tasks: (name, point) pairs.
+
+        Return: {(name, point): [(submit_num, flow_wait, flow_nums, status)]}
+            Tasks with no previous instances map to an empty list.
+
+        """
+        ret: Dict[
+            Tuple[str, str], List[Tuple[int, bool, Set[int], str]]
+        ] = {task: [] for task in tasks}
+        stmt = (  # nosec B608 (table name is code constant)
+            r"SELECT name,cycle,flow_nums,submit_num,flow_wait,status"
+            r" FROM %(name)s WHERE (name,cycle) IN"
+            r" (SELECT column1,column2 FROM (VALUES %(values)s))"
+        )
+        for chunk, values in self._chunk_tasks(list(ret)):
+            for name, point, flow_nums_str, submit_num, flow_wait, status in (
+                self.connect().execute(
+                    stmt % {
+                        'name': self.TABLE_TASK_STATES, 'values': values
+                    },
+                    chunk,
+                )
+            ):
+                ret[(name, point)].append((
+                    submit_num,
+                    flow_wait == 1,
+                    deserialise_set(flow_nums_str),
+                    status
+                ))
+        return ret
+
+    @classmethod
+    def _chunk_tasks(cls, tasks: List[Tuple[str, str]]):
+        """Yield flattened (name, point) params and VALUES placeholders.
+
+        Splits the tasks into chunks of MAX_TASKS_PER_SELECT for use in
+        "(name,cycle) IN (SELECT column1,column2 FROM (VALUES ...))"
+        clauses. (The sub-select allows the lookup to use an index, whereas
+        "IN (VALUES ...)" scans the table).
+        """
+        for start in range(0, len(tasks), cls.MAX_TASKS_PER_SELECT):
+            chunk = tasks[start:start + cls.MAX_TASKS_PER_SELECT]
+            yield (
+                [item for task in chunk for item in task],
+                ','.join('(?,?)' for _ in chunk),
+            )
+
     def select_latest_flow_nums(self) -> Optional['FlowNums']:
         """Return a list of the most recent previous flow numbers."""
         stmt = rf'''
@@ -902,6 +1222,47 @@ class CylcWorkflowDAO:
             )
         }
 
+    def select_task_outputs_for_tasks(
+        self, tasks: Iterable[Tuple[str, str]]
+    ) -> 'Dict[Tuple[str, str], Dict[str, FlowNums]]':
+        """Select task outputs for each flow of many tasks.
+
+        Batched version of select_task_outputs.
+
+        Args:
+            tasks: (name, point) pairs.
+
+        Return: {(name, point): {outputs_dict_str: flow_nums_set}}
+            Tasks with no outputs recorded map to an empty dict.
+
+        """
+        ret: 'Dict[Tuple[str, str], Dict[str, FlowNums]]' = {
+            task: {} for task in tasks
+        }
+        stmt = rf'''
+            SELECT
+               name,cycle,flow_nums,outputs
+            FROM
+               {self.TABLE_TASK_OUTPUTS}
+            WHERE
+                (name,cycle) IN (SELECT column1,column2 FROM (VALUES %s))
+        '''  # nosec B608 (table name is code constant)
+        for chunk, values in self._chunk_tasks(list(ret)):
+            for name, point, flow_nums, outputs in self.connect().execute(
+                stmt % values, chunk
+            ):
+                ret[(name, point)][outputs] = deserialise_set(flow_nums)
+        return ret
+
+    def select_task_history_cycles(self) -> Set[str]:
+        """Return the cycle points present in task_states or task_outputs."""
+        stmt = rf'''
+            SELECT cycle FROM {self.TABLE_TASK_STATES}
+            UNION
+            SELECT cycle FROM {self.TABLE_TASK_OUTPUTS}
+        '''  # nosec B608 (table name is code constant)
+        return {cycle for cycle, in self.connect().execute(stmt)}
+
     def select_xtriggers_for_restart(self, callback):
         stmt = rf'''
             SELECT
@@ -933,7 +1294,9 @@ class CylcWorkflowDAO:
         for row_idx, row in enumerate(self.connect().execute(stmt)):
             callback(row_idx, list(row))
 
-    def select_task_pool_for_restart(self, callback):
+    def select_task_pool_for_restart(
+        self, callback: Callable[[int, TaskPoolRestartRow], Any]
+    ) -> None:
         """Select from task_pool+task_states+task_jobs for restart.
 
         Invoke callback(row_idx, row) on each row, where each row contains:
@@ -999,8 +1362,10 @@ class CylcWorkflowDAO:
 
         # Run the callback, collecting any platform errors to be handled later:
         platform_errors = []
-        for row_idx, row in enumerate(self.connect().execute(stmt)):
-            platform_error = callback(row_idx, list(row))
+        for row_idx, row in enumerate(
+            self.select(stmt, row_type=TaskPoolRestartRow)
+        ):
+            platform_error = callback(row_idx, row)
             if platform_error:
                 platform_errors.append(platform_error)
 
@@ -1072,11 +1437,14 @@ class CylcWorkflowDAO:
         return columns, list(self.connect().execute(stmt))
 
     def select_tasks_for_datastore(
-        self, task_ids
-    ):
-        """Select state and outputs of specified tasks."""
-        if not task_ids:
-            return []
+        self, task_ids: Iterable[str]
+    ) -> Iterator[TaskStateRow]:
+        """Select state and outputs of specified tasks.
+
+        Args:
+            task_ids: Relative task IDs (cycle/name).
+
+        """
         form_stmt = r"""
             SELECT
                 %(task_states)s.cycle,
@@ -1101,17 +1469,21 @@ class CylcWorkflowDAO:
         form_data = {
             "task_states": self.TABLE_TASK_STATES,
             "task_outputs": self.TABLE_TASK_OUTPUTS,
-            "task_ids": ', '.join(f"'{val}'" for val in task_ids),
+            "task_ids": "%s",
         }
         stmt = form_stmt % form_data
-        return list(self.connect().execute(stmt))
+        return self._select_for_ids(stmt, task_ids, TaskStateRow)
 
     def select_prereqs_for_datastore(
-        self, prereq_ids
-    ):
-        """Select prerequisites of specified tasks."""
-        if not prereq_ids:
-            return []
+        self, prereq_ids: Iterable[str]
+    ) -> Iterator[TaskPrereqRow]:
+        """Select prerequisites of specified tasks.
+
+        Args:
+            prereq_ids: Relative task IDs with flow numbers
+                (cycle/name/flow_nums).
+
+        """
         form_stmt = r"""
             SELECT
                 cycle,
@@ -1129,17 +1501,20 @@ class CylcWorkflowDAO:
         """
         form_data = {
             "prerequisites": self.TABLE_TASK_PREREQUISITES,
-            "prereq_tasks_args": ', '.join(f"'{val}'" for val in prereq_ids),
+            "prereq_tasks_args": "%s",
         }
         stmt = form_stmt % form_data
-        return list(self.connect().execute(stmt))
+        return self._select_for_ids(stmt, prereq_ids, TaskPrereqRow)
 
     def select_jobs_for_datastore(
-        self, task_ids
-    ):
-        """Select jobs of of specified tasks."""
-        if not task_ids:
-            return []
+        self, task_ids: Iterable[str]
+    ) -> Iterator[TaskJobRow]:
+        """Select jobs of of specified tasks.
+
+        Args:
+            task_ids: Relative task IDs (cycle/name).
+
+        """
         form_stmt = r"""
             SELECT
                 %(task_states)s.cycle,
@@ -1169,10 +1544,24 @@ class CylcWorkflowDAO:
         form_data = {
             "task_states": self.TABLE_TASK_STATES,
             "task_jobs": self.TABLE_TASK_JOBS,
-            "task_ids": ', '.join(f"'{val}'" for val in task_ids),
+            "task_ids": "%s",
         }
         stmt = form_stmt % form_data
-        return list(self.connect().execute(stmt))
+        return self._select_for_ids(stmt, task_ids, TaskJobRow)
+
+    def _select_for_ids(
+        self, stmt: str, ids: Iterable[str], row_type: Type[RowT]
+    ) -> Iterator[RowT]:
+        """Stream the results of an "... IN (%s)" statement for many IDs.
+
+        The IDs are bound to the statement MAX_TASKS_PER_SELECT at a time.
+        """
+        ids = list(ids)
+        for start in range(0, len(ids), self.MAX_TASKS_PER_SELECT):
+            chunk = ids[start:start + self.MAX_TASKS_PER_SELECT]
+            yield from self.select(
+                stmt % ','.join('?' * len(chunk)), chunk, row_type
+            )
 
     def vacuum(self):
         """Vacuum to the database."""
@@ -285,6 +285,10 @@ class Scheduler:
     # main loop
     main_loop_intervals: deque = deque(maxlen=10)
     main_loop_plugins: Optional[dict] = None
+    main_loop_event_driven: bool = False
+    main_loop_idle_interval: float = INTERVAL_MAIN_LOOP
+    main_loop_wake_up: Optional[asyncio.Event] = None
+    _event_loop: Optional[asyncio.AbstractEventLoop] = None
     auto_restart_mode: Optional[AutoRestartMode] = None
     auto_restart_time: Optional[float] = None
 
@@ -395,6 +399,10 @@ class Scheduler:
         self.data_store_mgr = DataStoreMgr(self)
         self.broadcast_mgr = BroadcastMgr(self)
 
+        # Used to wake up an event driven main loop (see self.wake_up).
+        self.main_loop_wake_up = asyncio.Event()
+        self._event_loop = asyncio.get_running_loop()
+
         self.server = WorkflowRuntimeServer(self)
 
         self.proc_pool = SubProcPool()
@@ -475,7 +483,12 @@ class Scheduler:
             raise exc
         self.profiler.log_memory("scheduler.py: after load_flow_file")
 
-        self.workflow_db_mgr.on_workflow_start(self.is_restart)
+        self.workflow_db_mgr.on_workflow_start(
+            self.is_restart,
+            persistent=glbl_cfg().get(
+                ['scheduler', 'persistent database connection']
+            ),
+        )
 
         if not self.is_restart:
             # Set workflow params that would otherwise be loaded from database:
@@ -580,6 +593,17 @@ class Scheduler:
             self.cylc_config.get('main loop', {}),
             self.options.main_loop
         )
+        self.data_store_mgr.publish_interval = float(glbl_cfg().get(
+            ['scheduler', 'delta publish interval']
+        ))
+        self.main_loop_event_driven = glbl_cfg().get(
+            ['scheduler', 'main loop', 'event driven']
+        )
+        if self.main_loop_event_driven:
+            self.main_loop_idle_interval = float(glbl_cfg().get(
+                ['scheduler', 'main loop', 'idle interval']
+            ))
+            self._add_sigchld_handler()
 
         holdcp = None
         if self.options.holdcp:
@@ -831,6 +855,51 @@ class Scheduler:
                 stop_mode = StopMode.REQUEST_NOW
 
             self._set_stop(stop_mode)
+            self.wake_up()
+
+    def wake_up(self) -> None:
+        """Wake the main loop up if it is sleeping.
+
+        Only has an effect if the main loop is event driven. This is thread
+        safe so can be called by the server thread (e.g. on receipt of task
+        messages or commands).
+        """
+        if (
+            not self.main_loop_event_driven
+            or self.main_loop_wake_up is None
+            or self._event_loop is None
+        ):
+            return
+        with suppress(RuntimeError):
+            # RuntimeError if the event loop has been closed
+            self._event_loop.call_soon_threadsafe(self.main_loop_wake_up.set)
+
+    def _add_sigchld_handler(self) -> None:
+        """Wake the main loop up whenever a subprocess exits."""
+        if self._event_loop is None:
+            return
+        try:
+            self._event_loop.add_signal_handler(signal.SIGCHLD, self.wake_up)
+        except (NotImplementedError, RuntimeError, ValueError) as exc:
+            # not supported by this loop or not in the main thread
+            # (the main loop will pick up subprocess exits when it polls)
+            LOG.debug(f'Could not register SIGCHLD handler: {exc}')
+
+    def _remove_sigchld_handler(self) -> None:
+        """Remove the SIGCHLD handler added by _add_sigchld_handler."""
+        if self._event_loop is None or not self.main_loop_event_driven:
+            return
+        with suppress(NotImplementedError, RuntimeError, ValueError):
+            self._event_loop.remove_signal_handler(signal.SIGCHLD)
+
+    async def _sleep_until_woken(self, duration: float) -> None:
+        """Sleep for the duration or until the main loop is woken up."""
+        if self.main_loop_wake_up is None:
+            await asyncio.sleep(duration)
+            return
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.main_loop_wake_up.wait(), duration)
+        self.main_loop_wake_up.clear()
 
     def _load_pool_from_tasks(self):
         """Load task pool with specified tasks, for a new run."""
@@ -1430,7 +1499,12 @@ class Scheduler:
 
     def database_health_check(self):
         """If public database is stuck, blast it away by copying the content
-        of the private database into it."""
+        of the private database into it.
+
+        Also shut down if the private database has been removed (e.g. along
+        with the workflow run directory).
+        """
+        self.workflow_db_mgr.check_pri_db_exists()
         self.workflow_db_mgr.recover_pub_from_pri()
 
     def late_tasks_check(self):
@@ -1635,14 +1709,9 @@ class Scheduler:
 
         # Unqueued tasks with satisfied prerequisites must be waiting on
         # xtriggers or ext_triggers. Check these and queue tasks if ready.
-        for itask in self.pool.get_tasks():
-            if (
-                not itask.state(TASK_STATUS_WAITING)
-                or itask.state.is_queued
-                or itask.state.is_runahead
-            ):
-                continue
-
+        # (Only waiting tasks which have changed, or which are waiting on
+        # xtriggers or ext_triggers need to be checked.)
+        for itask in self.pool.get_ready_check_tasks():
             if (
                 itask.state.xtriggers
                 and not itask.state.xtriggers_all_satisfied()
@@ -1715,6 +1784,10 @@ class Scheduler:
         if has_updated or self.data_store_mgr.updates_pending:
             # Update the datastore.
             await self.update_data_structure()
+        elif self.data_store_mgr.coalesced_deltas:
+            # Publish deltas held back by the delta publish interval.
+            self.data_store_mgr.flush_coalesced_deltas()
+            self._publish_deltas()
 
         if has_updated:
             if not self.is_reloaded:
@@ -1767,16 +1840,31 @@ class Scheduler:
         # (Should probably use quick sleep logic for other queues?)
         elapsed = time() - tinit
         quick_mode = self.proc_pool.is_not_done()
-        if (elapsed >= self.INTERVAL_MAIN_LOOP or
+        if self.main_loop_event_driven:
+            # Sleep until woken up, the idle interval is a backstop for
+            # timers (retries, clock triggers, workflow timeouts, etc).
+            interval = self.main_loop_idle_interval
+        else:
+            interval = self.INTERVAL_MAIN_LOOP
+        if (elapsed >= interval or
                 quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
             # Main loop has taken quite a bit to get through
             # Still yield control to other threads by sleep(0.0)
             duration: float = 0
         elif quick_mode:
-            duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
+            duration = min(interval, self.INTERVAL_MAIN_LOOP_QUICK) - elapsed
         else:
-            duration = self.INTERVAL_MAIN_LOOP - elapsed
-        await asyncio.sleep(duration)
+            duration = interval - elapsed
+        if self.main_loop_event_driven:
+            if self.data_store_mgr.coalesced_deltas:
+                # Wake up to publish the coalesced deltas.
+                duration = min(
+                    duration,
+                    max(0, self.data_store_mgr.next_publish_time - time())
+                )
+            await self._sleep_until_woken(duration)
+        else:
+            await asyncio.sleep(duration)
         # Record latest main loop interval
         self.main_loop_intervals.append(time() - tinit)
         # END MAIN LOOP
@@ -1880,6 +1968,8 @@ class Scheduler:
         """Shutdown the workflow."""
         self._log_shutdown_reason(reason)
 
+        self._remove_sigchld_handler()
+
         if hasattr(self, 'proc_pool'):
             try:
                 self.proc_pool.terminate()
@@ -1901,6 +1991,9 @@ class Scheduler:
                 LOG.exception(exc)
 
         if self.server:
+            # Publish any deltas held back by the delta publish interval.
+            self.data_store_mgr.flush_coalesced_deltas(force=True)
+            self._publish_deltas()
             await self.server.stop(reason)
 
         # Flush errors and info before removing workflow contact file
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""cylc db-query-plan [OPTIONS] ARGS
+
+Print query plans for workflow database queries.
+
+For each of the named queries that Cylc makes on the workflow database, print
+the SQLite "EXPLAIN QUERY PLAN" output. This shows whether the query searches
+the tables using an index (SEARCH) or has to read whole tables (SCAN).
+
+This is intended for diagnosing slow database queries. The queries are not
+run, only planned. The public workflow database is used.
+
+Examples:
+  # print the plans for all queries
+  $ cylc db-query-plan WORKFLOW
+
+  # print the plans for particular queries
+  $ cylc db-query-plan WORKFLOW select_task_job workflow_state_status
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from cylc.flow.dbstatecheck import CylcWorkflowDBChecker
+from cylc.flow.exceptions import InputError
+from cylc.flow.id_cli import parse_id
+from cylc.flow.option_parsers import (
+    WORKFLOW_ID_ARG_DOC,
+    CylcOptionParser as COP,
+)
+from cylc.flow.pathutil import get_workflow_run_pub_db_path
+from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.terminal import cli_function
+
+if TYPE_CHECKING:
+    from optparse import Values
+    import sqlite3
+
+
+# Named queries: {name: function(dao, db_checker)}
+# (The arguments are placeholders, they do not affect the query plans.)
+QUERIES: Dict[
+    str, Callable[[CylcWorkflowDAO, CylcWorkflowDBChecker], Any]
+] = {
+    'select_prev_instances': (
+        lambda dao, _: dao.select_prev_instances('foo', '1')
+    ),
+    'select_prev_instances_for_tasks': (
+        lambda dao, _: dao.select_prev_instances_for_tasks(
+            [('foo', '1'), ('bar', '1')]
+        )
+    ),
+    'select_task_outputs': (
+        lambda dao, _: dao.select_task_outputs('foo', '1')
+    ),
+    'select_task_outputs_for_tasks': (
+        lambda dao, _: dao.select_task_outputs_for_tasks(
+            [('foo', '1'), ('bar', '1')]
+        )
+    ),
+    'select_task_job': lambda dao, _: dao.select_task_job('1', 'foo'),
+    'select_task_job_run_times': (
+        lambda dao, _: dao.select_task_job_run_times(None)
+    ),
+    'select_task_times': lambda dao, _: dao.select_task_times(),
+    'select_task_pool_for_restart': (
+        lambda dao, _: dao.select_task_pool_for_restart(lambda *_: None)
+    ),
+    'select_jobs_for_restart': (
+        lambda dao, _: dao.select_jobs_for_restart(lambda *_: None)
+    ),
+    'select_latest_flow_nums': lambda dao, _: dao.select_latest_flow_nums(),
+    'select_task_history_cycles': (
+        lambda dao, _: dao.select_task_history_cycles()
+    ),
+    'select_tasks_for_datastore': (
+        lambda dao, _: list(dao.select_tasks_for_datastore(['1/foo']))
+    ),
+    'select_jobs_for_datastore': (
+        lambda dao, _: list(dao.select_jobs_for_datastore(['1/foo']))
+    ),
+    'select_prereqs_for_datastore': (
+        lambda dao, _: list(dao.select_prereqs_for_datastore(['1/foo/[1]']))
+    ),
+    'workflow_state_status': (
+        lambda _, checker: checker.workflow_state_query(
+            'foo', '1', 'succeeded'
+        )
+    ),
+    'workflow_state_outputs': (
+        lambda _, checker: checker.workflow_state_query(
+            'foo', '1', 'succeeded', is_trigger=True
+        )
+    ),
+}
+
+
+class _Statement(Exception):  # noqa: N818 (not an error)
+    """Raised in place of running a query, to capture its statement."""
+
+    def __init__(self, stmt: str, args: Any):
+        self.stmt = stmt
+        self.args = args
+
+
+class _CaptureConnection:
+    """Database connection which captures (rather than runs) queries."""
+
+    def __init__(self, conn: 'sqlite3.Connection'):
+        self.conn = conn
+
+    def execute(self, stmt: str, args: Any = ()):
+        raise _Statement(stmt, args)
+
+
+class _CaptureDAO(CylcWorkflowDAO):
+    """Data access object which captures (rather than runs) queries."""
+
+    def connect(self):
+        return _CaptureConnection(super().connect())
+
+
+def get_query_plans(
+    db_file: str, names: Optional[List[str]] = None
+) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (name, query plan lines) for the named queries.
+
+    Args:
+        db_file: Path to the workflow database.
+        names: The queries to plan (default all).
+
+    """
+    if names:
+        bad_names = set(names) - set(QUERIES)
+        if bad_names:
+            raise InputError(
+                f"Unknown queries: {', '.join(sorted(bad_names))}"
+                f"\nValid queries are: {', '.join(QUERIES)}"
+            )
+    else:
+        names = list(QUERIES)
+
+    with (
+        _CaptureDAO(db_file, is_public=True) as dao,
+        CylcWorkflowDBChecker(None, None, db_path=db_file) as checker,
+    ):
+        conn = checker.conn
+        checker.conn = _CaptureConnection(conn)  # type: ignore[assignment]
+        try:
+            for name in names:
+                try:
+                    QUERIES[name](dao, checker)
+                except _Statement as stmt:
+                    yield name, format_query_plan(conn.execute(
+                        f'EXPLAIN QUERY PLAN {stmt.stmt}', stmt.args
+                    ).fetchall())
+                else:
+                    yield name, []
+        finally:
+            checker.conn = conn
+
+
+def format_query_plan(rows: List[Tuple[int, int, int, str]]) -> List[str]:
+    """Return "EXPLAIN QUERY PLAN" output rows as indented lines.
+
+    Examples:
+        >>> format_query_plan([
+        ...     (2, 0, 0, 'SCAN foo'),
+        ...     (5, 0, 0, 'SEARCH bar'),
+        ...     (7, 5, 0, 'CORRELATED SUBQUERY'),
+        ... ])
+        ['SCAN foo', 'SEARCH bar', '  CORRELATED SUBQUERY']
+
+    """
+    depths = {0: 0}
+    lines = []
+    for id_, parent, _, detail in rows:
+        depths[id_] = depths.get(parent, 0) + 1
+        lines.append(f"{'  ' * (depths[id_] - 1)}{detail}")
+    return lines
+
+
+def get_option_parser() -> COP:
+    return COP(
+        __doc__,
+        argdoc=[
+            WORKFLOW_ID_ARG_DOC,
+            COP.optional(('QUERY ...', 'Query name(s)')),
+        ],
+    )
+
+
+@cli_function(get_option_parser)
+def main(
+    parser: COP, options: 'Values', workflow_id: str, *names: str
+) -> None:
+    workflow_id, *_ = parse_id(
+        workflow_id,
+        constraint='workflows',
+    )
+    db_file = get_workflow_run_pub_db_path(workflow_id)
+    for name, lines in get_query_plans(db_file, list(names)):
+        print(f'{name}:')
+        for line in lines:
+            print(f'  {line}')
@@ -19,8 +19,13 @@ Send messages to:
 - The stdout/stderr.
 - The job status file, if there is one.
 - The scheduler, if communication is possible.
+
+If the job's platform has a "message batch interval", messages are spooled
+to a file in the job log directory and sent to the scheduler in batches.
 """
 
+import fcntl
+import json
 from logging import (
     CRITICAL,
     ERROR,
@@ -29,6 +34,10 @@ from logging import (
 )
 import os
 import sys
+from time import (
+    sleep,
+    time,
+)
 from typing import List
 
 from cylc.flow.exceptions import WorkflowStopped
@@ -52,6 +61,10 @@ CYLC_JOB_INIT_TIME = "CYLC_JOB_INIT_TIME"
 CYLC_JOB_EXIT = "CYLC_JOB_EXIT"
 CYLC_JOB_EXIT_TIME = "CYLC_JOB_EXIT_TIME"
 CYLC_MESSAGE = "CYLC_MESSAGE"
+CYLC_TASK_MESSAGE_BATCH_INTERVAL = "CYLC_TASK_MESSAGE_BATCH_INTERVAL"
+
+# Spooled messages are sent once this many have accumulated.
+MESSAGE_BATCH_SIZE = 100
 
 ABORT_MESSAGE_PREFIX = "aborted"
 FAIL_MESSAGE_PREFIX = TASK_OUTPUT_FAILED
@@ -59,24 +72,6 @@ VACATION_MESSAGE_PREFIX = "vacated"
 
 STDERR_LEVELS = (getLevelName(level) for level in (WARNING, ERROR, CRITICAL))
 
-MUTATION = '''
-mutation (
-  $wFlows: [WorkflowID]!,
-  $taskJob: String!,
-  $eventTime: String,
-  $messages: [[String]]
-) {
-  message (
-    workflows: $wFlows,
-    taskJob: $taskJob,
-    eventTime: $eventTime,
-    messages: $messages
-  ) {
-    result
-  }
-}
-'''
-
 
 def split_run_signal(message: str) -> tuple[str, str | None]:
     """Get the run signal from a message.
@@ -92,6 +87,24 @@ def split_run_signal(message: str) -> tuple[str, str | None]:
     return prefix, signal[0] if signal else None
 
 
+def is_lifecycle_message(message: str) -> bool:
+    """Return True if a message marks the start or end of a job.
+
+    >>> is_lifecycle_message('started')
+    True
+    >>> is_lifecycle_message('failed/ERR')
+    True
+    >>> is_lifecycle_message('50% complete')
+    False
+    """
+    prefix = split_run_signal(message)[0]
+    return message in {TASK_OUTPUT_STARTED, TASK_OUTPUT_SUCCEEDED} or (
+        prefix in {
+            FAIL_MESSAGE_PREFIX, ABORT_MESSAGE_PREFIX, VACATION_MESSAGE_PREFIX
+        }
+    )
+
+
 def record_messages(workflow: str, job_id: str, messages: List[list]) -> None:
     """Record task job messages.
 
@@ -109,7 +122,13 @@ def record_messages(workflow: str, job_id: str, messages: List[list]) -> None:
         override_use_utc=(os.getenv('CYLC_UTC') == 'True'))
     write_messages(workflow, job_id, messages, event_time)
     if get_comms_method() != CommsMeth.POLL:
-        send_messages(workflow, job_id, messages, event_time)
+        batch_interval = os.getenv(CYLC_TASK_MESSAGE_BATCH_INTERVAL)
+        if batch_interval:
+            spool_messages(
+                workflow, job_id, messages, event_time, float(batch_interval)
+            )
+        else:
+            send_messages(workflow, job_id, messages, event_time)
 
 
 def write_messages(workflow, job_id, messages, event_time):
@@ -128,6 +147,156 @@ def write_messages(workflow, job_id, messages, event_time):
 def send_messages(
     workflow: str, job_id: str, messages: List[list], event_time: str
 ) -> None:
+    _send_job_messages(workflow, [[job_id, event_time, messages]])
+
+
+def spool_messages(
+    workflow: str,
+    job_id: str,
+    messages: List[list],
+    event_time: str,
+    batch_interval: float,
+) -> None:
+    """Spool task job messages, send the spooled messages when due.
+
+    Messages are appended to the job spool file. All spooled messages are
+    sent to the workflow (in order, in a single request) when either:
+
+    * The batch interval has elapsed since the oldest spooled message
+      (a detached process is started with each batch to ensure this).
+    * MESSAGE_BATCH_SIZE messages have been spooled.
+    * A job start or exit message is received.
+
+    Arguments:
+        workflow: Workflow ID.
+        job_id: Job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
+        messages: List of messages "[[severity, message], ...]".
+        event_time: The time of the messages.
+        batch_interval: Maximum time to spool messages for (seconds).
+    """
+    spool_file_name = _get_job_log_root(workflow, job_id) + '.spool'
+    try:
+        handle = open(spool_file_name, 'a+')  # noqa: SIM115
+    except IOError as exc:
+        print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+        # send the messages without spooling them
+        send_messages(workflow, job_id, messages, event_time)
+        return
+    with handle:
+        # hold the lock until the spool is sent to preserve message order
+        # between concurrent "cylc message" calls
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        handle.seek(0)
+        spool = handle.read()
+        if spool and not spool.endswith('\n'):
+            # a previous write was interrupted, don't append to its line
+            handle.write('\n')
+        handle.write(json.dumps([time(), event_time, messages]) + '\n')
+        handle.flush()
+        spooled = _read_spool(handle)
+        if (
+            any(is_lifecycle_message(message) for _, message in messages)
+            or (
+                sum(len(msgs) for *_, msgs in spooled)
+                >= MESSAGE_BATCH_SIZE
+            )
+            or time() - spooled[0][0] >= batch_interval
+        ):
+            _send_spool(handle, workflow, job_id, spooled)
+            return
+    if len(spooled) == 1:
+        # a new batch, ensure it is sent within the batch interval
+        # (once the lock is released, the flusher must not inherit it)
+        _start_spool_flusher(workflow, job_id, spool_file_name, batch_interval)
+
+
+def flush_spool(workflow: str, job_id: str, spool_file_name: str) -> None:
+    """Send all spooled task job messages to the workflow.
+
+    Arguments:
+        workflow: Workflow ID.
+        job_id: Job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
+        spool_file_name: Path to the job spool file.
+    """
+    with open(spool_file_name, 'a+') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        spooled = _read_spool(handle)
+        if spooled:
+            _send_spool(handle, workflow, job_id, spooled)
+
+
+def _read_spool(handle) -> List[list]:
+    """Return the entries of a (locked) spool file."""
+    handle.seek(0)
+    spooled = []
+    for line in handle:
+        try:
+            spooled.append(json.loads(line))
+        except ValueError:
+            print(
+                f'Ignoring corrupted spool entry: {line.strip()}',
+                file=sys.stderr,
+            )
+    return spooled
+
+
+def _send_spool(handle, workflow: str, job_id: str, spooled: List[list]):
+    """Send spooled entries to the workflow and empty the spool file."""
+    try:
+        _send_job_messages(
+            workflow,
+            [
+                [job_id, spooled_time, msgs]
+                for _, spooled_time, msgs in spooled
+            ]
+        )
+    finally:
+        # don't re-send messages if sending failed, they have been
+        # recorded in the job status file
+        handle.truncate(0)
+
+
+def _start_spool_flusher(
+    workflow: str, job_id: str, spool_file_name: str, batch_interval: float
+) -> None:
+    """Flush the spool after the batch interval, in a detached process.
+
+    This ensures spooled messages are sent within the batch interval, even
+    if the job sends no further messages.
+    """
+    try:
+        pid = os.fork()
+    except OSError as exc:
+        print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+        return
+    if pid > 0:
+        # reap the first child, which exits once the flusher has forked
+        os.waitpid(pid, 0)
+        return
+    try:
+        # decouple from the job, then fork again (see cylc.flow.daemonize)
+        os.setsid()
+        if os.fork() > 0:
+            os._exit(0)
+        sleep(batch_interval)
+        flush_spool(workflow, job_id, spool_file_name)
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+
+
+def _send_job_messages(workflow: str, job_messages: List[list]) -> None:
+    """Send messages to the workflow, if possible.
+
+    Arguments:
+        workflow: Workflow ID.
+        job_messages:
+            List of messages "[[job_id, event_time, messages], ...]".
+    """
     workflow = os.path.normpath(workflow)
     try:
         pclient = get_client(workflow)
@@ -144,23 +313,22 @@ def send_messages(
             traceback.print_exc()
         # cylc message shouldn't fail if the client can't initialize.
         return
-    mutation_kwargs = {
-        'request_string': MUTATION,
-        'variables': {
-            'wFlows': [workflow],
-            'taskJob': job_id,
-            'eventTime': event_time,
-            'messages': messages,
-        }
-    }
-    pclient('graphql', mutation_kwargs)
+    # use the put_messages endpoint rather than the (equivalent) GraphQL
+    # "message" mutation to avoid the cost of GraphQL execution
+    pclient('put_messages', {'job_messages': job_messages})
 
 
-def _append_job_status_file(workflow, job_id, event_time, messages):
-    """Write messages to job status file."""
+def _get_job_log_root(workflow, job_id):
+    """Return the path prefix of job log files."""
     job_log_name = os.getenv('CYLC_TASK_LOG_ROOT')
     if not job_log_name:
         job_log_name = get_workflow_run_job_dir(workflow, job_id, 'job')
+    return job_log_name
+
+
+def _append_job_status_file(workflow, job_id, event_time, messages):
+    """Write messages to job status file."""
+    job_log_name = _get_job_log_root(workflow, job_id)
     try:
         job_status_file = open(job_log_name + '.status', 'a')  # noqa: SIM115
         # TODO: niceify read/write/appending messages to this file
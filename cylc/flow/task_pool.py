@@ -18,6 +18,7 @@
 
 from collections import Counter
 from contextlib import suppress
+import heapq
 import json
 import logging
 from textwrap import indent
@@ -108,7 +109,10 @@ if TYPE_CHECKING:
     )
     from cylc.flow.prerequisite import SatisfiedState
     from cylc.flow.task_events_mgr import TaskEventsManager
-    from cylc.flow.taskdef import TaskDef
+    from cylc.flow.taskdef import (
+        TaskDef,
+        TaskTuple,
+    )
     from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
     from cylc.flow.xtrigger_mgr import XtriggerManager
 
@@ -192,8 +196,36 @@ class TaskPool:
 
         # Tasks in the active window of the workflow.
         self.active_tasks: Pool = {}
+        # Flat index of the same tasks by relative ID, for quick lookup.
+        self._active_tasks_by_id: Dict[str, TaskProxy] = {}
         self._active_tasks_list: List[TaskProxy] = []
         self.active_tasks_changed = False
+        # Tasks which may have become ready to run (see get_ready_check_tasks)
+        # (a dict is used as an insertion ordered set).
+        self._ready_check_tasks: Dict[TaskProxy, None] = {}
+        # Active tasks counted by name, for queue limiting, and tasks which
+        # have entered the submission pipeline but are not yet preparing
+        # (maintained incrementally, see _update_active_count).
+        self._active_task_counter: Counter[str] = Counter()
+        self._active_counted_tasks: Set[TaskProxy] = set()
+        self._pre_prep_tasks: Dict[TaskProxy, None] = {}
+        # Min-heaps of the cycle points in the pool, and of the points of
+        # runahead-limited tasks (entries are removed lazily, so they may
+        # contain stale points; the sets record the points in each heap).
+        self._point_heap: List['PointBase'] = []
+        self._point_heap_points: Set['PointBase'] = set()
+        self._runahead_point_heap: List['PointBase'] = []
+        self._runahead_heap_points: Set['PointBase'] = set()
+        # Runahead-limited tasks by cycle point.
+        self._runahead_tasks: Dict['PointBase', Dict[TaskProxy, None]] = {}
+        # Task history fetched from the DB in bulk ahead of spawning many
+        # tasks (see _prefetch_task_history).
+        self._prefetched_task_states: Dict[
+            Tuple[str, str], List[Tuple[int, bool, Set[int], str]]
+        ] = {}
+        self._prefetched_task_outputs: Dict[
+            Tuple[str, str], Dict[str, 'FlowNums']
+        ] = {}
         self.tasks_removed = False
 
         self.hold_point: Optional['PointBase'] = None
@@ -241,8 +273,16 @@ class TaskPool:
     def _swap_out(self, itask):
         """Swap old task for new, during reload."""
         if itask.identity in self.active_tasks.get(itask.point, set()):
+            old_itask = self.active_tasks[itask.point][itask.identity]
+            old_itask.state_change_callback = None
+            self._ready_check_tasks.pop(old_itask, None)
+            self._forget_active_count(old_itask)
+            self._forget_runahead(old_itask)
             self.active_tasks[itask.point][itask.identity] = itask
+            self._active_tasks_by_id[itask.identity] = itask
             self.active_tasks_changed = True
+            itask.state_change_callback = self._on_task_state_change
+            self._on_task_state_change(itask)
 
     def load_from_point(self):
         """Load the task pool for the workflow start point.
@@ -270,15 +310,23 @@ class TaskPool:
     def add_to_pool(self, itask) -> None:
         """Add a task to the pool."""
 
-        self.active_tasks.setdefault(itask.point, {})
+        if itask.point not in self.active_tasks:
+            self.active_tasks[itask.point] = {}
+            self._push_point(
+                self._point_heap, self._point_heap_points, itask.point
+            )
         if itask.identity in self.active_tasks[itask.point]:
             # If logged, something has gone wrong.
             LOG.debug(f"{itask.identity} not added to n=0: already exists")
             return None
         self.active_tasks[itask.point][itask.identity] = itask
+        self._active_tasks_by_id[itask.identity] = itask
         self.active_tasks_changed = True
         LOG.debug(f"[{itask}] added to the n=0 window")
 
+        itask.state_change_callback = self._on_task_state_change
+        self._on_task_state_change(itask)
+
         self.create_data_store_elements(itask)
 
         if itask.tdef.max_future_prereq_offset is not None:
@@ -312,13 +360,15 @@ class TaskPool:
 
         # An intermediate list is needed here: auto-spawning of parentless
         # tasks can cause the task pool to change size during iteration.
-        release_me = [
-            itask
-            for point, itask_id_map in self.active_tasks.items()
-            for itask in itask_id_map.values()
-            if point <= self.runahead_limit_point
-            if itask.state.is_runahead
-        ]
+        # Pop points below the limit from the heap of runahead-limited points
+        # rather than searching the whole pool (points will be pushed again
+        # if tasks there are limited again later).
+        release_me: List[TaskProxy] = []
+        heap = self._runahead_point_heap
+        while heap and heap[0] <= self.runahead_limit_point:
+            point = heapq.heappop(heap)
+            self._runahead_heap_points.discard(point)
+            release_me.extend(self._runahead_tasks.get(point, ()))
 
         for itask in release_me:
             self.rh_release_and_queue(itask)
@@ -379,17 +429,18 @@ class TaskPool:
                 ),
                 default=None,
             )
+        elif not cylc.flow.flags.cylc7_back_compat:
+            # Find the earliest point with incomplete tasks.
+            # All n=0 tasks are incomplete by definition.
+            base_point = self.get_min_point()
         else:
             # Find the earliest point with incomplete tasks.
             for point, itasks in sorted(self.get_tasks_by_point().items()):
                 # All n=0 tasks are incomplete by definition, but Cylc 7
                 # ignores failed ones (it does not ignore submit-failed!).
-                if (
-                    cylc.flow.flags.cylc7_back_compat and
-                    all(
-                        itask.state(TASK_STATUS_FAILED)
-                        for itask in itasks
-                    )
+                if all(
+                    itask.state(TASK_STATUS_FAILED)
+                    for itask in itasks
                 ):
                     continue
                 base_point = point
@@ -400,6 +451,9 @@ class TaskPool:
 
         LOG.debug(f"Runahead: base point {base_point}")
 
+        # Tasks behind the base point are unlikely to be spawned again.
+        self.workflow_db_mgr.task_history.evict(base_point)
+
         if self._prev_runahead_base_point is None:
             self._prev_runahead_base_point = base_point
 
@@ -915,6 +969,11 @@ class TaskPool:
         except KeyError:
             pass
         else:
+            self._active_tasks_by_id.pop(itask.identity, None)
+            self._ready_check_tasks.pop(itask, None)
+            self._forget_active_count(itask)
+            self._forget_runahead(itask)
+            itask.state_change_callback = None
             self.tasks_to_trigger_now.discard(itask)
             self.pre_start_tasks_to_trigger.discard(
                 (itask.tdef.name, itask.point)
@@ -949,7 +1008,7 @@ class TaskPool:
 
             # ensure this task is written to the DB before moving on
             # https://github.com/cylc/cylc-flow/issues/6315
-            self.workflow_db_mgr.process_queued_ops()
+            self.workflow_db_mgr.flush_queued_ops()
 
             del itask
 
@@ -969,6 +1028,113 @@ class TaskPool:
             ]
         return self._active_tasks_list
 
+    def _on_task_state_change(self, itask: TaskProxy) -> None:
+        """Update task pool indexes when a task in the pool changes state."""
+        self.flag_ready_check(itask)
+        self._update_active_count(itask)
+        if itask.state.is_runahead:
+            if itask.point not in self._runahead_tasks:
+                self._runahead_tasks[itask.point] = {}
+                self._push_point(
+                    self._runahead_point_heap,
+                    self._runahead_heap_points,
+                    itask.point,
+                )
+            self._runahead_tasks[itask.point][itask] = None
+        else:
+            self._forget_runahead(itask)
+
+    def _forget_runahead(self, itask: TaskProxy) -> None:
+        """Remove a task from the runahead-limited task index."""
+        itasks = self._runahead_tasks.get(itask.point)
+        if itasks is not None:
+            itasks.pop(itask, None)
+            if not itasks:
+                del self._runahead_tasks[itask.point]
+
+    @staticmethod
+    def _push_point(
+        heap: List['PointBase'],
+        heap_points: Set['PointBase'],
+        point: 'PointBase',
+    ) -> None:
+        """Push a cycle point onto a heap, unless it is already there."""
+        if point not in heap_points:
+            heap_points.add(point)
+            heapq.heappush(heap, point)
+
+    def _update_active_count(self, itask: TaskProxy) -> None:
+        """Update the active task counts for a task in the pool."""
+        # tasks which have entered the submission pipeline but have not yet
+        # entered the PREPARING state are treated as active for the purposes
+        # of queue limiting
+        if itask.waiting_on_job_prep:
+            self._pre_prep_tasks[itask] = None
+        else:
+            self._pre_prep_tasks.pop(itask, None)
+        is_active = itask.waiting_on_job_prep or itask.state(
+            TASK_STATUS_PREPARING,
+            TASK_STATUS_SUBMITTED,
+            TASK_STATUS_RUNNING,
+        )
+        if is_active and itask not in self._active_counted_tasks:
+            self._active_counted_tasks.add(itask)
+            self._active_task_counter[itask.tdef.name] += 1
+        elif not is_active and itask in self._active_counted_tasks:
+            self._forget_active_count(itask)
+
+    def _forget_active_count(self, itask: TaskProxy) -> None:
+        """Remove a task from the active task counts."""
+        self._pre_prep_tasks.pop(itask, None)
+        if itask not in self._active_counted_tasks:
+            return
+        self._active_counted_tasks.discard(itask)
+        name = itask.tdef.name
+        self._active_task_counter[name] -= 1
+        if self._active_task_counter[name] <= 0:
+            # don't accumulate names with no active tasks
+            del self._active_task_counter[name]
+
+    def flag_ready_check(self, itask: TaskProxy) -> None:
+        """Flag a task to be checked for readiness by the main loop.
+
+        Call when a change might allow a waiting task to run, i.e. when its
+        state (held, queued, runahead, etc), prerequisites or xtriggers
+        change. Task state changes are flagged automatically.
+        """
+        self._ready_check_tasks[itask] = None
+
+    def get_ready_check_tasks(self) -> List[TaskProxy]:
+        """Return waiting tasks which need to be checked for readiness.
+
+        These are the unqueued, non-runahead-limited waiting tasks which
+        have been flagged (see flag_ready_check) since the last call, or
+        which are waiting on xtriggers or external triggers (these must be
+        checked on every main loop iteration until they are satisfied).
+
+        Other tasks are dropped until flagged again, so that the cost of
+        checking scales with the number of changes rather than the size of
+        the pool.
+        """
+        itasks: List[TaskProxy] = []
+        ready_check_tasks: Dict[TaskProxy, None] = {}
+        for itask in self._ready_check_tasks:
+            if (
+                not itask.state(TASK_STATUS_WAITING)
+                or itask.state.is_queued
+                or itask.state.is_runahead
+            ):
+                continue
+            itasks.append(itask)
+            if (
+                not itask.state.xtriggers_all_satisfied()
+                or not itask.state.external_triggers_all_satisfied()
+            ):
+                # still needs checking on subsequent iterations
+                ready_check_tasks[itask] = None
+        self._ready_check_tasks = ready_check_tasks
+        return itasks
+
     def get_task_ids(self) -> Set[str]:
         """Return a list of task IDs in the task pool."""
         return {itask.identity for itask in self.get_tasks()}
@@ -990,10 +1156,7 @@ class TaskPool:
 
     def _get_task_by_id(self, id_: str) -> Optional[TaskProxy]:
         """Return pool task by ID if it exists, or None."""
-        for itask_ids in self.active_tasks.values():
-            if id_ in itask_ids:
-                return itask_ids[id_]
-        return None
+        return self._active_tasks_by_id.get(id_)
 
     def get_itasks(self, ids: 'Iterable[Tokens]') -> List[TaskProxy]:
         """Return a list of itasks matching the IDs provided.
@@ -1005,12 +1168,14 @@ class TaskPool:
             A list of an active tasks matching these IDs.
 
         """
-        ids_ = {id_.relative_id for id_ in ids}
         return [
             itask
-            for itasks in self.active_tasks.values()
-            for id_, itask in itasks.items()
-            if id_ in ids_
+            for itask in (
+                self._active_tasks_by_id.get(id_)
+                # (de-duplicate IDs)
+                for id_ in dict.fromkeys(id_.relative_id for id_ in ids)
+            )
+            if itask is not None
         ]
 
     def queue_task(self, itask: TaskProxy) -> None:
@@ -1031,35 +1196,31 @@ class TaskPool:
             self.data_store_mgr.delta_task_state(itask)
             self.task_queue_mgr.remove_task(itask)
 
-    def count_active_tasks(self):
-        """Count active tasks and identify pre-prep tasks."""
-
-        # count active tasks by name
-        # {task_name: number_of_active_instances, ...}
-        active_task_counter = Counter()
-
-        # tasks which have entered the submission pipeline but have not yet
-        # entered the PREPARING state
-        pre_prep_tasks = []
-
-        for itask in self.get_tasks():
-            # populate active_task_counter and pre_prep_tasks together to
-            # avoid iterating the task pool twice
-            if itask.waiting_on_job_prep:
-                # a task which has entered the submission pipeline
-                # for the purposes of queue limiting this should be treated
-                # the same as an active task
-                active_task_counter.update([itask.tdef.name])
-                pre_prep_tasks.append(itask)
-            elif itask.state(
-                TASK_STATUS_PREPARING,
-                TASK_STATUS_SUBMITTED,
-                TASK_STATUS_RUNNING,
-            ):
-                # an active task
-                active_task_counter.update([itask.tdef.name])
+    def count_active_tasks(
+        self
+    ) -> Tuple[Counter[str], List[TaskProxy]]:
+        """Count active tasks and identify pre-prep tasks.
 
-        return active_task_counter, pre_prep_tasks
+        Returns:
+            (active_task_counter, pre_prep_tasks)
+
+            active_task_counter:
+                Active tasks counted by name
+                {task_name: number_of_active_instances, ...}.
+                Tasks which have entered the submission pipeline (i.e. are
+                waiting on job prep) count as active.
+            pre_prep_tasks:
+                Tasks which have entered the submission pipeline but have
+                not yet entered the PREPARING state.
+
+        These are maintained incrementally as tasks change state, so this
+        does not iterate over the task pool. A copy of the counter is
+        returned so that the caller can safely modify it.
+        """
+        return (
+            Counter(self._active_task_counter),
+            list(self._pre_prep_tasks),
+        )
 
     def release_queued_tasks(self) -> set['TaskProxy']:
         """Return list of queue-released tasks awaiting job prep.
@@ -1092,13 +1253,15 @@ class TaskPool:
         # Note: released and pre_prep_tasks can overlap
         return set(released + pre_prep_tasks)
 
-    def get_min_point(self):
+    def get_min_point(self) -> Optional['PointBase']:
         """Return the minimum cycle point currently in the pool."""
-        cycles = list(self.active_tasks)
-        minc = None
-        if cycles:
-            minc = min(cycles)
-        return minc
+        heap = self._point_heap
+        # discard points which are no longer in the pool
+        while heap and heap[0] not in self.active_tasks:
+            self._point_heap_points.discard(heapq.heappop(heap))
+        if heap:
+            return heap[0]
+        return None
 
     def set_max_future_offset(self):
         """Calculate the latest required future trigger offset."""
@@ -1525,14 +1688,56 @@ class TaskPool:
             # task has begun submission -> clear all xtriggers
             self.xtrigger_mgr.force_satisfy_all(itask, log=False)
 
-        suicide = []
+        prefetched: List[Tuple[str, str]] = []
+        if itask.flow_nums and not any(is_abs for *_, is_abs in children):
+            # Children which are not already in the pool will be spawned,
+            # fetch their history from the DB in one go.
+            # (Not for absolute outputs, these flush the DB queue mid-spawn.)
+            prefetched = self._prefetch_task_history(
+                (c_name, c_point)
+                for c_name, c_point, _ in children
+                if self._get_task_by_id(quick_relative_id(c_point, c_name))
+                is None
+            )
+        try:
+            suicide = self._spawn_children(itask, output, children)
+        finally:
+            self._clear_prefetched_task_history(prefetched)
+
+        for c_task in suicide:
+            if self.config.experimental.expire_triggers:
+                self.task_queue_mgr.remove_task(c_task)
+                self.task_events_mgr.process_message(
+                    c_task, logging.WARNING, TASK_OUTPUT_EXPIRED
+                )
+            else:
+                self.remove(c_task, self.__class__.SUICIDE_MSG)
+
+        if suicide:
+            # Update DB now in case of very quick respawn attempt.
+            # See https://github.com/cylc/cylc-flow/issues/6066
+            self.workflow_db_mgr.flush_queued_ops()
+
+        self.remove_if_complete(itask, output)
+
+    def _spawn_children(
+        self,
+        itask: TaskProxy,
+        output: str,
+        children: 'List[TaskTuple]',
+    ) -> List[TaskProxy]:
+        """Spawn and/or update the children of a task output.
+
+        Returns the children whose suicide prerequisites are all satisfied.
+        """
+        suicide: List[TaskProxy] = []
         for c_name, c_point, is_abs in children:
             if is_abs:
                 self.abs_outputs_done.add(
                     (str(itask.point), itask.tdef.name, output))
                 self.workflow_db_mgr.put_insert_abs_output(
                     str(itask.point), itask.tdef.name, output)
-                self.workflow_db_mgr.process_queued_ops()
+                self.workflow_db_mgr.flush_queued_ops()
 
             c_task = self._get_task_by_id(quick_relative_id(c_point, c_name))
             in_pool = c_task is not None
@@ -1571,6 +1776,7 @@ class TaskPool:
                         mode=itask.run_mode
                     )
                     self.data_store_mgr.delta_task_prerequisite(t)
+                    self.flag_ready_check(t)
                     if not in_pool:
                         self.add_to_pool(t)
 
@@ -1586,22 +1792,7 @@ class TaskPool:
                         t.state.suicide_prerequisites_all_satisfied()
                     ):
                         suicide.append(t)
-
-        for c_task in suicide:
-            if self.config.experimental.expire_triggers:
-                self.task_queue_mgr.remove_task(c_task)
-                self.task_events_mgr.process_message(
-                    c_task, logging.WARNING, TASK_OUTPUT_EXPIRED
-                )
-            else:
-                self.remove(c_task, self.__class__.SUICIDE_MSG)
-
-        if suicide:
-            # Update DB now in case of very quick respawn attempt.
-            # See https://github.com/cylc/cylc-flow/issues/6066
-            self.workflow_db_mgr.process_queued_ops()
-
-        self.remove_if_complete(itask, output)
+        return suicide
 
     def remove_if_complete(
         self, itask: TaskProxy, output: Optional[str] = None
@@ -1747,6 +1938,51 @@ class TaskPool:
 
         return True
 
+    def _prefetch_task_history(
+        self, tasks: 'Iterable[Tuple[str, PointBase]]'
+    ) -> List[Tuple[str, str]]:
+        """Fetch the DB history of tasks which are about to be spawned.
+
+        When spawning many tasks at once (e.g. the children of a large
+        fan-out) this selects their task_states and task_outputs rows with
+        one query per table, rather than two queries per task. The results
+        are consumed (once) by _get_task_history and
+        _load_historical_outputs.
+
+        Args:
+            tasks: (name, point) of the tasks.
+
+        Returns:
+            The (name, point_str) keys which were prefetched, pass these to
+            _clear_prefetched_task_history once spawning is done.
+
+        """
+        tasks_by_key = {
+            (name, str(point)): (name, point) for name, point in tasks
+        }
+        if len(tasks_by_key) < 2:
+            # nothing to gain
+            return []
+        self._prefetched_task_states.update(
+            self.workflow_db_mgr.select_prev_instances_for_tasks(
+                tasks_by_key.values()
+            )
+        )
+        self._prefetched_task_outputs.update(
+            self.workflow_db_mgr.select_task_outputs_for_tasks(
+                tasks_by_key.values()
+            )
+        )
+        return list(tasks_by_key)
+
+    def _clear_prefetched_task_history(
+        self, keys: List[Tuple[str, str]]
+    ) -> None:
+        """Discard any unused prefetched task history."""
+        for key in keys:
+            self._prefetched_task_states.pop(key, None)
+            self._prefetched_task_outputs.pop(key, None)
+
     def _get_task_history(
         self, name: str, point: 'PointBase', flow_nums: 'FlowNums'
     ) -> tuple[int, str | None, bool]:
@@ -1766,9 +2002,10 @@ class TaskPool:
         status: Optional[str] = None
         flow_wait = False
 
-        info = self.workflow_db_mgr.pri_dao.select_prev_instances(
-            name, str(point)
-        )
+        try:
+            info = self._prefetched_task_states.pop((name, str(point)))
+        except KeyError:
+            info = self.workflow_db_mgr.select_prev_instances(name, point)
         with suppress(ValueError):
             submit_num = max(s[0] for s in info)
 
@@ -1791,8 +2028,13 @@ class TaskPool:
 
         NOTE this creates a task_states/task_outputs DB entry if not present.
         """
-        info = self.workflow_db_mgr.pri_dao.select_task_outputs(
-            itask.tdef.name, str(itask.point))
+        try:
+            info = self._prefetched_task_outputs.pop(
+                (itask.tdef.name, str(itask.point))
+            )
+        except KeyError:
+            info = self.workflow_db_mgr.select_task_outputs(
+                itask.tdef.name, itask.point)
         if not info:
             # task never ran before
             self.db_add_new_flow_rows(itask)
@@ -2323,7 +2565,7 @@ class TaskPool:
         self.data_store_mgr.delta_task_outputs(itask)
         self.workflow_db_mgr.put_update_task_state(itask)
         self.workflow_db_mgr.put_update_task_outputs(itask)
-        self.workflow_db_mgr.process_queued_ops()
+        self.workflow_db_mgr.flush_queued_ops()
         return True
 
     def _set_prereqs_itask(
@@ -2341,6 +2583,7 @@ class TaskPool:
         itask.force_satisfy(prereqs, set_all)
         # xtriggers, including "all"
         self.xtrigger_mgr.force_satisfy(itask, xtrigs)
+        self.flag_ready_check(itask)
 
         if (
             itask.state.is_runahead
@@ -2544,8 +2787,7 @@ class TaskPool:
                 task=itask.tokens['task'],
                 task_sel=itask.state.status,
             )
-            for itasks in self.active_tasks.values()
-            for itask in itasks.values()
+            for itask in self._active_tasks_by_id.values()
         }
 
         return id_match(
@@ -166,6 +166,10 @@ class TaskProxy:
         .removed:
             A flag to indicate this task has been removed by command (used
             e.g. to disable failed/submit-failed event handlers).
+        .state_change_callback:
+            Called with this task proxy whenever its state or
+            .waiting_on_job_prep changes (set by the task pool whilst the
+            task is in the pool).
 
     Args:
         tdef: The definition object of this task.
@@ -207,11 +211,12 @@ class TaskProxy:
         'timeout',
         'tokens',
         'try_timers',
-        'waiting_on_job_prep',
+        '_waiting_on_job_prep',
         'mode_settings',
         'transient',
         'is_xtrigger_sequential',
         'removed',
+        'state_change_callback',
     )
 
     def __init__(
@@ -286,8 +291,11 @@ class TaskProxy:
         self.expire_time: Optional[float] = None
         self.late_time: Optional[float] = None
         self.is_late = is_late
-        self.waiting_on_job_prep = False
+        self._waiting_on_job_prep = False
         self.removed: bool = False
+        self.state_change_callback: Optional[
+            Callable[['TaskProxy'], None]
+        ] = None
 
         self.state = TaskState(tdef, self.point, status, is_held)
 
@@ -317,6 +325,18 @@ class TaskProxy:
                 )
             )
 
+    @property
+    def waiting_on_job_prep(self) -> bool:
+        return self._waiting_on_job_prep
+
+    @waiting_on_job_prep.setter
+    def waiting_on_job_prep(self, value: bool) -> None:
+        if value == self._waiting_on_job_prep:
+            return
+        self._waiting_on_job_prep = value
+        if self.state_change_callback is not None:
+            self.state_change_callback(self)
+
     @property
     def job_tokens(self) -> 'Tokens':
         """Return the job tokens for this task proxy."""
@@ -569,6 +589,8 @@ class TaskProxy:
         ):
             if not silent and not self.transient:
                 LOG.info(f"[{before}] => {self.state}")
+            if self.state_change_callback is not None:
+                self.state_change_callback(self)
             return True
 
         return False
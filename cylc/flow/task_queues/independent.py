@@ -44,10 +44,10 @@ class LimitedTaskQueue:
         self, itask: 'TaskProxy', active: Counter[str]
     ) -> bool:
         """Queue task if in my membership and the queue limit is reached."""
-        n_active = sum(active[mem] for mem in self.members)
         if (
-            self.limit and n_active >= self.limit
+            self.limit
             and itask.tdef.name in self.members
+            and self.count_active(active) >= self.limit
         ):
             self.deque.appendleft(itask)
             return True
@@ -57,10 +57,11 @@ class LimitedTaskQueue:
         """Release tasks if below the active limit."""
         # The "active" argument counts active tasks by name.
         released: List['TaskProxy'] = []
+        if not self.deque:
+            # nothing to release, don't bother counting
+            return released
         held: List['TaskProxy'] = []
-        n_active: int = 0
-        for mem in self.members:
-            n_active += active[mem]
+        n_active: int = self.count_active(active)
         while not self.limit or n_active < self.limit:
             try:
                 itask = self.deque.pop()
@@ -77,6 +78,18 @@ class LimitedTaskQueue:
             self.deque.appendleft(itask)
         return released
 
+    def count_active(self, active: Counter[str]) -> int:
+        """Return the number of active tasks in my membership list.
+
+        The "active" argument counts active tasks by name. Iterate over
+        whichever of it or the membership list is shorter.
+        """
+        if len(active) < len(self.members):
+            return sum(
+                num for name, num in active.items() if name in self.members
+            )
+        return sum(active[mem] for mem in self.members)
+
     def remove(self, itask: 'TaskProxy') -> bool:
         """Remove a single task from queue, return True if removed."""
         try:
@@ -24,20 +24,31 @@ This module provides the logic to:
 """
 
 from collections import defaultdict
+from contextlib import (
+    closing,
+    suppress,
+)
 import json
 import os
 from shutil import (
     copy,
     rmtree,
 )
-from sqlite3 import OperationalError
+from sqlite3 import (
+    Connection,
+    Error as SQLiteError,
+    OperationalError,
+    connect,
+)
 from tempfile import mkstemp
+from threading import Thread
 from typing import (
     TYPE_CHECKING,
     Any,
     AnyStr,
     DefaultDict,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -91,6 +102,172 @@ PERM_PRIVATE = 0o600  # -rw-------
 INCOMPAT_MSG = f"Workflow database is incompatible with Cylc {CYLC_VERSION}"
 
 
+class TaskHistoryCache:
+    """In-memory cache of task history from the private database.
+
+    Caches the task_states and task_outputs rows selected for each task
+    (by name and cycle) so that repeated spawning of the same task does not
+    hit the database each time.
+
+    It also records which tasks the scheduler has written history for, so
+    that tasks which have no history (the common case when spawning) can
+    be identified without a database query: a task can only have history
+    if it was written by this scheduler run, or if its cycle point was
+    already present in the database on (re)start.
+
+    Cached rows must match what is in the database, so rows for tasks with
+    pending writes are dropped when the writes are executed (see
+    "task_changed" and "flushed").
+
+    History is evicted by cycle point (see "evict") to keep the cache
+    bounded. Tasks before the eviction point always go to the database.
+    """
+
+    def __init__(self) -> None:
+        # {cycle: {name: rows}}
+        self._states: Dict[
+            str, Dict[str, List[Tuple[int, bool, Set[int], str]]]
+        ] = {}
+        self._outputs: Dict[str, Dict[str, Dict[str, 'FlowNums']]] = {}
+        # tasks which this scheduler has written history for
+        # {cycle: {name, ...}}
+        self._written: Dict[str, Set[str]] = {}
+        # cycle points by cycle string (for eviction)
+        self._points: Dict[str, 'PointBase'] = {}
+        # tasks with database writes queued: {(name, cycle): point}
+        self._pending: Dict[Tuple[str, str], Optional['PointBase']] = {}
+        # cycles with history in the database before start up, None if not
+        # known (in which case we cannot tell whether a task has history)
+        self._db_cycles: Optional[Set[str]] = None
+        self._evict_point: Optional['PointBase'] = None
+
+    def set_db_cycles(self, cycles: Set[str]) -> None:
+        """Set the cycles with history in the database on start up."""
+        self._db_cycles = cycles
+
+    def _has_no_history(
+        self, name: str, cycle: str, point: 'PointBase'
+    ) -> bool:
+        """Return True if the task is known to have no database history."""
+        return (
+            self._db_cycles is not None
+            and cycle not in self._db_cycles
+            and (self._evict_point is None or point >= self._evict_point)
+            and name not in self._written.get(cycle, ())
+        )
+
+    def get_states(
+        self, name: str, cycle: str, point: 'PointBase'
+    ) -> Optional[List[Tuple[int, bool, Set[int], str]]]:
+        """Return cached task_states rows for a task, None if not cached."""
+        with suppress(KeyError):
+            return self._states[cycle][name]
+        if self._has_no_history(name, cycle, point):
+            return []
+        return None
+
+    def get_outputs(
+        self, name: str, cycle: str, point: 'PointBase'
+    ) -> 'Optional[Dict[str, FlowNums]]':
+        """Return cached task_outputs rows for a task, None if not cached."""
+        with suppress(KeyError):
+            return self._outputs[cycle][name]
+        if self._has_no_history(name, cycle, point):
+            return {}
+        return None
+
+    def put_states(
+        self,
+        name: str,
+        cycle: str,
+        point: 'PointBase',
+        rows: List[Tuple[int, bool, Set[int], str]],
+    ) -> None:
+        """Cache task_states rows selected from the database."""
+        self._points[cycle] = point
+        self._states.setdefault(cycle, {})[name] = rows
+
+    def put_outputs(
+        self,
+        name: str,
+        cycle: str,
+        point: 'PointBase',
+        rows: 'Dict[str, FlowNums]',
+    ) -> None:
+        """Cache task_outputs rows selected from the database."""
+        self._points[cycle] = point
+        self._outputs.setdefault(cycle, {})[name] = rows
+
+    def task_changed(
+        self, name: str, cycle: str, point: Optional['PointBase'] = None
+    ) -> None:
+        """Record that a write has been queued for a task's history.
+
+        Args:
+            name: Task name.
+            cycle: Task cycle point string.
+            point: Task cycle point, if the write might create new rows.
+                If None, the write can only modify existing rows.
+
+        """
+        if point is not None or (name, cycle) not in self._pending:
+            self._pending[(name, cycle)] = point
+
+    def flushed(self) -> None:
+        """Update the cache once queued writes have been executed."""
+        for (name, cycle), point in self._pending.items():
+            with suppress(KeyError):
+                del self._states[cycle][name]
+            with suppress(KeyError):
+                del self._outputs[cycle][name]
+            if point is not None:
+                self._points[cycle] = point
+                self._written.setdefault(cycle, set()).add(name)
+        self._pending.clear()
+
+    def evict(self, point: 'PointBase') -> None:
+        """Evict history for cycle points before the given point."""
+        if self._evict_point is not None and point <= self._evict_point:
+            return
+        self._evict_point = point
+        for cycle, cycle_point in list(self._points.items()):
+            if cycle_point < point:
+                del self._points[cycle]
+                self._states.pop(cycle, None)
+                self._outputs.pop(cycle, None)
+                self._written.pop(cycle, None)
+
+
+class PubDBRecovery(Thread):
+    """Copy a private database snapshot to a temporary public database file.
+
+    Args:
+        snapshot:
+            Connection to the private database with a read transaction
+            open on it (see CylcWorkflowDAO.open_snapshot).
+        temp_pub_db_file_name:
+            The file to copy it to.
+
+    """
+
+    def __init__(self, snapshot: Connection, temp_pub_db_file_name: str):
+        super().__init__(daemon=True)
+        self.snapshot = snapshot
+        self.temp_pub_db_file_name = temp_pub_db_file_name
+        self.exc: Optional[SQLiteError] = None
+
+    def run(self) -> None:
+        try:
+            with closing(connect(self.temp_pub_db_file_name)) as dest:
+                # (copies the snapshot in one step: writes to the private
+                # database are not blocked by the read transaction)
+                self.snapshot.backup(dest)
+        except SQLiteError as exc:
+            self.exc = exc
+        finally:
+            self.snapshot.close()
+
+
 class WorkflowDatabaseManager:
     """Manage the workflow runtime private and public databases."""
 
@@ -138,6 +315,17 @@ class WorkflowDatabaseManager:
         self.pri_dao = None
         self.pub_dao = None
         self.n_restart = 0
+        self.task_history = TaskHistoryCache()
+        # Background rebuild of the public database (if in progress).
+        self._pub_recovery: Optional[PubDBRecovery] = None
+        # Rows written by put_task_pool for each task in the pool (None
+        # until the task pool tables have been written).
+        # {(name, cycle): (pool row, prerequisite rows, timeout timer row)}
+        self._task_pool_rows: Optional[Dict[Tuple[str, str], tuple]] = None
+        # {(name, cycle): action timer rows}
+        self._task_action_timer_rows: Dict[
+            Tuple[str, str], List[DbArgDict]
+        ] = {}
 
         self.db_deletes_map: Dict[str, List[DbArgDict]] = {
             self.TABLE_BROADCAST_STATES: [],
@@ -171,31 +359,109 @@ class WorkflowDatabaseManager:
     def copy_pri_to_pub(self) -> None:
         """Copy content of primary database file to public database file."""
         self.pub_dao.close()
-        # Use temporary file to ensure that we do not end up with a
-        # partial file.
-        # If an external connection is locking the old public db, it will
-        # still be connected to its inode, but should no longer affect future
-        # accesses (hopefully that process will soon recover to give up
-        # the lock).
+        # The public database will be in sync with the private one.
+        self.pub_dao.clear_queued_items()
+        temp_pub_db_file_name = self._mk_temp_pub_db()
+        try:
+            self.pri_dao.checkpoint()
+            copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
+            self._replace_pub_db(temp_pub_db_file_name)
+        except OSError:
+            if os.path.exists(temp_pub_db_file_name):
+                os.remove(temp_pub_db_file_name)
+            raise
+
+    def _mk_temp_pub_db(self) -> str:
+        """Return a new temporary file to build a public database in.
+
+        Use temporary file to ensure that we do not end up with a
+        partial file.
+        """
         temp_pub_db_fd, temp_pub_db_file_name = mkstemp(
             prefix=self.pub_dao.DB_FILE_BASE_NAME,
             dir=os.path.dirname(self.pub_dao.db_file_name)
         )
         os.close(temp_pub_db_fd)
+        return temp_pub_db_file_name
+
+    def _replace_pub_db(self, temp_pub_db_file_name: str) -> None:
+        """Replace the public database file with a temporary copy.
+
+        If an external connection is locking the old public db, it will
+        still be connected to its inode, but should no longer affect future
+        accesses (hopefully that process will soon recover to give up
+        the lock).
+        """
+        # Create the file if it didn't exist; this is done in the hope of
+        # addressing potential NFS file lag, we think
+        open(self.pub_dao.db_file_name, "a").close()  # noqa: SIM115
+        # Get default permissions level for public db:
+        st_mode = os.stat(self.pub_dao.db_file_name).st_mode
+        if self.pri_dao.persistent:
+            # Don't pass write-ahead logging on to the public database,
+            # it would require readers to have write access to its
+            # directory.
+            with CylcWorkflowDAO(temp_pub_db_file_name) as temp_dao:
+                temp_dao.connect().execute("PRAGMA journal_mode=DELETE")
+        os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
+        os.chmod(self.pub_dao.db_file_name, st_mode)
+
+    def _start_pub_recovery(self) -> bool:
+        """Start rebuilding the public database in a background thread.
+
+        This takes a snapshot of the private database and copies it into a
+        temporary file using the SQLite backup API, so the main loop is not
+        stalled while copying (large) database files. Writes to the public
+        database are queued up until the copy is complete, then applied on
+        top of it (see _finish_pub_recovery).
+
+        Returns False if the snapshot could not be taken.
+        """
         try:
-            # Create the file if it didn't exist; this is done in the hope of
-            # addressing potential NFS file lag, we think
-            open(self.pub_dao.db_file_name, "a").close()  # noqa: SIM115
-            # Get default permissions level for public db:
-            st_mode = os.stat(self.pub_dao.db_file_name).st_mode
+            snapshot = self.pri_dao.open_snapshot()
+        except SQLiteError as exc:
+            LOG.warning(
+                f"{self.pri_dao.db_file_name}: could not open snapshot: {exc}"
+            )
+            return False
+        self.pub_dao.close()
+        # Everything queued for the public database so far has been
+        # written to the private database, so is in the snapshot.
+        self.pub_dao.clear_queued_items()
+        self._pub_recovery = PubDBRecovery(snapshot, self._mk_temp_pub_db())
+        self._pub_recovery.start()
+        return True
 
-            copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
-            os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
-            os.chmod(self.pub_dao.db_file_name, st_mode)
-        except OSError:
-            if os.path.exists(temp_pub_db_file_name):
-                os.remove(temp_pub_db_file_name)
-            raise
+    def _finish_pub_recovery(self, wait: bool = False) -> None:
+        """Install the rebuilt public database if the copy is complete.
+
+        Args:
+            wait: Wait for the copy to complete.
+        """
+        if self._pub_recovery is None:
+            return
+        if wait:
+            self._pub_recovery.join()
+        elif self._pub_recovery.is_alive():
+            return
+        recovery, self._pub_recovery = self._pub_recovery, None
+        try:
+            if recovery.exc is not None:
+                raise recovery.exc
+            self._replace_pub_db(recovery.temp_pub_db_file_name)
+        except (OSError, SQLiteError) as exc:
+            if os.path.exists(recovery.temp_pub_db_file_name):
+                os.remove(recovery.temp_pub_db_file_name)
+            # the queued writes are lost, fall back to copying the file
+            LOG.warning(
+                f"{self.pub_dao.db_file_name}: could not recover from"
+                f" {self.pri_dao.db_file_name} in the background: {exc}"
+            )
+            self.copy_pri_to_pub()
+        LOG.warning(
+            f"{self.pub_dao.db_file_name}: recovered from "
+            f"{self.pri_dao.db_file_name}")
+        self.pub_dao.n_tries = 0
 
     def get_pri_dao(self) -> CylcWorkflowDAO:
         """Return the primary DAO.
@@ -220,12 +486,19 @@ class WorkflowDatabaseManager:
         else:
             return json.dumps([type(obj).__name__, obj.__getnewargs__()])
 
-    def on_workflow_start(self, is_restart: bool) -> None:
+    def on_workflow_start(
+        self, is_restart: bool, persistent: bool = False
+    ) -> None:
         """Initialise data access objects.
 
         Ensure that:
         * private database file is private
         * public database is in sync with private database
+
+        Args:
+            is_restart: Whether this is a restart.
+            persistent: Keep the private database connection open for the
+                lifetime of the scheduler (see CylcWorkflowDAO).
         """
         if not is_restart:
             try:
@@ -236,13 +509,21 @@ class WorkflowDatabaseManager:
                 # ... however, in case there is a directory at the path for
                 # some bizarre reason:
                 rmtree(self.pri_path, ignore_errors=True)
-        self.pri_dao = self.get_pri_dao()
+        self.pri_dao = CylcWorkflowDAO(
+            self.pri_path, create_tables=True, persistent=persistent
+        )
         os.chmod(self.pri_path, PERM_PRIVATE)
+        self.task_history.set_db_cycles(
+            self.pri_dao.select_task_history_cycles() if is_restart else set()
+        )
         self.pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
         self.copy_pri_to_pub()
 
     def on_workflow_shutdown(self):
         """Close data access objects."""
+        if self._pub_recovery is not None:
+            self._finish_pub_recovery(wait=True)
+            self.pub_dao.execute_queued_items()
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -251,9 +532,49 @@ class WorkflowDatabaseManager:
             self.pub_dao = None
 
     def process_queued_ops(self) -> None:
-        """Handle queued db operations for each task proxy."""
+        """Handle queued db operations for each task proxy.
+
+        This writes and commits all queued (and flushed) operations, it is
+        called once per main loop iteration (see also flush_queued_ops).
+        """
+        if self.pri_dao is None or self.pub_dao is None:
+            return
+        self._queue_ops()
+
+        # Previously, we used a separate thread for database writes. This has
+        # now been removed. For the private database, there is no real
+        # advantage in using a separate thread as it needs to be always in sync
+        # with what is current. For the public database, which does not need to
+        # be fully in sync, there is some advantage of using a separate
+        # thread/process, if writing to it becomes a bottleneck. At the moment,
+        # there is no evidence that this is a bottleneck, so it is better to
+        # keep the logic simple.
+        self.pri_dao.execute_queued_items()
+        self.task_history.flushed()
+        if self._pub_recovery is None:
+            self.pub_dao.execute_queued_items()
+
+    def flush_queued_ops(self) -> None:
+        """Write queued db operations without committing them.
+
+        Use this (rather than process_queued_ops) where subsequent database
+        selects need to see the changes, e.g. after removing a task. The
+        changes are visible to selects on the private database connection,
+        but are not committed until the next call to process_queued_ops at
+        the end of the main loop iteration, which avoids committing (and
+        syncing the database files) many times per iteration.
+        """
         if self.pri_dao is None or self.pub_dao is None:
             return
+        self._queue_ops()
+        self.pri_dao.execute_queued_items(commit=False)
+        self.task_history.flushed()
+        # (also flush to the public database to preserve statement order)
+        if self._pub_recovery is None:
+            self.pub_dao.execute_queued_items(commit=False)
+
+    def _queue_ops(self) -> None:
+        """Pass queued db operations to the data access objects."""
         # Record workflow parameters and tasks in pool
         # Record any broadcast settings to be dumped out
         if any(self.db_deletes_map.values()):
@@ -275,17 +596,6 @@ class WorkflowDatabaseManager:
                     self.pri_dao.add_update_item(table_name, db_update)
                     self.pub_dao.add_update_item(table_name, db_update)
 
-        # Previously, we used a separate thread for database writes. This has
-        # now been removed. For the private database, there is no real
-        # advantage in using a separate thread as it needs to be always in sync
-        # with what is current. For the public database, which does not need to
-        # be fully in sync, there is some advantage of using a separate
-        # thread/process, if writing to it becomes a bottleneck. At the moment,
-        # there is no evidence that this is a bottleneck, so it is better to
-        # keep the logic simple.
-        self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
-
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
         now = get_current_time_string(display_sub_seconds=True)
@@ -419,6 +729,8 @@ class WorkflowDatabaseManager:
         """Put statements to update the task_action_timers table."""
         if task_events_mgr.event_timers_updated:
             self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # (task pool action timers must be written again)
+            self._task_action_timer_rows = {}
             id_key: 'EventKey'
             for id_key, timer in task_events_mgr._event_timers.items():
                 key1 = (id_key.handler, id_key.event)
@@ -467,6 +779,7 @@ class WorkflowDatabaseManager:
         self.db_updates_map[self.TABLE_TASK_STATES].append(
             (set_args, where_args)
         )
+        self.task_history.task_changed(itask.tdef.name, str(itask.point))
 
     def put_update_task_flow_wait(self, itask):
         """Update flow_wait status of a task, in the task_states table.
@@ -486,82 +799,65 @@ class WorkflowDatabaseManager:
         }
         self.db_updates_map[self.TABLE_TASK_STATES].append(
             (set_args, where_args))
+        self.task_history.task_changed(itask.tdef.name, str(itask.point))
 
     def put_task_pool(self, pool: 'TaskPool') -> None:
-        """Delete task pool table content and recreate from current task pool.
+        """Update task pool table content from current task pool.
 
-        Also recreate:
+        Also update:
         - prerequisites table
         - timeout timers table
         - action timers table
-
-        And update:
         - task states table
+
+        The first call recreates these tables (other than task states) in
+        full. Subsequent calls only write the rows of tasks which have
+        changed since the previous call, and delete the rows of tasks which
+        have left the pool.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        # Comment this out to retain the trigger-time prereq status of past
-        # tasks (but then the prerequisite table will grow indefinitely):
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # This should already be done by self.put_task_event_timers above:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        full_rewrite = self._task_pool_rows is None
+        if full_rewrite:
+            self.db_deletes_map[self.TABLE_TASK_POOL].append({})
+            # Comment this out to retain the trigger-time prereq status of
+            # past tasks (but then the prerequisite table will grow
+            # indefinitely):
+            self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
+            # This should already be done by self.put_task_event_timers:
+            # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        prev_task_pool_rows = self._task_pool_rows or {}
+        prev_action_timer_rows = self._task_action_timer_rows
+        self._task_pool_rows = {}
+        self._task_action_timer_rows = {}
         for itask in pool.get_tasks():
-            for prereq in itask.state.prerequisites:
-                for (p_cycle, p_name, p_output), satisfied_state in (
-                    prereq.items()
-                ):
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": p_name,
-                        "prereq_cycle": p_cycle,
-                        "prereq_output": p_output,
-                        "satisfied": satisfied_state
-                    })
-            for x_label, x_satisfied in itask.state.xtriggers.items():
-                if x_satisfied:
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": x_label,
-                        "prereq_cycle": XTRIGGER_PREREQ_PREFIX,
-                        "prereq_output": TASK_OUTPUT_SUCCEEDED,
-                        "satisfied": True
-                    })
-
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_nums": serialise_set(itask.flow_nums),
-                "status": itask.state.status,
-                "is_held": itask.state.is_held
-            })
-            if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout
-                })
-            if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
-                    "ctx": self._namedtuple2json(itask.poll_timer.ctx),
-                    "delays": json.dumps(itask.poll_timer.delays),
-                    "num": itask.poll_timer.num,
-                    "delay": itask.poll_timer.delay,
-                    "timeout": itask.poll_timer.timeout
-                })
-            for ctx_key_1, timer in itask.try_timers.items():
-                if timer is None:
-                    continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
-                    "ctx": self._namedtuple2json(timer.ctx),
-                    "delays": json.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout
-                })
+            key = (itask.tdef.name, str(itask.point))
+
+            rows = self._get_task_pool_rows(itask)
+            self._task_pool_rows[key] = rows
+            if rows != prev_task_pool_rows.get(key):
+                if key in prev_task_pool_rows:
+                    self._delete_task_pool_rows(*key)
+                pool_row, prereq_rows, timeout_row = rows
+                self.db_inserts_map[self.TABLE_TASK_POOL].append(
+                    dict(pool_row)
+                )
+                for prereq_row in prereq_rows:
+                    # (copy, the args are updated in place)
+                    self.put_insert_task_prerequisites(
+                        itask, dict(prereq_row)
+                    )
+                if timeout_row is not None:
+                    self.db_inserts_map[
+                        self.TABLE_TASK_TIMEOUT_TIMERS
+                    ].append(dict(timeout_row))
+
+            action_timer_rows = self._get_task_action_timer_rows(itask)
+            self._task_action_timer_rows[key] = action_timer_rows
+            if action_timer_rows != prev_action_timer_rows.get(key):
+                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].extend(
+                    dict(row) for row in action_timer_rows
+                )
+
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -578,8 +874,98 @@ class WorkflowDatabaseManager:
                 self.db_updates_map[self.TABLE_TASK_STATES].append(
                     (set_args, where_args)
                 )
+                self.task_history.task_changed(
+                    itask.tdef.name, str(itask.point)
+                )
                 itask.state.time_updated = None
 
+        for key in prev_task_pool_rows.keys() - self._task_pool_rows.keys():
+            self._delete_task_pool_rows(*key)
+
+    def _delete_task_pool_rows(self, name: str, cycle: str) -> None:
+        """Put DELETE statements for a task's rows in the task pool tables.
+
+        (I.e. the tables recreated by put_task_pool).
+        """
+        for table_name in (
+            self.TABLE_TASK_POOL,
+            self.TABLE_TASK_PREREQUISITES,
+            self.TABLE_TASK_TIMEOUT_TIMERS,
+        ):
+            self.db_deletes_map[table_name].append(
+                {"name": name, "cycle": cycle}
+            )
+
+    @staticmethod
+    def _get_task_pool_rows(itask: 'TaskProxy') -> tuple:
+        """Return a task's task_pool, task_prerequisites and
+        task_timeout_timers rows (for put_task_pool)."""
+        prereq_rows: List[DbArgDict] = []
+        for prereq in itask.state.prerequisites:
+            for (p_cycle, p_name, p_output), satisfied_state in (
+                prereq.items()
+            ):
+                prereq_rows.append({
+                    "prereq_name": p_name,
+                    "prereq_cycle": p_cycle,
+                    "prereq_output": p_output,
+                    "satisfied": satisfied_state
+                })
+        for x_label, x_satisfied in itask.state.xtriggers.items():
+            if x_satisfied:
+                prereq_rows.append({
+                    "prereq_name": x_label,
+                    "prereq_cycle": XTRIGGER_PREREQ_PREFIX,
+                    "prereq_output": TASK_OUTPUT_SUCCEEDED,
+                    "satisfied": True
+                })
+        pool_row: DbArgDict = {
+            "name": itask.tdef.name,
+            "cycle": str(itask.point),
+            "flow_nums": serialise_set(itask.flow_nums),
+            "status": itask.state.status,
+            "is_held": itask.state.is_held
+        }
+        timeout_row: Optional[DbArgDict] = None
+        if itask.timeout is not None:
+            timeout_row = {
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "timeout": itask.timeout
+            }
+        return pool_row, prereq_rows, timeout_row
+
+    def _get_task_action_timer_rows(
+        self, itask: 'TaskProxy'
+    ) -> List['DbArgDict']:
+        """Return a task's poll and retry timer rows (for put_task_pool)."""
+        rows: List[DbArgDict] = []
+        if itask.poll_timer is not None:
+            rows.append({
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "ctx_key": json.dumps("poll_timer"),
+                "ctx": self._namedtuple2json(itask.poll_timer.ctx),
+                "delays": json.dumps(itask.poll_timer.delays),
+                "num": itask.poll_timer.num,
+                "delay": itask.poll_timer.delay,
+                "timeout": itask.poll_timer.timeout
+            })
+        for ctx_key_1, timer in itask.try_timers.items():
+            if timer is None:
+                continue
+            rows.append({
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "ctx_key": json.dumps(("try_timers", ctx_key_1)),
+                "ctx": self._namedtuple2json(timer.ctx),
+                "delays": json.dumps(timer.delays),
+                "num": timer.num,
+                "delay": timer.delay,
+                "timeout": timer.timeout
+            })
+        return rows
+
     def put_tasks_to_hold(
         self, tasks: Set[Tuple[str, 'PointBase']]
     ) -> None:
@@ -673,6 +1059,10 @@ class WorkflowDatabaseManager:
         })
         args.setdefault("submit_num", itask.submit_num)
         self.db_inserts_map.setdefault(table_name, []).append(args)
+        if table_name in {self.TABLE_TASK_STATES, self.TABLE_TASK_OUTPUTS}:
+            self.task_history.task_changed(
+                itask.tdef.name, str(itask.point), itask.point
+            )
 
     def put_update_task_jobs(self, itask: 'TaskProxy', set_args: dict) -> None:
         """Put UPDATE statement for task_jobs table."""
@@ -696,6 +1086,7 @@ class WorkflowDatabaseManager:
         self.db_updates_map[self.TABLE_TASK_OUTPUTS].append(
             (set_args, where_args)
         )
+        self.task_history.task_changed(itask.tdef.name, str(itask.point))
 
     def _put_update_task_x(
         self, table_name: str, itask: 'TaskProxy', set_args: 'DbArgDict'
@@ -791,12 +1182,126 @@ class WorkflowDatabaseManager:
             self.db_updates_map[table].append(
                 (stmt, params)
             )
+        self.task_history.task_changed(name, point)
 
         return removed_flow_nums
 
+    def select_prev_instances(
+        self, name: str, point: 'PointBase'
+    ) -> List[Tuple[int, bool, Set[int], str]]:
+        """Select task_states info about previous instances of a task.
+
+        Uses the task history cache in front of the private database.
+        See CylcWorkflowDAO.select_prev_instances.
+        """
+        cycle = str(point)
+        rows = self.task_history.get_states(name, cycle, point)
+        if rows is None:
+            rows = self.pri_dao.select_prev_instances(name, cycle)
+            self.task_history.put_states(name, cycle, point, rows)
+        return rows
+
+    def select_task_outputs(
+        self, name: str, point: 'PointBase'
+    ) -> 'Dict[str, FlowNums]':
+        """Select task outputs for each flow of a task.
+
+        Uses the task history cache in front of the private database.
+        See CylcWorkflowDAO.select_task_outputs.
+        """
+        cycle = str(point)
+        rows = self.task_history.get_outputs(name, cycle, point)
+        if rows is None:
+            rows = self.pri_dao.select_task_outputs(name, cycle)
+            self.task_history.put_outputs(name, cycle, point, rows)
+        return rows
+
+    def select_prev_instances_for_tasks(
+        self, tasks: 'Iterable[Tuple[str, PointBase]]'
+    ) -> Dict[Tuple[str, str], List[Tuple[int, bool, Set[int], str]]]:
+        """Select task_states info about previous instances of many tasks.
+
+        Uses the task history cache in front of the private database, tasks
+        which miss the cache are selected in bulk.
+        See CylcWorkflowDAO.select_prev_instances_for_tasks.
+        """
+        ret: Dict[
+            Tuple[str, str], List[Tuple[int, bool, Set[int], str]]
+        ] = {}
+        misses: Dict[Tuple[str, str], 'PointBase'] = {}
+        for name, point in tasks:
+            cycle = str(point)
+            rows = self.task_history.get_states(name, cycle, point)
+            if rows is None:
+                misses[(name, cycle)] = point
+            else:
+                ret[(name, cycle)] = rows
+        if misses:
+            for (name, cycle), rows in (
+                self.pri_dao.select_prev_instances_for_tasks(misses).items()
+            ):
+                self.task_history.put_states(
+                    name, cycle, misses[(name, cycle)], rows
+                )
+                ret[(name, cycle)] = rows
+        return ret
+
+    def select_task_outputs_for_tasks(
+        self, tasks: 'Iterable[Tuple[str, PointBase]]'
+    ) -> 'Dict[Tuple[str, str], Dict[str, FlowNums]]':
+        """Select task outputs for each flow of many tasks.
+
+        Uses the task history cache in front of the private database, tasks
+        which miss the cache are selected in bulk.
+        See CylcWorkflowDAO.select_task_outputs_for_tasks.
+        """
+        ret: 'Dict[Tuple[str, str], Dict[str, FlowNums]]' = {}
+        misses: Dict[Tuple[str, str], 'PointBase'] = {}
+        for name, point in tasks:
+            cycle = str(point)
+            rows = self.task_history.get_outputs(name, cycle, point)
+            if rows is None:
+                misses[(name, cycle)] = point
+            else:
+                ret[(name, cycle)] = rows
+        if misses:
+            for (name, cycle), rows in (
+                self.pri_dao.select_task_outputs_for_tasks(misses).items()
+            ):
+                self.task_history.put_outputs(
+                    name, cycle, misses[(name, cycle)], rows
+                )
+                ret[(name, cycle)] = rows
+        return ret
+
+    def check_pri_db_exists(self) -> None:
+        """Raise an error if the private database file has been removed.
+
+        Non-persistent connections reconnect for each transaction, which
+        fails if the workflow run directory has been removed. A persistent
+        connection would carry on regardless, so check the file instead.
+        """
+        if (
+            self.pri_dao is not None
+            and self.pri_dao.persistent
+            and not os.path.exists(self.pri_path)
+        ):
+            raise CylcError(
+                f'Workflow database file does not exist: {self.pri_path}'
+            )
+
     def recover_pub_from_pri(self):
-        """Recover public database from private database."""
-        if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
+        """Recover public database from private database.
+
+        If the private database connection is persistent, the public
+        database is rebuilt in the background, otherwise the private
+        database file is copied over it.
+        """
+        if self._pub_recovery is not None:
+            self._finish_pub_recovery()
+        elif self.pub_dao.n_tries < self.pub_dao.MAX_TRIES:
+            return
+        elif not (self.pri_dao.persistent and self._start_pub_recovery()):
             self.copy_pri_to_pub()
             LOG.warning(
                 f"{self.pub_dao.db_file_name}: recovered from "
@@ -897,6 +1402,17 @@ class WorkflowDatabaseManager:
         )
         conn.commit()
 
+    @staticmethod
+    def upgrade_indexes(pri_dao: CylcWorkflowDAO) -> None:
+        """Add any secondary indexes missing from an older database.
+
+        See CylcWorkflowDAO.INDEXES.
+        """
+        created = pri_dao.create_indexes()
+        if created:
+            LOG.info(f"DB upgrade: add indexes {', '.join(created)}")
+            pri_dao.connect().commit()
+
     @classmethod
     def upgrade(cls, db_file: Union['Path', str]) -> None:
         """Upgrade this database to this Cylc version.
@@ -907,6 +1423,7 @@ class WorkflowDatabaseManager:
                 cls.upgrade_pre_803(pri_dao)
             if last_run_ver < parse_version("8.1.0.dev"):
                 cls.upgrade_pre_810(pri_dao)
+            cls.upgrade_indexes(pri_dao)
 
     @classmethod
     def check_db_compatibility(cls, db_file: Union['Path', str]) -> 'Version':
@@ -774,6 +774,7 @@ class XtriggerManager:
         self.sat_xtrig[sig] = results
 
         self.do_housekeeping = True
+        self.schd.wake_up()
 
     def force_satisfy(
         self,
@@ -16,6 +16,8 @@
 
 import asyncio
 
+from cylc.flow import commands
+from cylc.flow.id import TaskTokens
 from cylc.flow.network.subscriber import (
     WorkflowSubscriber,
     process_delta_msg,
@@ -46,3 +48,94 @@ async def test_publisher(flow, scheduler, run, one_conf, port_range):
                 break
         else:
             raise Exception("Delta wasn't added or updated")
+
+
+async def test_filtered_deltas(flow, scheduler, run, one_conf, port_range):
+    """It should publish filtered deltas on the registered topic."""
+    id_ = flow(one_conf)
+    schd = scheduler(id_)
+    async with run(schd):
+        topic = schd.server.register_delta_filter(
+            ['task_proxies'], ids=['1/one'], fields=['is_held']
+        ).encode('utf-8')
+        # the same filter gives the same topic
+        assert schd.server.register_delta_filter(
+            ['task_proxies'], ids=['1/one'], fields=['is_held']
+        ).encode('utf-8') == topic
+        subscriber = WorkflowSubscriber(
+            schd.workflow,
+            host=schd.host,
+            port=schd.server.pub_port,
+            topics=[topic]
+        )
+
+        # wait for the subscription to reach the publisher
+        async with asyncio.timeout(5):
+            while topic not in schd.data_store_mgr.delta_filter_topics:
+                await asyncio.sleep(0.1)
+
+        schd.pool.hold_tasks({TaskTokens('1', 'one')})
+        await schd.update_data_structure()
+        async with asyncio.timeout(2):
+            btopic, msg = await subscriber.socket.recv_multipart()
+        assert btopic == topic
+        _, delta = process_delta_msg(btopic, msg, None)
+        assert [f.name for f, _ in delta.ListFields()] == ['task_proxies']
+        (task_proxy,) = delta.task_proxies.updated
+        assert {f.name for f, _ in task_proxy.ListFields()} == {
+            'id', 'stamp', 'is_held'
+        }
+        assert task_proxy.is_held
+
+        # filtering stops when there are no subscribers
+        subscriber.stop(stop_loop=False)
+        async with asyncio.timeout(5):
+            while topic in schd.data_store_mgr.delta_filter_topics:
+                await asyncio.sleep(0.1)
+        # and the filter is dropped
+        assert topic not in schd.data_store_mgr.delta_filters
+
+
+async def test_filtered_deltas_reload(
+    flow, scheduler, run, one_conf, port_range
+):
+    """Filtered delta topics should survive a reload."""
+    id_ = flow(one_conf)
+    schd = scheduler(id_)
+    async with run(schd):
+        topic = schd.server.register_delta_filter(
+            ['task_proxies'], ids=['1/one'], fields=['is_held']
+        ).encode('utf-8')
+        subscriber = WorkflowSubscriber(
+            schd.workflow,
+            host=schd.host,
+            port=schd.server.pub_port,
+            topics=[topic]
+        )
+        async with asyncio.timeout(5):
+            while topic not in schd.data_store_mgr.delta_filter_topics:
+                await asyncio.sleep(0.1)
+
+        await commands.run_cmd(commands.reload_workflow(schd))
+        assert topic in schd.data_store_mgr.delta_filters
+        assert topic in schd.data_store_mgr.delta_filter_topics
+
+        # the reload delta is published on the filtered topic
+        await schd.update_data_structure()
+        async with asyncio.timeout(2):
+            btopic, msg = await subscriber.socket.recv_multipart()
+        assert btopic == topic
+
+        # as are subsequent deltas
+        schd.pool.hold_tasks({TaskTokens('1', 'one')})
+        await schd.update_data_structure()
+        async with asyncio.timeout(2):
+            while True:
+                btopic, msg = await subscriber.socket.recv_multipart()
+                _, delta = process_delta_msg(btopic, msg, None)
+                if any(
+                    task_proxy.is_held
+                    for task_proxy in delta.task_proxies.updated
+                ):
+                    break
+        subscriber.stop(stop_loop=False)
@@ -15,11 +15,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
+from threading import Event
 
 import pytest
 
 from cylc.flow import __version__ as CYLC_VERSION
-from cylc.flow.network import deserialize
+from cylc.flow.network import (
+    JSON,
+    MSGPACK,
+    deserialize,
+)
 from cylc.flow.network.client import WorkflowRuntimeClient
 from cylc.flow.scheduler import Scheduler
 
@@ -48,3 +53,49 @@ async def test_listener(one: Scheduler, start):
         one.server.replier.queue.put('foobar')
         with pytest.raises(ValueError):
             one.server.replier.listener()
+
+
+async def test_read_only_requests(one: Scheduler, start):
+    """Slow read-only requests should not hold up other requests."""
+    async with start(one):
+        release = Event()
+
+        def pb_entire_workflow(**_kwargs):
+            release.wait(5)
+            return b'entire workflow'
+
+        pb_entire_workflow.exposed = True  # type: ignore[attr-defined]
+        pb_entire_workflow.read_only = True  # type: ignore[attr-defined]
+        one.server.pb_entire_workflow = pb_entire_workflow  # type: ignore
+
+        slow_client = WorkflowRuntimeClient(one.workflow)
+        client = WorkflowRuntimeClient(one.workflow)
+        slow_request = asyncio.create_task(
+            slow_client.async_request('pb_entire_workflow')
+        )
+        async with asyncio.timeout(2):
+            # other requests are served whilst the slow request is pending
+            assert 'pb_entire_workflow' in await client.async_request('api')
+        assert not slow_request.done()
+
+        release.set()
+        async with asyncio.timeout(2):
+            assert await slow_request == b'entire workflow'
+
+
+async def test_encoding(one: Scheduler, start):
+    """Clients switch to msgpack if the server responds with it."""
+    pytest.importorskip('msgpack')
+    async with start(one):
+        client = WorkflowRuntimeClient(one.workflow)
+        assert client.encoding == JSON
+        assert 'graphql' in await client.async_request('api')
+        assert client.encoding == MSGPACK
+        # requests are now sent as msgpack
+        assert 'graphql' in await client.async_request('api')
+
+        # clients which don't accept msgpack (e.g. older versions) get JSON
+        client = WorkflowRuntimeClient(one.workflow)
+        del client.header['meta']['accept']
+        assert 'graphql' in await client.async_request('api')
+        assert client.encoding == JSON
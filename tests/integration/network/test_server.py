@@ -15,12 +15,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
+from hashlib import sha256
 import logging
 from typing import Callable
 
 import pytest
 
-from cylc.flow import __version__ as CYLC_VERSION
+from cylc.flow import (
+    CYLC_LOG,
+    __version__ as CYLC_VERSION,
+)
+from cylc.flow.network.graphql import execute_async
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.scheduler import Scheduler
 
@@ -63,6 +68,87 @@ def test_graphql_error(myflow):
         assert "Cannot query field 'alsonotafield'" in excinfo
 
 
+def test_graphql_persisted_query(myflow):
+    """Test GraphQL endpoint method with persisted queries."""
+    request_string = 'query { workflows { id } }'
+    query_hash = sha256(request_string.encode()).hexdigest()
+
+    # unknown hash
+    with pytest.raises(ValueError, match='PersistedQueryNotFound'):
+        myflow.server.graphql(query_hash=query_hash)
+
+    # hash mismatch
+    with pytest.raises(ValueError, match='does not match'):
+        myflow.server.graphql(
+            request_string='query { workflows { name } }',
+            query_hash=query_hash,
+        )
+
+    # persist the query
+    data = myflow.server.graphql(request_string, query_hash=query_hash)
+    assert myflow.id == data['workflows'][0]['id']
+
+    # send the hash only
+    data = myflow.server.graphql(query_hash=query_hash)
+    assert myflow.id == data['workflows'][0]['id']
+
+
+def test_graphql_persisted_query_not_found(myflow, caplog):
+    """Persisted query misses should not be logged as errors."""
+    caplog.set_level(logging.DEBUG, logger=CYLC_LOG)
+    res = myflow.server.receiver({
+        'command': 'graphql',
+        'args': {'query_hash': sha256(b'query { foo }').hexdigest()},
+    })
+    assert res['error'] == {'message': 'PersistedQueryNotFound'}
+    assert not [
+        record for record in caplog.records
+        if record.levelno > logging.DEBUG
+    ]
+
+
+def test_graphql_data_store_lock(myflow, monkeypatch):
+    """GraphQL requests should be executed under the data store lock."""
+    locked = []
+
+    async def _execute_async(*args, **kwargs):
+        locked.append(myflow.data_store_mgr.lock.locked())
+        return await execute_async(*args, **kwargs)
+
+    monkeypatch.setattr(
+        'cylc.flow.network.server.execute_async', _execute_async
+    )
+    data = myflow.server.graphql(
+        f'query {{ workflows(ids: ["{myflow.id}"]) {{ id }} }}'
+    )
+    assert myflow.id == data['workflows'][0]['id']
+    assert locked == [True]
+    assert not myflow.data_store_mgr.lock.locked()
+
+
+def test_register_delta_filter_limit(myflow, monkeypatch):
+    """The oldest delta filters without subscribers should be dropped."""
+    data_store_mgr = myflow.data_store_mgr
+    monkeypatch.setattr(data_store_mgr, 'delta_filters', {})
+    monkeypatch.setattr(myflow.server, 'MAX_DELTA_FILTERS', 2)
+    topics = [
+        myflow.server.register_delta_filter([element_type])
+        for element_type in ('tasks', 'jobs', 'edges')
+    ]
+    assert [topic.encode() for topic in topics[1:]] == list(
+        data_store_mgr.delta_filters
+    )
+
+    # filters with subscribers are kept
+    monkeypatch.setattr(
+        data_store_mgr,
+        'delta_filter_topics',
+        frozenset(data_store_mgr.delta_filters),
+    )
+    with pytest.raises(ValueError, match='Too many delta filters'):
+        myflow.server.register_delta_filter(['families'])
+
+
 def test_pb_data_elements(myflow):
     """Test Protobuf elements endpoint method."""
     element_type = 'workflow'
@@ -82,6 +168,66 @@ def test_pb_entire_workflow(myflow):
     assert data.workflow.id == myflow.id
 
 
+async def test_put_messages(one: Scheduler, start, log_filter):
+    """Test the task message endpoint method."""
+    async with start(one):
+        res = one.server.receiver({
+            'command': 'put_messages',
+            'args': {
+                'job_messages': [
+                    ['1/one/01', '2077', [['INFO', 'started']]],
+                    ['1/one/02', '2078', [['INFO', 'x'], ['WARNING', 'y']]],
+                ],
+            },
+        })
+        assert res['data'] == (True, 'Messages queued: 3')
+        messages = []
+        while one.message_queue.qsize():
+            messages.append(one.message_queue.get())
+        assert [
+            (msg.job_id.relative_id, msg.event_time, msg.severity, msg.message)
+            for msg in messages
+        ] == [
+            ('1/one/01', '2077', 'INFO', 'started'),
+            ('1/one/02', '2078', 'INFO', 'x'),
+            ('1/one/02', '2078', 'WARNING', 'y'),
+        ]
+        assert not log_filter(contains='Command "put_messages" received')
+
+        # messages from other users should be logged
+        one.server.put_messages(
+            [['1/one/01', '2077', [['INFO', 'started']]]],
+            meta={'auth_user': 'Dr Spock'},
+        )
+        assert log_filter(
+            contains='Command "put_messages" received from Dr Spock'
+        )
+
+
+@pytest.mark.parametrize(
+    'job_messages',
+    [
+        pytest.param([['1/one/01', '2077', [['INFO', 5]]]], id='message'),
+        pytest.param([['1/one/01', '2077', [['INFO']]]], id='message-len'),
+        pytest.param([['1/one/01', 2077, [['INFO', 'x']]]], id='event-time'),
+        pytest.param([['1/one', '2077', [['INFO', 'x']]]], id='job-id'),
+        pytest.param([['1/one/01', '2077']], id='job-messages'),
+    ]
+)
+async def test_put_messages_invalid(one: Scheduler, start, job_messages):
+    """Invalid batches of messages should be rejected outright."""
+    async with start(one):
+        outcome, reason = one.server.put_messages([
+            # a valid entry ahead of the invalid one
+            ['1/one/01', None, [['INFO', 'started']]],
+            *job_messages,
+        ])
+        assert outcome is False
+        assert reason.startswith('Invalid')
+        # nothing should have been queued
+        assert not one.message_queue.qsize()
+
+
 async def test_stop(one: Scheduler, start):
     """Test stop."""
     async with start(one):
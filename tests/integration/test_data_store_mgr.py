@@ -26,22 +26,29 @@ from unittest.mock import Mock
 import pytest
 
 from cylc.flow import LOG
+from cylc.flow.columnar_store import ColumnarStore
 from cylc.flow.commands import (
     force_trigger_tasks,
     run_cmd,
 )
 from cylc.flow.data_messages_pb2 import (
+    PbFamilyProxy,
     PbJob,
     PbPrerequisite,
     PbTaskProxy,
 )
 from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    CHECKSUM_ATTRS,
+    DELTAS_MAP,
     EDGES,
     FAMILY_PROXIES,
     JOBS,
     TASK_PROXIES,
     TASKS,
     WORKFLOW,
+    generate_checksum,
+    generate_rolling_checksum,
 )
 from cylc.flow.id import (
     TaskTokens,
@@ -61,6 +68,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
     TASK_STATUS_PREPARING,
     TASK_STATUS_RUNNING,
+    TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUCCEEDED,
     TASK_STATUS_WAITING,
 )
@@ -273,8 +281,11 @@ def test_initiate_data_model(mod_harness):
     schd: Scheduler
     schd, data = mod_harness
     assert len(data[WORKFLOW].task_proxies) == 2
+    lock = schd.data_store_mgr.lock
     schd.data_store_mgr.initiate_data_model(reloaded=True)
     assert len(data[WORKFLOW].task_proxies) == 2
+    # Check the lock is preserved on reload (server threads may hold it):
+    assert schd.data_store_mgr.lock is lock
     # Check n-window preserved on reload:
     schd.data_store_mgr.set_graph_window_extent(2)
     schd.data_store_mgr.update_data_structure()
@@ -512,6 +523,127 @@ async def test_prune_data_store(flow, scheduler, start):
         }) == 0
 
 
+async def test_delta_checksum(flow, scheduler, start):
+    """The rolling delta checksums should match a full recalculation as
+    elements are added, updated and pruned.
+
+    The original checksum should still be published for older peers."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => bar => baz'
+            }
+        },
+    })
+    schd = scheduler(id_)
+
+    def assert_checksums():
+        data = schd.data_store_mgr.data[schd.data_store_mgr.workflow_id]
+        for key, s_att in CHECKSUM_ATTRS.items():
+            strings = [getattr(e, s_att) for e in data[key].values()]
+            expected = generate_rolling_checksum(strings)
+            assert schd.data_store_mgr.rolling_checksums[key] == expected
+            for topic, delta_msg in schd.data_store_mgr.publish_deltas:
+                if topic == key.encode('utf-8'):
+                    delta = DELTAS_MAP[key]()
+                    delta.ParseFromString(delta_msg)
+                    assert delta.rolling_checksum == expected
+                    assert delta.checksum == generate_checksum(strings)
+
+    async with start(schd):
+        await schd.update_data_structure()
+        assert_checksums()
+
+        # update
+        for itask in schd.pool.get_tasks():
+            itask.state.reset(TASK_STATUS_FAILED)
+            schd.data_store_mgr.delta_task_state(itask)
+        await schd.update_data_structure()
+        assert_checksums()
+
+        # add
+        schd.data_store_mgr.set_graph_window_extent(2)
+        await schd.update_data_structure()
+        assert_checksums()
+
+        # prune
+        schd.data_store_mgr.set_graph_window_extent(0)
+        await schd.update_data_structure()
+        assert_checksums()
+
+
+async def test_get_publish_deltas(mod_harness):
+    """The all-deltas message should be assembled from the serialised
+    per-type deltas."""
+    schd, _ = mod_harness
+    for itask in schd.pool.get_tasks():
+        schd.data_store_mgr.delta_task_held(itask.tdef.name, itask.point, True)
+    schd.data_store_mgr.batch_deltas()
+    publish_deltas = schd.data_store_mgr.get_publish_deltas()
+    topics = [topic.decode('utf-8') for topic, _ in publish_deltas]
+    assert TASK_PROXIES in topics
+    assert topics[-1] == ALL_DELTAS
+
+    expected = DELTAS_MAP[ALL_DELTAS]()
+    for key, delta in schd.data_store_mgr.deltas.items():
+        if delta.ListFields():
+            getattr(expected, key).CopyFrom(delta)
+    all_deltas = DELTAS_MAP[ALL_DELTAS]()
+    all_deltas.ParseFromString(publish_deltas[-1][1])
+    assert all_deltas == expected
+    schd.data_store_mgr.clear_delta_batch()
+    schd.data_store_mgr.clear_delta_store()
+
+
+async def test_delta_publish_interval(one: Scheduler, start):
+    """Deltas should be coalesced over the publish interval."""
+    async with start(one):
+        data_store_mgr = one.data_store_mgr
+        data_store_mgr.publish_interval = 60
+        await one.update_data_structure()
+        data_store_mgr.next_publish_time = 0
+        itask = one.pool.get_tasks()[0]
+
+        def change_state(status):
+            itask.state.reset(status)
+            data_store_mgr.delta_task_state(itask)
+            data_store_mgr.update_data_structure()
+
+        def get_published():
+            published = {}
+            for btopic, delta_msg in data_store_mgr.publish_deltas:
+                delta = DELTAS_MAP[btopic.decode('utf-8')]()
+                delta.ParseFromString(delta_msg)
+                published[btopic.decode('utf-8')] = delta
+            data_store_mgr.publish_deltas = []
+            return published
+
+        # the first update is published straight away
+        change_state(TASK_STATUS_PREPARING)
+        assert get_published()[TASK_PROXIES].updated[0].state == (
+            TASK_STATUS_PREPARING
+        )
+
+        # subsequent updates are held back
+        change_state(TASK_STATUS_RUNNING)
+        change_state(TASK_STATUS_SUCCEEDED)
+        assert not get_published()
+        assert data_store_mgr.coalesced_deltas
+
+        # and published as one
+        data_store_mgr.flush_coalesced_deltas(force=True)
+        published = get_published()
+        assert [t.state for t in published[TASK_PROXIES].updated] == [
+            TASK_STATUS_SUCCEEDED
+        ]
+        assert published[TASK_PROXIES].rolling_checksum == (
+            data_store_mgr.rolling_checksums[TASK_PROXIES]
+        )
+        all_deltas = published[ALL_DELTAS]
+        assert all_deltas.task_proxies == published[TASK_PROXIES]
+        assert not data_store_mgr.coalesced_deltas
+
+
 async def test_family_ascent_point_prune(mod_harness):
     """Test _family_ascent_point_prune. This method tries to remove
     non-existent family."""
@@ -971,6 +1103,98 @@ async def test_no_backwards_job_state_change(one: Scheduler, start):
         assert get_pb_job(one, itask).state == TASK_STATUS_RUNNING
 
 
+async def test_columnar_job_data_store(
+    one_conf, flow, scheduler, start, mock_glbl_cfg
+):
+    """Jobs should be held and updated in the columnar store if enabled."""
+    mock_glbl_cfg(
+        'cylc.flow.data_store_mgr.glbl_cfg',
+        '''
+            [scheduler]
+                columnar job data store = True
+        '''
+    )
+    schd: Scheduler = scheduler(flow(one_conf))
+    async with start(schd):
+        jobs = schd.data_store_mgr.data[schd.id][JOBS]
+        assert isinstance(jobs, ColumnarStore)
+        itask = schd.pool.get_tasks()[0]
+        itask.state_reset(TASK_STATUS_SUBMITTED)
+        itask.submit_num = 3
+        schd.data_store_mgr.insert_job(
+            itask, itask.state.status, job_config(schd)
+        )
+        await schd.update_data_structure()
+        assert len(jobs) == 1
+
+        schd.task_events_mgr.process_message(
+            itask, INFO, TASK_OUTPUT_STARTED
+        )
+        await schd.update_data_structure()
+        job = get_pb_job(schd, itask)
+        assert job.state == TASK_STATUS_RUNNING
+        assert job.started_time
+
+        entire_workflow = schd.data_store_mgr.get_entire_workflow()
+        assert list(entire_workflow.jobs) == [job]
+
+
+async def test_family_task_totals(flow, scheduler, start):
+    """Incrementally maintained family totals should match a full recount."""
+    schd: Scheduler = scheduler(flow({
+        'scheduling': {
+            'graph': {'R1': 'FAM:succeed-all => z'},
+        },
+        'runtime': {
+            'FAM': {},
+            **{f'a{i}': {'inherit': 'FAM'} for i in range(5)},
+        },
+    }))
+
+    def get_family(data_store_mgr):
+        fp_id = schd.tokens.duplicate(cycle='1', task='FAM').id
+        return data_store_mgr.data[schd.id][FAMILY_PROXIES][fp_id]
+
+    async with start(schd):
+        data_store_mgr = schd.data_store_mgr
+        itasks = schd.pool.get_tasks()
+        assert len(itasks) == 5
+        for itask, state in zip(
+            itasks, (TASK_STATUS_RUNNING, TASK_STATUS_FAILED)
+        ):
+            itask.state_reset(state)
+            data_store_mgr.delta_task_state(itask)
+        data_store_mgr.delta_task_held(
+            itasks[2].tdef.name, itasks[2].point, True
+        )
+        await schd.update_data_structure()
+        family = get_family(data_store_mgr)
+        assert family.state_totals[TASK_STATUS_RUNNING] == 1
+        assert family.state_totals[TASK_STATUS_FAILED] == 1
+        assert family.state_totals[TASK_STATUS_WAITING] == 3
+        assert family.is_held_total == 1
+
+        # remove a task from the pool
+        data_store_mgr.remove_pool_node(itasks[3].tdef.name, itasks[3].point)
+        data_store_mgr.state_update_families.add(family.id)
+        await schd.update_data_structure()
+        incremental = PbFamilyProxy()
+        incremental.CopyFrom(get_family(data_store_mgr))
+        assert incremental.state_totals[TASK_STATUS_WAITING] == 2
+
+        # recount from scratch
+        data_store_mgr.family_task_summaries.clear()
+        data_store_mgr.family_task_totals.clear()
+        data_store_mgr.state_update_families.add(family.id)
+        data_store_mgr.updates_pending = True
+        await schd.update_data_structure()
+        recount = get_family(data_store_mgr)
+        for field in (
+            'state', 'state_totals', 'is_held_total', 'graph_depth'
+        ):
+            assert getattr(recount, field) == getattr(incremental, field)
+
+
 async def test_job_estimated_finish_time(one_conf, flow, scheduler, start):
     """It should set estimated_finish_time on job elements along with
     started_time."""
@@ -407,3 +407,50 @@ async def test_cache_pruning(flow, scheduler, start):
         await complete_task(schd, 'f')
         increment_graph_window(schd, 'f')
         assert get_graph_walk_cache(schd) == []
+
+
+async def test_adjacency_cache(flow, scheduler, start):
+    """It should memoise graph adjacency for window nodes only.
+
+    Graph children and parents are cached for each node walked, these
+    should be removed from the cache when the node is pruned.
+    """
+    id_ = flow({
+        'scheduler': {
+            'allow implicit tasks': 'True',
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'a => b => c => d'
+            }
+        },
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        schd.data_store_mgr.set_graph_window_extent(1)
+
+        def get_adjacency_cache():
+            schd.data_store_mgr.prune_data_store()
+            return sorted(
+                Tokens(task_id)['task']
+                for task_id in schd.data_store_mgr.n_window_adjacency
+            )
+
+        add_task(schd, 'a')
+        increment_graph_window(schd, 'a')
+        assert get_adjacency_cache() == ['a', 'b']
+        children, parents = schd.data_store_mgr.n_window_adjacency[
+            schd.tokens.duplicate(cycle='1', task='a').id
+        ]
+        assert [tokens['task'] for tokens, _ in children] == ['b']
+        assert parents == []
+
+        for prev, task in (('a', 'b'), ('b', 'c'), ('c', 'd')):
+            await complete_task(schd, prev)
+            add_task(schd, task)
+            increment_graph_window(schd, task)
+        assert get_adjacency_cache() == ['c', 'd']
+
+        await complete_task(schd, 'd')
+        increment_graph_window(schd, 'd')
+        assert get_adjacency_cache() == []
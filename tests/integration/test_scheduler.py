@@ -20,6 +20,7 @@ from pathlib import Path
 import pytest
 import re
 from signal import SIGHUP, SIGINT, SIGTERM
+from threading import Thread
 from typing import Any, Callable
 
 from cylc.flow import commands
@@ -454,3 +455,51 @@ async def test_set_stall_interaction(flow, scheduler, start):
             schd.data_store_mgr.data[schd.tokens.id]['workflow'].status_msg
             != 'stalled'
         )
+
+
+async def test_event_driven_main_loop(
+    one_conf, flow, scheduler, start, mock_glbl_cfg
+):
+    """The event driven main loop should sleep until it is woken up."""
+    mock_glbl_cfg(
+        'cylc.flow.scheduler.glbl_cfg',
+        '''
+            [scheduler]
+                [[main loop]]
+                    event driven = True
+                    idle interval = PT1M
+        ''',
+    )
+    schd: 'Scheduler' = scheduler(flow(one_conf))
+    async with start(schd):
+        assert schd.main_loop_event_driven is True
+        assert schd.main_loop_idle_interval == 60
+
+        # the loop should sleep through to the idle interval...
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(schd._sleep_until_woken(60), 0.2)
+
+        # ...unless it is woken up, e.g. by the arrival of a task message
+        # (which comes in from the server thread)
+        sleeper = asyncio.create_task(schd._sleep_until_woken(60))
+        await asyncio.sleep(0)
+        thread = Thread(
+            target=schd.server.resolvers.put_messages,
+            args=('1/one/01', '2000-01-01T00:00:00Z', [['INFO', 'started']]),
+        )
+        thread.start()
+        await asyncio.wait_for(sleeper, 5)
+        thread.join()
+        assert schd.message_queue.qsize() == 1
+
+        # the wake up event should be reset after waking
+        assert not schd.main_loop_wake_up.is_set()
+
+
+async def test_wake_up_not_event_driven(one, start):
+    """Waking up a fixed interval main loop should do nothing."""
+    async with start(one):
+        assert one.main_loop_event_driven is False
+        one.wake_up()
+        await asyncio.sleep(0)
+        assert not one.main_loop_wake_up.is_set()
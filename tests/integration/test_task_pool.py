@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import Counter
 from json import loads
 import logging
 from typing import (
@@ -2435,7 +2436,7 @@ async def test_clock_expire_with_sequential_xtriggers(
 
 
 async def test_downstream_complete_before_upstream(
-    flow, scheduler, start, db_select
+    flow, scheduler, start
 ):
     """It should handle an upstream task completing before a downstream task.
 
@@ -2468,17 +2469,12 @@ async def test_downstream_complete_before_upstream(
         assert schd.pool.get_tasks() == [a_1]
 
         # as a side effect the DB should have been updated
+        # (the change is not committed until the end of the main loop
+        # iteration, so check via the scheduler's own DB connection)
         assert (
             TASK_OUTPUT_SUCCEEDED
-            in db_select(
-                schd,
-                # "False" means "do not run the DB update before checking it"
-                False,  # do not change this to "True"
-                'task_outputs',
-                'outputs',
-                name='b',
-                cycle='1',
-            )[0][0]
+            in schd.workflow_db_mgr.pri_dao.select_task_outputs('b', '1')
+            .popitem()[0]
         )
 
         # mark 1/a as succeeded
@@ -2688,3 +2684,199 @@ async def test_add_to_pool(
         schd.pool.add_to_pool(a_1)
 
         assert "1/a not added to n=0: already exists" in caplog.text
+
+
+async def test_active_tasks_by_id(
+    flow, scheduler, start
+):
+    """The task ID index should be kept in sync with the pool."""
+    def assert_index_in_sync(pool: TaskPool) -> None:
+        assert pool._active_tasks_by_id == {
+            id_: itask
+            for itasks in pool.active_tasks.values()
+            for id_, itask in itasks.items()
+        }
+
+    id_ = flow(EXAMPLE_FLOW_CFG)
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        assert_index_in_sync(schd.pool)
+        foo_1 = schd.pool._get_task_by_id('1/foo')
+        assert foo_1 is not None
+        assert schd.pool._get_task_by_id('1/asd') is None
+        assert schd.pool.get_itasks(
+            [Tokens('//1/foo'), Tokens('//1/foo'), Tokens('//99/foo')]
+        ) == [foo_1]
+
+        # removed tasks should be dropped from the index
+        schd.pool.remove(foo_1, 'test')
+        assert schd.pool._get_task_by_id('1/foo') is None
+        assert_index_in_sync(schd.pool)
+
+        # reloaded tasks should be swapped out in the index
+        bar_1 = schd.pool._get_task_by_id('1/bar')
+        await commands.run_cmd(commands.reload_workflow(schd))
+        assert schd.pool._get_task_by_id('1/bar') is not bar_1
+        assert_index_in_sync(schd.pool)
+
+
+async def test_get_ready_check_tasks(flow, scheduler, start):
+    """Only changed waiting tasks (or ones awaiting xtriggers) are checked.
+
+    Waiting tasks should only be returned for readiness checks after they
+    have been flagged (e.g. by a state or prerequisite change), with the
+    exception of tasks waiting on xtriggers which must be checked on each
+    main loop iteration.
+    """
+    id_ = flow({
+        'scheduling': {
+            'xtriggers': {'never': 'xrandom(0)'},
+            'graph': {
+                'R1': '''
+                    a & c & d => b
+                    @never => x
+                '''
+            },
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        a_1 = schd.pool._get_task_by_id('1/a')
+        c_1 = schd.pool._get_task_by_id('1/c')
+        x_1 = schd.pool._get_task_by_id('1/x')
+
+        # parentless tasks are queued on release from runahead so don't
+        # need checking, 1/x is waiting on an xtrigger so should be checked
+        # every time
+        assert a_1.state.is_queued
+        assert schd.pool.get_ready_check_tasks() == [x_1]
+        assert schd.pool.get_ready_check_tasks() == [x_1]
+
+        # new tasks should be checked
+        schd.pool.spawn_on_output(a_1, TASK_OUTPUT_SUCCEEDED)
+        b_1 = schd.pool._get_task_by_id('1/b')
+        assert set(schd.pool.get_ready_check_tasks()) == {b_1, x_1}
+
+        # 1/b is not ready (unsatisfied prereqs) so should not be checked
+        # again until something changes
+        assert schd.pool.get_ready_check_tasks() == [x_1]
+
+        # satisfying a prerequisite should flag the task
+        schd.pool.spawn_on_output(c_1, TASK_OUTPUT_SUCCEEDED)
+        assert set(schd.pool.get_ready_check_tasks()) == {b_1, x_1}
+        assert schd.pool.get_ready_check_tasks() == [x_1]
+
+        # as should a state change
+        schd.pool.hold_active_task(b_1)
+        assert set(schd.pool.get_ready_check_tasks()) == {b_1, x_1}
+        assert schd.pool.get_ready_check_tasks() == [x_1]
+
+        # removed tasks should not be checked
+        schd.pool.remove(x_1, 'test')
+        assert schd.pool.get_ready_check_tasks() == []
+
+
+async def test_count_active_tasks(flow, scheduler, start):
+    """Active task counts should be kept up to date as tasks change state."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a & b & c'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        a_1, b_1, c_1 = (
+            schd.pool._get_task_by_id(f'1/{name}') for name in 'abc'
+        )
+        assert schd.pool.count_active_tasks() == (Counter(), [])
+
+        # tasks awaiting job prep count as active
+        a_1.waiting_on_job_prep = True
+        assert schd.pool.count_active_tasks() == (Counter({'a': 1}), [a_1])
+
+        # as do preparing, submitted and running tasks
+        a_1.state_reset(TASK_STATUS_PREPARING)
+        a_1.waiting_on_job_prep = False
+        b_1.state_reset(TASK_STATUS_SUBMITTED)
+        c_1.state_reset(TASK_STATUS_RUNNING)
+        assert schd.pool.count_active_tasks() == (
+            Counter({'a': 1, 'b': 1, 'c': 1}), []
+        )
+
+        # the counter returned should be a copy
+        schd.pool.count_active_tasks()[0].update(['a'])
+        assert schd.pool.count_active_tasks()[0] == Counter(
+            {'a': 1, 'b': 1, 'c': 1}
+        )
+
+        # finished and removed tasks are not active
+        b_1.state_reset(TASK_STATUS_SUCCEEDED)
+        schd.pool.remove(c_1, 'test')
+        assert schd.pool.count_active_tasks() == (Counter({'a': 1}), [])
+
+
+async def test_min_point_and_runahead_index(flow, scheduler, start):
+    """The pool should track its min point and runahead-limited tasks."""
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'runahead limit': 'P1',
+            'graph': {'P1': 'a'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+
+    def get_runahead_tasks():
+        return {
+            itask.identity
+            for itasks in schd.pool._runahead_tasks.values()
+            for itask in itasks
+        }
+
+    async with start(schd):
+        pool = schd.pool
+        assert pool.get_min_point() == IntegerPoint(1)
+        assert pool.get_task_ids() == {'1/a', '2/a', '3/a'}
+        assert get_runahead_tasks() == {'3/a'}
+
+        # removing the earliest task should move the min point and the
+        # runahead limit on, releasing 3/a and spawning 4/a
+        pool.remove(pool._get_task_by_id('1/a'), 'test')
+        assert pool.get_min_point() == IntegerPoint(2)
+        assert pool.runahead_limit_point == IntegerPoint(3)
+        assert not pool._get_task_by_id('3/a').state.is_runahead
+        assert get_runahead_tasks() == {'4/a'}
+
+        pool.remove(pool._get_task_by_id('2/a'), 'test')
+        assert pool.get_min_point() == IntegerPoint(3)
+        assert get_runahead_tasks() == {'5/a'}
+
+
+async def test_spawn_on_output_prefetches_history(
+    flow, scheduler, start, monkeypatch
+):
+    """The history of fan-out children should be fetched in one go."""
+    id_ = flow({
+        'scheduler': {'allow implicit tasks': 'True'},
+        'scheduling': {
+            'graph': {'R1': 'a => b & c & d'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        a_1 = schd.pool._get_task_by_id('1/a')
+        pri_dao = schd.workflow_db_mgr.pri_dao
+
+        def no_single_selects(*args):
+            raise AssertionError('task history selected one at a time')
+
+        monkeypatch.setattr(
+            pri_dao, 'select_prev_instances', no_single_selects
+        )
+        monkeypatch.setattr(pri_dao, 'select_task_outputs', no_single_selects)
+        schd.pool.spawn_on_output(a_1, TASK_OUTPUT_SUCCEEDED)
+
+        assert schd.pool.get_task_ids() >= {'1/b', '1/c', '1/d'}
+        # unused prefetched history should not be kept
+        assert schd.pool._prefetched_task_states == {}
+        assert schd.pool._prefetched_task_outputs == {}
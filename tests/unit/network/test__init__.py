@@ -19,7 +19,14 @@ import pytest
 
 import cylc.flow
 from cylc.flow.exceptions import CylcVersionError
-from cylc.flow.network import get_location
+from cylc.flow.network import (
+    JSON,
+    MSGPACK,
+    decode,
+    encode,
+    get_location,
+    negotiate_encoding,
+)
 from cylc.flow.workflow_files import ContactFileFields
 
 
@@ -60,3 +67,27 @@ def test_get_location_old_contact_file(monkeypatch, mpatch_get_fqdn_by_host):
     )
     with pytest.raises(CylcVersionError, match=r'.*5.1.2.*'):
         get_location('_')
+
+
+def test_encode_decode():
+    """Messages are decoded in the encoding they were encoded with."""
+    pytest.importorskip('msgpack')
+    message = {'data': {'a': [1, 'b', None]}}
+    assert encode(message, MSGPACK) != encode(message, JSON)
+    assert decode(encode(message, MSGPACK)) == (message, MSGPACK)
+    assert decode(encode(message, JSON)) == (message, JSON)
+
+
+@pytest.mark.parametrize(
+    'encodings, accept, expected',
+    [
+        pytest.param([MSGPACK, JSON], [MSGPACK, JSON], MSGPACK, id='both'),
+        pytest.param([MSGPACK, JSON], [JSON], JSON, id='client-json'),
+        pytest.param([MSGPACK, JSON], [], JSON, id='old-client'),
+        pytest.param([JSON], [MSGPACK, JSON], JSON, id='server-json'),
+    ]
+)
+def test_negotiate_encoding(monkeypatch, encodings, accept, expected):
+    """It picks an encoding both peers support, falling back to JSON."""
+    monkeypatch.setattr(cylc.flow.network, 'ENCODINGS', encodings)
+    assert negotiate_encoding(accept) == expected
@@ -25,7 +25,8 @@ from graphql import (
 
 from cylc.flow.data_messages_pb2 import PbTaskProxy, PbPrerequisite
 from cylc.flow.network.graphql import (
-    CylcVisitor, null_setter, strip_null, async_next, NULL_VALUE, grow_tree
+    CylcVisitor, null_setter, strip_null, async_next, NULL_VALUE, grow_tree,
+    parse_and_validate
 )
 from cylc.flow.network.schema import schema
 
@@ -242,3 +243,25 @@ async def test_strip_null(pre_result, expected_result):
 def test_grow_tree(expect, tree, path, leaves):
     grow_tree(tree, path, leaves)
     assert tree == expect
+
+
+def test_parse_and_validate():
+    """It should cache parsed and validated documents."""
+    graphql_schema = schema.graphql_schema
+    request_string = 'query { workflows { id } }'
+    document, errors = parse_and_validate(graphql_schema, request_string)
+    assert not errors
+    assert document.definitions[0].operation.value == 'query'
+    assert parse_and_validate(graphql_schema, request_string)[0] is document
+
+    # validation errors
+    document, errors = parse_and_validate(
+        graphql_schema, 'query { workflows { notafield } }'
+    )
+    assert document is None
+    assert "Cannot query field 'notafield'" in errors[0].message
+
+    # syntax errors
+    document, errors = parse_and_validate(graphql_schema, 'query {')
+    assert document is None
+    assert 'Syntax Error' in errors[0].message
@@ -0,0 +1,85 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.data_store_mgr import (
+    DELTAS_MAP,
+    EDGES,
+    FAMILIES,
+    TASK_PROXIES,
+    WORKFLOW,
+)
+from cylc.flow.id import Tokens
+from cylc.flow.network.resolvers import filter_deltas
+
+
+W_ID = '~user/workflow'
+
+
+def test_filter_deltas():
+    """It should filter deltas by element type, ID and field."""
+    deltas = {key: DELTAS_MAP[key]() for key in (
+        EDGES, FAMILIES, TASK_PROXIES, WORKFLOW
+    )}
+    deltas[TASK_PROXIES].added.add(id=f'{W_ID}//1/foo', state='waiting')
+    deltas[TASK_PROXIES].updated.add(
+        id=f'{W_ID}//1/bar', state='running', is_held=True
+    )
+    deltas[TASK_PROXIES].updated.add(id=f'{W_ID}//2/foo', state='failed')
+    deltas[TASK_PROXIES].pruned.extend([f'{W_ID}//1/baz', f'{W_ID}//2/baz'])
+    deltas[TASK_PROXIES].time = 1.0
+    deltas[FAMILIES].added.add(id=f'{W_ID}//$namespace|FOO')
+    deltas[FAMILIES].added.add(id=f'{W_ID}//$namespace|BAR')
+    deltas[EDGES].added.add(id=f'{W_ID}//$edge|1/foo|1/bar')
+    deltas[EDGES].added.add(id=f'{W_ID}//$edge|2/foo|2/bar')
+    deltas[WORKFLOW].updated.id = W_ID
+
+    # filter by type
+    result = filter_deltas(deltas, {'element_types': [WORKFLOW]})
+    assert [f.name for f, _ in result.ListFields()] == [WORKFLOW]
+    assert result.workflow.updated.id == W_ID
+
+    # filter by ID
+    result = filter_deltas(deltas, {
+        'element_types': [EDGES, FAMILIES, TASK_PROXIES],
+        'ids': [Tokens('1', relative=True), Tokens('*/FOO', relative=True)],
+        'exids': [Tokens('1/baz', relative=True)],
+    })
+    assert [t.id for t in result.task_proxies.added] == [f'{W_ID}//1/foo']
+    assert [t.id for t in result.task_proxies.updated] == [f'{W_ID}//1/bar']
+    assert not result.task_proxies.pruned
+    assert result.task_proxies.time == 1.0
+    assert [f.id for f in result.families.added] == [
+        f'{W_ID}//$namespace|FOO'
+    ]
+    assert [e.id for e in result.edges.added] == [
+        f'{W_ID}//$edge|1/foo|1/bar'
+    ]
+
+    # filter by field
+    result = filter_deltas(deltas, {
+        'element_types': [TASK_PROXIES],
+        'ids': [Tokens('1/bar', relative=True)],
+        'fields': ['is_held'],
+    })
+    assert [
+        f.name for f, _ in result.task_proxies.updated[0].ListFields()
+    ] == ['id', 'is_held']
+
+    # no matches
+    assert filter_deltas(deltas, {
+        'element_types': [TASK_PROXIES],
+        'ids': [Tokens('3', relative=True)],
+    }) is None
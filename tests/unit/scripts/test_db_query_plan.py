@@ -0,0 +1,69 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test logic in cylc-db-query-plan script."""
+
+from pathlib import Path
+
+import pytest
+
+from cylc.flow.exceptions import InputError
+from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.scripts.db_query_plan import (
+    QUERIES,
+    get_query_plans,
+)
+
+
+@pytest.fixture
+def db_file(tmp_path: Path) -> str:
+    db_file = str(tmp_path / 'db')
+    CylcWorkflowDAO(db_file, create_tables=True).close()
+    return db_file
+
+
+def test_get_query_plans(db_file: str):
+    """It should plan every query (without running it)."""
+    plans = dict(get_query_plans(db_file))
+    assert list(plans) == list(QUERIES)
+    assert all(plans.values())
+
+    # these queries should look up rows using the secondary indexes
+    for name, index in (
+        ('select_tasks_for_datastore', 'task_states_id'),
+        ('select_jobs_for_datastore', 'task_states_id'),
+        ('select_prereqs_for_datastore', 'task_prerequisites_id'),
+        ('select_task_job_run_times', 'task_jobs_run_status'),
+        ('workflow_state_status', 'task_states_cycle_status'),
+    ):
+        assert f'USING INDEX {index}' in plans[name][0]
+    # and these should not scan the (large) tables they look up
+    for name in (
+        'select_prev_instances_for_tasks',
+        'select_task_outputs_for_tasks',
+    ):
+        assert plans[name][0].startswith('SEARCH')
+    assert plans['select_jobs_for_restart'][1].startswith('SEARCH task_jobs')
+
+
+def test_get_query_plans_names(db_file: str):
+    assert [
+        name
+        for name, _ in get_query_plans(db_file, ['select_task_job'])
+    ] == ['select_task_job']
+    with pytest.raises(InputError, match='Unknown queries: foo'):
+        list(get_query_plans(db_file, ['select_task_job', 'foo']))
@@ -0,0 +1,95 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.columnar_store import ColumnarStore
+from cylc.flow.data_messages_pb2 import (
+    PbJob,
+    PbRuntime,
+    PbTaskProxy,
+)
+from cylc.flow.data_store_mgr import JOBS, apply_delta, DELTAS_MAP
+
+
+def test_round_trip():
+    """Elements should be returned as they were stored."""
+    store = ColumnarStore(PbJob)
+    job = PbJob(
+        id='1/a/01',
+        stamp='1/a/01@1',
+        submit_num=1,
+        state='running',
+        execution_time_limit=1.5,
+        messages=['started'],
+        runtime=PbRuntime(platform='localhost', script='true'),
+    )
+    store[job.id] = job
+    assert store[job.id] == job
+    assert list(store.values()) == [job]
+
+    # fields which are set to their default are still set
+    empty = PbJob(id='1/b/01', state='', submit_num=0)
+    store[empty.id] = empty
+    assert store[empty.id] == empty
+    assert store[empty.id].HasField('submit_num')
+    assert not store[empty.id].HasField('job_id')
+
+    # message fields
+    task_proxy = PbTaskProxy(id='1/a', is_held=True, flow_nums='[1]')
+    task_proxy.outputs['x'].satisfied = True
+    task_proxies = ColumnarStore(PbTaskProxy)
+    task_proxies[task_proxy.id] = task_proxy
+    assert task_proxies[task_proxy.id] == task_proxy
+
+
+def test_update_delete():
+    """Rows and strings should be reused once no longer referenced."""
+    store = ColumnarStore(PbJob)
+    for name in ('a', 'b'):
+        store[f'1/{name}/01'] = PbJob(
+            id=f'1/{name}/01', state='running', platform='localhost'
+        )
+    n_strings = len(store.strings.strings)
+    store['1/a/01'] = PbJob(id='1/a/01', state='succeeded')
+    assert store['1/a/01'] == PbJob(id='1/a/01', state='succeeded')
+    assert store['1/b/01'].state == 'running'
+
+    del store['1/a/01']
+    assert '1/a/01' not in store
+    assert len(store) == 1
+    store['1/c/01'] = PbJob(id='1/c/01', state='running')
+    assert len(store.residuals) == 2
+    # 1/a/01 and succeeded were released
+    assert len(store.strings.strings) == n_strings + 1
+    assert set(store) == {'1/b/01', '1/c/01'}
+
+    store.clear()
+    assert not store
+
+
+def test_apply_delta():
+    """Deltas should apply to a columnar store."""
+    data = {JOBS: ColumnarStore(PbJob)}
+    delta = DELTAS_MAP[JOBS]()
+    delta.added.add(id='1/a/01', state='submitted', messages=['submitted'])
+    apply_delta(JOBS, delta, data)
+
+    delta = DELTAS_MAP[JOBS]()
+    delta.updated.add(id='1/a/01', state='running', messages=['started'])
+    apply_delta(JOBS, delta, data)
+    job = data[JOBS]['1/a/01']
+    assert job.state == 'running'
+    # messages are overwritten by updates (see CLEAR_FIELD_MAP)
+    assert list(job.messages) == ['started']
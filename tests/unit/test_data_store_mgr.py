@@ -20,6 +20,8 @@ from time import time
 from cylc.flow.data_store_mgr import (
     task_mean_elapsed_time,
     apply_delta,
+    coalesce_delta,
+    TASK_PROXIES,
     WORKFLOW,
     DELTAS_MAP,
     ALL_DELTAS,
@@ -67,3 +69,43 @@ def test_apply_delta():
 
     assert data[WORKFLOW].id == w_id
     assert data[WORKFLOW].pruned is True
+
+
+def test_coalesce_delta():
+    """Test deltas are merged by element, and adds/prunes cancel out."""
+    coalesced = {}
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.added.add(id='1/a', state='waiting')
+    delta.added.add(id='1/b', state='waiting')
+    delta.updated.add(id='1/c', state='submitted')
+    delta.updated.add(id='1/d', state='submitted')
+    coalesce_delta(coalesced, TASK_PROXIES, delta)
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.updated.add(id='1/a', state='running')
+    delta.updated.add(id='1/c', state='running', is_held=True)
+    delta.pruned.extend(['1/b', '1/d'])
+    coalesce_delta(coalesced, TASK_PROXIES, delta)
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.updated.add(id='1/c', state='succeeded')
+    coalesce_delta(coalesced, TASK_PROXIES, delta)
+
+    entry = coalesced[TASK_PROXIES]
+    assert list(entry['added']) == ['1/a']
+    assert entry['added']['1/a'].state == 'running'
+    assert list(entry['updated']) == ['1/c']
+    assert entry['updated']['1/c'].state == 'succeeded'
+    assert entry['updated']['1/c'].is_held
+    assert list(entry['pruned']) == ['1/d']
+
+    # a reload supersedes preceding deltas
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.added.add(id='1/e')
+    delta.reloaded = True
+    coalesce_delta(coalesced, TASK_PROXIES, delta)
+    entry = coalesced[TASK_PROXIES]
+    assert list(entry['added']) == ['1/e']
+    assert not entry['updated']
+    assert not entry['pruned']
+    assert entry['reloaded']
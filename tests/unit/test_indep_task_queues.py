@@ -22,7 +22,10 @@ from unittest.mock import Mock
 import pytest
 
 from cylc.flow.task_proxy import TaskProxy
-from cylc.flow.task_queues.independent import IndepQueueManager
+from cylc.flow.task_queues.independent import (
+    IndepQueueManager,
+    LimitedTaskQueue,
+)
 
 
 MEMBERS = {"a", "b", "c", "d", "e", "f"}
@@ -99,3 +102,17 @@ def test_queue_and_release(
     # check second assignment overrides first
     for group in expected_foo_groups:
         assert "foo" in queue_mgr.queues[group].members
+
+
+@pytest.mark.parametrize(
+    "active, expected",
+    [
+        (Counter(), 0),
+        (ACTIVE, 3),
+        (Counter(["a", "x", "y", "z", "w", "v", "u", "t"]), 1),
+    ]
+)
+def test_count_active(active, expected):
+    """Test counting active queue members."""
+    queue = LimitedTaskQueue(2, set(MEMBERS))
+    assert queue.count_active(active) == expected
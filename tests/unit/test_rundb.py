@@ -175,12 +175,21 @@ def test_select_task_pool_for_restart_if_not_platforms(tmp_path):
     """
     # Setup a fake callback function which returns the fake "platform_name":
     def callback(index, row):
-        return ''.join(row)
+        return row.platform_name
 
     db_file = tmp_path / 'db'
     dao = CylcWorkflowDAO(db_file, create_tables=True)
-    # Fiddle the connect method to return a list of fake "platform_names":
-    dao.connect = lambda: SimpleNamespace(execute=lambda _: ['foo', 'bar'])
+    # Fiddle the connect method to return rows with fake "platform_names":
+    rows = [
+        (*(None,) * 10, platform, *(None,) * 4)
+        for platform in ('foo', 'bar')
+    ]
+    dao.connect = lambda: SimpleNamespace(
+        execute=lambda *_: SimpleNamespace(
+            fetchmany=lambda _: [rows.pop(0)] if rows else [],
+            close=lambda: None,
+        )
+    )
 
     # Assert that an error is raised and that it mentions both fake platforms:
     with pytest.raises(
@@ -237,3 +246,153 @@ def test_select_latest_flow_nums(
         conn.commit()
 
         assert dao.select_latest_flow_nums() == expected
+
+
+def test_select_for_tasks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test the batched task_states and task_outputs selects.
+
+    The results should match those of the one-task-at-a-time selects.
+    """
+    # force multiple statements per select
+    monkeypatch.setattr(CylcWorkflowDAO, 'MAX_TASKS_PER_SELECT', 2)
+    tasks = [('foo', '1'), ('bar', '1'), ('foo', '2'), ('baz', '3')]
+    with CylcWorkflowDAO(tmp_path / 'db', create_tables=True) as dao:
+        for name, cycle in tasks[:3]:
+            dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_STATES, {
+                'name': name,
+                'cycle': cycle,
+                'flow_nums': serialise_set({1}),
+                'submit_num': 1,
+                'status': 'succeeded',
+                'flow_wait': 0,
+            })
+            dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_OUTPUTS, {
+                'name': name,
+                'cycle': cycle,
+                'flow_nums': serialise_set({1}),
+                'outputs': '{"succeeded": "succeeded"}',
+            })
+        dao.execute_queued_items()
+
+        prev_instances = dao.select_prev_instances_for_tasks(tasks)
+        outputs = dao.select_task_outputs_for_tasks(tasks)
+        for name, cycle in tasks:
+            assert prev_instances[(name, cycle)] == (
+                dao.select_prev_instances(name, cycle)
+            )
+            assert outputs[(name, cycle)] == (
+                dao.select_task_outputs(name, cycle)
+            )
+        assert prev_instances[('foo', '1')] == [(1, False, {1}, 'succeeded')]
+        assert prev_instances[('baz', '3')] == []
+        assert outputs[('baz', '3')] == {}
+
+
+def test_execute_queued_items_without_commit(tmp_path: Path):
+    """Uncommitted changes are visible on the connection until committed."""
+    db_file = tmp_path / 'db'
+    stmt = 'SELECT key, value FROM workflow_params'
+    with CylcWorkflowDAO(db_file, create_tables=True) as dao:
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, ['foo', '1']
+        )
+        dao.execute_queued_items(commit=False)
+        assert list(dao.connect().execute(stmt)) == [('foo', '1')]
+        with CylcWorkflowDAO(db_file) as other_dao:
+            assert list(other_dao.connect().execute(stmt)) == []
+
+        # if the transaction is lost, it should be redone on the next call
+        dao.conn.rollback()
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, ['bar', '2']
+        )
+        dao.execute_queued_items()
+        assert dao.conn is None
+        with CylcWorkflowDAO(db_file) as other_dao:
+            assert sorted(other_dao.connect().execute(stmt)) == [
+                ('bar', '2'), ('foo', '1')
+            ]
+
+
+def test_persistent_connection(tmp_path: Path):
+    """A persistent connection is kept open and uses write-ahead logging."""
+    db_file = tmp_path / 'db'
+    stmt = 'SELECT key, value FROM workflow_params'
+    with CylcWorkflowDAO(db_file, create_tables=True, persistent=True) as dao:
+        conn = dao.conn
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, ['foo', '1']
+        )
+        dao.execute_queued_items()
+        assert dao.conn is conn
+
+        # other connections can read whilst a write is in progress
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, ['bar', '2']
+        )
+        dao.execute_queued_items(commit=False)
+        with CylcWorkflowDAO(db_file) as other_dao:
+            assert list(other_dao.connect().execute(stmt)) == [('foo', '1')]
+        dao.execute_queued_items()
+
+    # write-ahead logging is switched off when the connection is closed
+    assert not (tmp_path / 'db-wal').exists()
+    with CylcWorkflowDAO(db_file) as dao:
+        assert dao.connect().execute('PRAGMA journal_mode').fetchone() == (
+            'delete',
+        )
+        assert sorted(dao.connect().execute(stmt)) == [
+            ('bar', '2'), ('foo', '1')
+        ]
+
+
+def test_create_indexes(tmp_path: Path):
+    """Secondary indexes are created with the tables or added later."""
+    db_file = tmp_path / 'db'
+
+    def get_indexes(dao):
+        return {
+            name for name, in dao.connect().execute(
+                "SELECT name FROM sqlite_master WHERE type == 'index'"
+                " AND name NOT LIKE 'sqlite_autoindex%'"
+            )
+        }
+
+    with CylcWorkflowDAO(db_file, create_tables=True) as dao:
+        assert get_indexes(dao) == set(CylcWorkflowDAO.INDEXES)
+        # (e.g. a database from an older version of Cylc)
+        dao.connect().execute('DROP INDEX task_jobs_run_status')
+        assert dao.create_indexes() == ['task_jobs_run_status']
+        assert dao.create_indexes() == []
+        assert get_indexes(dao) == set(CylcWorkflowDAO.INDEXES)
+
+
+def test_select_streams_rows(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Rows are fetched in batches and returned as the given row type."""
+    monkeypatch.setattr(CylcWorkflowDAO, 'FETCH_SIZE', 2)
+    with CylcWorkflowDAO(tmp_path / 'db', create_tables=True) as dao:
+        for num in range(5):
+            dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_STATES, {
+                'name': 'foo',
+                'cycle': str(num),
+                'flow_nums': '[1]',
+                'status': 'waiting',
+                'submit_num': num,
+            })
+        dao.execute_queued_items()
+
+        rows = dao.select(
+            'SELECT cycle, name FROM task_states ORDER BY cycle'
+        )
+        assert next(rows) == ('0', 'foo')
+        assert len(list(rows)) == 4
+
+        # IDs are bound in chunks
+        monkeypatch.setattr(CylcWorkflowDAO, 'MAX_TASKS_PER_SELECT', 2)
+        rows = list(dao.select_tasks_for_datastore(
+            ['1/foo', '2/foo', '4/foo', '4/bar']
+        ))
+        assert sorted(row.cycle for row in rows) == ['1', '2', '4']
+        assert rows[0].status == 'waiting'
+        assert rows[0].submit_num == int(rows[0].cycle)
@@ -14,11 +14,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
 from socket import gaierror
+from time import (
+    sleep,
+    time,
+)
 
 import pytest
 
-from cylc.flow.task_message import send_messages
+from cylc.flow.task_message import (
+    MESSAGE_BATCH_SIZE,
+    send_messages,
+    spool_messages,
+)
 
 
 def test_send_messages_err(
@@ -36,3 +45,140 @@ def test_send_messages_err(
         'arasaka', '1/v/01', [['INFO', 'silverhand']], '2077-01-01T00:00:00Z'
     )
     assert f"gaierror: [Errno -2] {exc_msg}" in capsys.readouterr().err
+
+
+def test_send_messages(monkeypatch: pytest.MonkeyPatch):
+    """Messages should be sent to the put_messages endpoint."""
+    calls = []
+    monkeypatch.setattr(
+        'cylc.flow.task_message.get_client',
+        lambda *a, **k: lambda *args: calls.append(args),
+    )
+    send_messages(
+        'arasaka', '1/v/01', [['INFO', 'silverhand']], '2077-01-01T00:00:00Z'
+    )
+    assert calls == [(
+        'put_messages',
+        {
+            'job_messages': [[
+                '1/v/01', '2077-01-01T00:00:00Z', [['INFO', 'silverhand']]
+            ]]
+        },
+    )]
+
+
+def test_spool_messages(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """Spooled messages should be sent together, in order, when due."""
+    calls = []
+    monkeypatch.setattr(
+        'cylc.flow.task_message.get_client',
+        lambda *a, **k: lambda *args: calls.append(args),
+    )
+    monkeypatch.setenv('CYLC_TASK_LOG_ROOT', str(tmp_path / 'job'))
+    spool_file = tmp_path / 'job.spool'
+    flushers = []
+    monkeypatch.setattr(
+        'cylc.flow.task_message._start_spool_flusher',
+        lambda *args: flushers.append(args),
+    )
+
+    def spool(message, batch_interval=3600):
+        spool_messages(
+            'arasaka', '1/v/01', [['INFO', message]], message, batch_interval
+        )
+
+    # start messages are sent straight away
+    spool('started')
+    assert len(calls) == 1
+    assert spool_file.read_text() == ''
+
+    # other messages are spooled until the batch interval has elapsed
+    spool('a')
+    spool('b')
+    assert len(calls) == 1
+    # (a flusher is started with the batch to enforce the interval)
+    assert flushers == [
+        ('arasaka', '1/v/01', str(spool_file), 3600)
+    ]
+    spool('c', batch_interval=0)
+    assert calls[1] == (
+        'put_messages',
+        {
+            'job_messages': [
+                ['1/v/01', message, [['INFO', message]]]
+                for message in 'abc'
+            ]
+        },
+    )
+    assert spool_file.read_text() == ''
+
+    # ... or the batch size is reached
+    for _ in range(MESSAGE_BATCH_SIZE - 1):
+        spool('d')
+    assert len(calls) == 2
+    spool('d')
+    assert len(calls[2][1]['job_messages']) == MESSAGE_BATCH_SIZE
+
+    # ... or the job exits
+    spool('e')
+    spool('failed/ERR')
+    assert [
+        messages for *_, messages in calls[3][1]['job_messages']
+    ] == [[['INFO', 'e']], [['INFO', 'failed/ERR']]]
+    assert spool_file.read_text() == ''
+
+
+def test_spool_messages_corrupted(
+    monkeypatch: pytest.MonkeyPatch, tmp_path, capsys: pytest.CaptureFixture
+):
+    """Corrupted spool entries (e.g. interrupted writes) should be ignored."""
+    calls = []
+    monkeypatch.setattr(
+        'cylc.flow.task_message.get_client',
+        lambda *a, **k: lambda *args: calls.append(args),
+    )
+    monkeypatch.setenv('CYLC_TASK_LOG_ROOT', str(tmp_path / 'job'))
+    spool_file = tmp_path / 'job.spool'
+    spool_file.write_text('[0, "a", [["INFO", "a"]]]\n[0, "b", [["IN')
+
+    spool_messages(
+        'arasaka', '1/v/01', [['INFO', 'succeeded']], 'c', 3600
+    )
+    assert calls == [(
+        'put_messages',
+        {
+            'job_messages': [
+                ['1/v/01', 'a', [['INFO', 'a']]],
+                ['1/v/01', 'c', [['INFO', 'succeeded']]],
+            ]
+        },
+    )]
+    assert 'Ignoring corrupted spool entry' in capsys.readouterr().err
+    assert spool_file.read_text() == ''
+
+
+def test_spool_messages_flusher(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """A lone spooled message should be sent within the batch interval."""
+    sent_file = tmp_path / 'sent'
+
+    def _send_job_messages(workflow, job_messages):
+        # (called in the detached flusher process)
+        sent_file.write_text(json.dumps(job_messages))
+
+    monkeypatch.setattr(
+        'cylc.flow.task_message._send_job_messages', _send_job_messages
+    )
+    monkeypatch.setenv('CYLC_TASK_LOG_ROOT', str(tmp_path / 'job'))
+    spool_file = tmp_path / 'job.spool'
+    spool_messages('arasaka', '1/v/01', [['INFO', 'a']], 't', 0.5)
+    assert not sent_file.exists()
+    assert spool_file.read_text()
+
+    # the spool is emptied once the messages have been sent
+    timeout = time() + 10
+    while spool_file.read_text():
+        assert time() < timeout, 'spooled message not sent'
+        sleep(0.1)
+    assert json.loads(sent_file.read_text()) == [
+        ['1/v/01', 't', [['INFO', 'a']]]
+    ]
@@ -25,8 +25,10 @@ import pytest
 from pytest import param
 
 from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.exceptions import CylcError
 from cylc.flow.flow_mgr import FlowNums
 from cylc.flow.id import Tokens
+from cylc.flow.rundb import CylcWorkflowDAO
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.taskdef import TaskDef
 from cylc.flow.util import serialise_set
@@ -77,3 +79,180 @@ def test_remove_task_from_flows(
                 )
             }
             assert remaining_fnums == expected_remaining
+
+
+def test_task_history_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Task history should be cached in step with the private DB."""
+    db_mgr = WorkflowDatabaseManager(tmp_path)
+    schd_tokens = Tokens('~asterix/gaul')
+    tdef = TaskDef('a', rtcfg={}, start_point=None, initial_point=None)
+    point = IntegerPoint('1')
+    itask = TaskProxy(schd_tokens, tdef, point, flow_nums={1})
+    with db_mgr.get_pri_dao() as dao:
+        db_mgr.pri_dao = dao
+        db_mgr.pub_dao = Mock()
+        db_mgr.task_history.set_db_cycles(set())
+        select = Mock(wraps=dao.select_prev_instances)
+        monkeypatch.setattr(dao, 'select_prev_instances', select)
+
+        # the scheduler has not written any history for this task
+        assert db_mgr.select_prev_instances('a', point) == []
+        assert select.call_count == 0
+
+        # queued writes are not visible until executed (as for the DB)
+        db_mgr.put_insert_task_states(itask)
+        assert db_mgr.select_prev_instances('a', point) == []
+        assert select.call_count == 0
+        db_mgr.process_queued_ops()
+        assert db_mgr.select_prev_instances('a', point) == [
+            (0, False, {1}, 'waiting')
+        ]
+        assert select.call_count == 1
+
+        # subsequent selects should hit the cache
+        assert db_mgr.select_prev_instances_for_tasks([('a', point)]) == {
+            ('a', '1'): [(0, False, {1}, 'waiting')]
+        }
+        assert select.call_count == 1
+
+        # updates should invalidate the cache once executed
+        itask.state_reset('succeeded')
+        db_mgr.put_update_task_state(itask)
+        db_mgr.process_queued_ops()
+        assert db_mgr.select_prev_instances('a', point) == [
+            (0, False, {1}, 'succeeded')
+        ]
+        assert select.call_count == 2
+
+        # evicted history must come from the DB
+        db_mgr.task_history.evict(IntegerPoint('2'))
+        assert db_mgr.select_prev_instances('a', point) == [
+            (0, False, {1}, 'succeeded')
+        ]
+        assert select.call_count == 3
+        assert db_mgr.select_prev_instances('b', point) == []
+        assert select.call_count == 4
+        assert db_mgr.select_prev_instances('b', IntegerPoint('2')) == []
+        assert select.call_count == 4
+
+
+def test_persistent_pri_dao(tmp_path: Path):
+    """Test the workflow database with a persistent private connection."""
+    db_mgr = WorkflowDatabaseManager(tmp_path / 'pri', tmp_path / 'pub')
+    (tmp_path / 'pri').mkdir()
+    (tmp_path / 'pub').mkdir()
+    db_mgr.on_workflow_start(is_restart=False, persistent=True)
+    try:
+        db_mgr.put_workflow_params_1('foo', '1')
+        db_mgr.process_queued_ops()
+        db_mgr.check_pri_db_exists()
+
+        # the public database is a complete copy, without write-ahead logging
+        db_mgr.copy_pri_to_pub()
+        with CylcWorkflowDAO(db_mgr.pub_path) as pub_dao:
+            conn = pub_dao.connect()
+            assert conn.execute('PRAGMA journal_mode').fetchone() == (
+                'delete',
+            )
+            assert list(conn.execute(
+                'SELECT value FROM workflow_params WHERE key == "foo"'
+            )) == [('1',)]
+
+        # the scheduler should shut down if the database is removed
+        Path(db_mgr.pri_path).unlink()
+        with pytest.raises(CylcError, match='does not exist'):
+            db_mgr.check_pri_db_exists()
+    finally:
+        db_mgr.on_workflow_shutdown()
+
+
+def test_recover_pub_from_pri_in_background(tmp_path: Path):
+    """The public database is rebuilt in the background if it gets stuck."""
+    db_mgr = WorkflowDatabaseManager(tmp_path / 'pri', tmp_path / 'pub')
+    (tmp_path / 'pri').mkdir()
+    (tmp_path / 'pub').mkdir()
+    db_mgr.on_workflow_start(is_restart=False, persistent=True)
+
+    def select_pub():
+        with CylcWorkflowDAO(db_mgr.pub_path) as pub_dao:
+            return sorted(pub_dao.connect().execute(
+                'SELECT key, value FROM workflow_params'
+            ))
+
+    try:
+        db_mgr.put_workflow_params_1('foo', '1')
+        db_mgr.process_queued_ops()
+        assert select_pub() == [('foo', '1')]
+
+        # the public database gets stuck
+        Path(db_mgr.pub_path).unlink()
+        db_mgr.pub_dao.n_tries = db_mgr.pub_dao.MAX_TRIES
+        db_mgr.recover_pub_from_pri()
+        assert db_mgr._pub_recovery is not None
+
+        # writes made during the recovery are held back...
+        db_mgr.put_workflow_params_1('bar', '2')
+        db_mgr.process_queued_ops()
+        db_mgr._pub_recovery.join()
+        db_mgr.recover_pub_from_pri()
+        assert db_mgr._pub_recovery is None
+        assert db_mgr.pub_dao.n_tries == 0
+        assert select_pub() == [('foo', '1')]
+
+        # ... and applied on top of the rebuilt database
+        db_mgr.process_queued_ops()
+        assert select_pub() == [('bar', '2'), ('foo', '1')]
+        assert not list(tmp_path.glob('pub/db?*'))
+    finally:
+        db_mgr.on_workflow_shutdown()
+
+
+def test_put_task_pool(tmp_path: Path):
+    """Only changed tasks should be rewritten to the task pool tables."""
+    db_mgr = WorkflowDatabaseManager(tmp_path)
+    schd_tokens = Tokens('~asterix/gaul')
+    tdef = TaskDef('a', rtcfg={}, start_point=None, initial_point=None)
+    itasks = [
+        TaskProxy(schd_tokens, tdef, IntegerPoint(str(cycle)), flow_nums={1})
+        for cycle in range(1, 4)
+    ]
+    pool = Mock(get_tasks=lambda: itasks)
+    stmt = 'SELECT cycle, status FROM task_pool ORDER BY cycle'
+    with db_mgr.get_pri_dao() as dao:
+        db_mgr.pri_dao = dao
+        db_mgr.pub_dao = Mock()
+        # a stale row from a previous run
+        dao.add_insert_item(db_mgr.TABLE_TASK_POOL, {'cycle': '0'})
+        dao.execute_queued_items()
+
+        # the first call rewrites the tables
+        db_mgr.put_task_pool(pool)
+        assert db_mgr.db_deletes_map[db_mgr.TABLE_TASK_POOL] == [{}]
+        db_mgr.process_queued_ops()
+        assert list(dao.connect().execute(stmt)) == [
+            ('1', 'waiting'), ('2', 'waiting'), ('3', 'waiting')
+        ]
+
+        # nothing has changed
+        db_mgr.put_task_pool(pool)
+        assert not any(db_mgr.db_deletes_map.values())
+        assert not any(db_mgr.db_inserts_map.values())
+
+        # one task has changed and one has left the pool
+        itasks[0].state.reset('running')
+        itasks.pop()
+        db_mgr.put_task_pool(pool)
+        assert db_mgr.db_deletes_map[db_mgr.TABLE_TASK_POOL] == [
+            {'name': 'a', 'cycle': '1'}, {'name': 'a', 'cycle': '3'}
+        ]
+        assert db_mgr.db_inserts_map[db_mgr.TABLE_TASK_POOL] == [{
+            'name': 'a',
+            'cycle': '1',
+            'flow_nums': '[1]',
+            'status': 'running',
+            'is_held': False,
+        }]
+        db_mgr.process_queued_ops()
+        assert list(dao.connect().execute(stmt)) == [
+            ('1', 'running'), ('2', 'waiting')
+        ]